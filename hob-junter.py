@@ -1,5 +1,4 @@
 import os
-import json
 import time
 import asyncio
 import urllib.parse
@@ -11,7 +10,10 @@ from datetime import datetime
 from dataclasses import dataclass
 from typing import List, Dict, Any, Tuple
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # OpenAI
 from openai import OpenAI
@@ -32,6 +34,24 @@ from google.auth.transport.requests import Request
 # 1. LOCAL LLM SETTINGS
 LOCAL_LLM_URL = "http://127.0.0.1:1234/v1/chat/completions"
 
+# Shared keep-alive pool (local LLM + Telegram): one TCP/TLS handshake per host, not per call.
+# read=0: never re-send a generation that already timed out.
+HTTP = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(
+        total=3,
+        read=0,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset(["POST"]),
+        raise_on_status=False,
+    ),
+)
+HTTP.mount("http://", _adapter)
+HTTP.mount("https://", _adapter)
+
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 if not OPENAI_API_KEY:
     raise RuntimeError("OPENAI_API_KEY is required")
@@ -46,6 +66,9 @@ TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
 
 OPENAI_MODEL = "gpt-4o" 
+SCORE_CONCURRENCY = 8  # Jobs scored at once
+RED_TEAM_CONCURRENCY = 4  # Red team analyses at once, outside the scoring slots
+PROGRESS_HZ = 10  # Max progress-bar redraws per second
 CONFIG_FILE = "inputs.json"
 DEBUG = os.getenv("DEBUG", "").lower() in ("1", "true", "yes", "on")
 DEFAULT_CV_PROFILE_PATH = "cv_profile.json"
@@ -195,8 +218,8 @@ def load_run_parameters():
     config = {}
     if os.path.exists(CONFIG_FILE):
         try:
-            with open(CONFIG_FILE, "r") as f:
-                config = json.load(f)
+            with open(CONFIG_FILE, "rb") as f:
+                config = orjson.loads(f.read())
         except Exception as exc:
             print(f"[Config] Failed to read {CONFIG_FILE}: {exc}. Ignoring.")
             config = {}
@@ -237,8 +260,8 @@ def load_run_parameters():
     }
 
     try:
-        with open(CONFIG_FILE, "w") as f:
-            json.dump(new_config, f, indent=2)
+        with open(CONFIG_FILE, "wb") as f:
+            f.write(orjson.dumps(new_config, option=orjson.OPT_INDENT_2))
     except Exception as exc:
         print(f"[Config] Warning: failed to write {CONFIG_FILE}: {exc}")
 
@@ -263,9 +286,44 @@ def debug_print(msg: str):
         sys.stdout.flush()
 
 
+_TAG_RE = re.compile(r"<[^<]+?>")
+_SCRIPT_STYLE_RE = re.compile(r"<(script|style)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+
+
+_WS_RE = re.compile(r"\s+")
+
+
+def strip_html(raw: str) -> str:
+    """Tags (and script/style bodies) to spaces, entities decoded, whitespace runs collapsed."""
+    if "<" in raw:
+        raw = _TAG_RE.sub(" ", _SCRIPT_STYLE_RE.sub(" ", raw))
+    if "&" in raw:
+        raw = html.unescape(raw)
+    return _WS_RE.sub(" ", raw).strip()
+
+
+_FENCE_RE = re.compile(r"```(?:[a-zA-Z]*\n|json)?\s*(.*?)```", re.DOTALL)
+
+
+def strip_json_markdown(text):
+    """
+    Removes ```json ... ``` wrappers commonly returned by LLMs, including a fence
+    preceded by prose or left unterminated by a truncated reply.
+    """
+    text = text.strip()
+    if "```" not in text:
+        return text
+    match = _FENCE_RE.search(text)
+    if match:
+        return match.group(1).strip()
+    if text.startswith("```"):
+        return text.partition("\n")[2].strip()
+    return text
+
+
 def safe_json_loads(raw: str):
     try:
-        return json.loads(raw)
+        return orjson.loads(raw)
     except Exception:
         return {}
 
@@ -308,26 +366,28 @@ def extract_text_from_cv_pdf_with_gpt(pdf_path: str, ocr_prompt: str) -> str:
     return text.strip()
 
 
-def load_cv_profile_from_json(path: str) -> str:
-    with open(path, "r") as f:
+def load_cv_profile_from_json(path: str) -> Tuple[Dict[str, Any], str]:
+    """Parses the profile once: (profile dict, compact JSON string for prompts)."""
+    with open(path, "rb") as f:
         data = f.read()
     try:
-        parsed = json.loads(data)
-        return json.dumps(parsed)
+        profile = orjson.loads(data)
     except Exception:
         raise ValueError("CV JSON file is invalid JSON")
+    return profile, orjson.dumps(profile).decode()
 
 
 def save_cv_profile_to_file(profile_json: str, path: str):
     try:
-        with open(path, "w") as f:
-            f.write(profile_json)
+        # UTF-8 bytes, exactly what load_cv_profile_from_json's binary orjson read expects
+        with open(path, "wb") as f:
+            f.write(profile_json.encode("utf-8"))
         print(f"[CV] Cached profile to {path}")
     except Exception as exc:
         print(f"[CV] Warning: failed to cache profile to {path}: {exc}")
 
 
-def build_cv_profile(cv_text: str, profile_prompt: str) -> str:
+def build_cv_profile(cv_text: str, profile_prompt: str) -> Tuple[Dict[str, Any], str]:
     prompt = profile_prompt.replace("{cv_text}", cv_text[:20000])
 
     resp = with_retries(
@@ -344,17 +404,17 @@ def build_cv_profile(cv_text: str, profile_prompt: str) -> str:
 
     content = resp.choices[0].message.content
     try:
-        parsed = json.loads(content)
-        return json.dumps(parsed)
+        profile = orjson.loads(content)
     except Exception:
         raise ValueError("Failed to parse CV profile JSON")
+    return profile, orjson.dumps(profile).decode()
 
 
 # ==========================================
 # Job model
 # ==========================================
 
-@dataclass
+@dataclass(slots=True)
 class JobRecord:
     raw: Dict[str, Any]
     job_id: str
@@ -401,7 +461,7 @@ def consult_career_advisor_gpt(cv_text: str) -> Dict[str, Any]:
 
     content = resp.choices[0].message.content
     try:
-        return json.loads(content)
+        return orjson.loads(content)
     except Exception as e:
         print(f"[Advisor] Error parsing strategy response: {e}")
         return {}
@@ -494,8 +554,7 @@ def construct_search_url(roles: List[str], locations: List[str], is_tech_industr
     if any("remote" in l for l in locs_lower):
         search_state["remote"] = "Remote"
 
-    json_str = json.dumps(search_state)
-    encoded_state = urllib.parse.quote(json_str)
+    encoded_state = urllib.parse.quote(orjson.dumps(search_state))
     
     return f"{HIRING_BASE}/?searchState={encoded_state}"
 
@@ -503,8 +562,32 @@ def construct_search_url(roles: List[str], locations: List[str], is_tech_industr
 # PLAYWRIGHT & SCRAPING LOGIC
 # ==========================================
 
+# Visible text of an apply page. Falls back to a cleaned clone when innerText is thin;
+# collapse + cap happen in the page so only the final text crosses the CDP pipe.
+EXTRACT_DESC_JS = """
+window.__extractDesc = () => {
+    let text = document.body.innerText || '';
+    if (text.length < 500) {
+        const clone = document.body.cloneNode(true);
+        const junk = clone.querySelectorAll('script, style, noscript, svg, nav, header, footer, button, iframe');
+        junk.forEach(el => el.remove());
+        text = clone.innerText || '';
+        if (text.length < 800) text = clone.textContent || '';
+    }
+    return text.replace(/\\s+/g, ' ').trim().slice(0, 50000);
+};
+"""
+
+BLOCKED_RESOURCE_TYPES = {"image", "font", "stylesheet", "media"}
+
+async def _skip_heavy_resources(route):
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
 async def fetch_jobs_via_browser(search_state: Dict[str, Any]) -> List[JobRecord]:
-    encoded = urllib.parse.quote(json.dumps(search_state))
+    encoded = urllib.parse.quote(orjson.dumps(search_state))
     url = f"{HIRING_BASE}/?searchState={encoded}"
 
     p = await async_playwright().start()
@@ -523,6 +606,7 @@ async def fetch_jobs_via_browser(search_state: Dict[str, Any]) -> List[JobRecord
     page_size = 1000
     session = context.request
     template_ready = asyncio.Event()
+    response_seen = asyncio.Event()  # set whenever a search-jobs page adds jobs
 
     # 1. INTERCEPTOR
     async def process_response(resp):
@@ -557,7 +641,7 @@ async def fetch_jobs_via_browser(search_state: Dict[str, Any]) -> List[JobRecord
                 template_ready.set()
 
             try:
-                data = await resp.json()
+                data = orjson.loads(await resp.body())
             except Exception:
                 return 
 
@@ -570,11 +654,15 @@ async def fetch_jobs_via_browser(search_state: Dict[str, Any]) -> List[JobRecord
                         batch = data[key]
                         break
             
+            before = len(jobs)
             for item in batch:
-                jr = JobRecord.from_api(item)
-                if jr.job_id not in seen:
-                    seen.add(jr.job_id)
-                    jobs.append(jr)
+                # Check the raw id first so duplicates never build a JobRecord
+                job_id = str(item.get("id") or item.get("objectID") or "")
+                if job_id not in seen:
+                    seen.add(job_id)
+                    jobs.append(JobRecord.from_api(item))
+            if len(jobs) > before:
+                response_seen.set()
 
         except Exception as exc:
             debug_print(f"[Playwright] Response processing error: {exc}")
@@ -582,7 +670,7 @@ async def fetch_jobs_via_browser(search_state: Dict[str, Any]) -> List[JobRecord
     page.on("response", lambda r: asyncio.create_task(process_response(r)))
 
     print(f"[Hiring] Opening {url}")
-    await page.goto(url, wait_until="networkidle")
+    await page.goto(url, wait_until="domcontentloaded")
 
     # 2. BANNER & SCROLL
     try:
@@ -593,19 +681,23 @@ async def fetch_jobs_via_browser(search_state: Dict[str, Any]) -> List[JobRecord
         pass
 
     print("[Hiring] Scrolling to load all JSON pages...")
+    # Each scroll waits for the next search-jobs page to land, not for a fixed delay;
+    # scrolls that bring neither a response nor page growth within 2.5s count as stagnant.
+    # The scroll and the height read share one evaluate round trip.
     stagnant_height = 0
-    last_height = await page.evaluate("document.body.scrollHeight")
-    
+    last_height = 0
+
     for i in range(60):
-        await page.evaluate("window.scrollTo(0, document.body.scrollHeight);")
-        await page.wait_for_timeout(1500) 
-        new_height = await page.evaluate("document.body.scrollHeight")
-        
-        if new_height <= last_height:
-            stagnant_height += 1
-        else:
+        response_seen.clear()
+        height = await page.evaluate(
+            "() => { window.scrollTo(0, document.body.scrollHeight); return document.body.scrollHeight; }"
+        )
+        try:
+            await asyncio.wait_for(response_seen.wait(), timeout=2.5)
             stagnant_height = 0
-        last_height = new_height
+        except asyncio.TimeoutError:
+            stagnant_height = 0 if height > last_height else stagnant_height + 1
+        last_height = height
         
         if template_ready.is_set() and stagnant_height >= 3:
             print("[Hiring] Scroll bottom reached.")
@@ -619,20 +711,31 @@ async def fetch_jobs_via_browser(search_state: Dict[str, Any]) -> List[JobRecord
         print("[Hiring] Checking for missed pages via API replay...")
         current_page = captured_payload.get("page", 1) + 1 
         empty_fetches = 0
+        throttled = 0
         
+        # Pages are requested back to back; only a 429/503 slows us down, by its Retry-After
         while empty_fetches < 3:
             try:
                 payload = dict(captured_payload)
                 payload["page"] = current_page
                 resp = await session.post(
                     captured_url,
-                    data=json.dumps(payload),
+                    data=orjson.dumps(payload),
                     headers=captured_headers
                 )
+                if resp.status in (429, 503) and throttled < 3:
+                    throttled += 1
+                    try:
+                        delay = min(float(resp.headers.get("retry-after", 1)), 30.0)
+                    except ValueError:
+                        delay = 1.0
+                    await asyncio.sleep(delay)
+                    continue
                 if resp.status != 200:
                     break
+                throttled = 0
                     
-                data = await resp.json()
+                data = orjson.loads(await resp.body())
                 batch = []
                 if isinstance(data, list):
                     batch = data
@@ -647,10 +750,10 @@ async def fetch_jobs_via_browser(search_state: Dict[str, Any]) -> List[JobRecord
                 else:
                     new_count = 0
                     for item in batch:
-                        jr = JobRecord.from_api(item)
-                        if jr.job_id not in seen:
-                            seen.add(jr.job_id)
-                            jobs.append(jr)
+                        job_id = str(item.get("id") or item.get("objectID") or "")
+                        if job_id not in seen:
+                            seen.add(job_id)
+                            jobs.append(JobRecord.from_api(item))
                             new_count += 1
                     if new_count == 0:
                         empty_fetches += 1
@@ -658,7 +761,6 @@ async def fetch_jobs_via_browser(search_state: Dict[str, Any]) -> List[JobRecord
                         empty_fetches = 0 
                 
                 current_page += 1
-                await asyncio.sleep(0.5) 
             except Exception as exc:
                 debug_print(f"[Playwright] Pagination replay error: {exc}")
                 break
@@ -667,11 +769,16 @@ async def fetch_jobs_via_browser(search_state: Dict[str, Any]) -> List[JobRecord
     
     # 4. EXTERNAL DESCRIPTION SCRAPING
     await page.close() 
-    jobs_needing_scrape = [j for j in jobs if j.apply_url and len(j.description) < 200]
+    # Judge on tag-stripped text so markup padding does not hide a stub description
+    jobs_needing_scrape = [j for j in jobs if j.apply_url and len(strip_html(j.description)) < 200]
     
     if jobs_needing_scrape:
         print(f"[Hiring] {len(jobs_needing_scrape)} jobs need external scraping.")
         sem = asyncio.Semaphore(5) 
+        # Installed once on the context; every page gets the extractor pre-parsed
+        await context.add_init_script(EXTRACT_DESC_JS)
+        # Text is all we read: skip images, fonts, stylesheets and media
+        await context.route("**/*", _skip_heavy_resources)
 
         async def fetch_external_desc(job: JobRecord):
             target_url = job.apply_url
@@ -682,27 +789,21 @@ async def fetch_jobs_via_browser(search_state: Dict[str, Any]) -> List[JobRecord
                 p = await context.new_page()
                 try:
                     await p.goto(target_url, wait_until="domcontentloaded", timeout=45000)
+                    # Returns as soon as the page has rendered enough text, instead of polling every 2s
+                    try:
+                        await p.wait_for_function(
+                            "() => document.body && document.body.innerText.length > 500", timeout=4000
+                        )
+                    except Exception:
+                        pass
                     content = ""
-                    for attempt in range(5):
-                        try:
-                            content = await p.evaluate("""() => {
-                                const clone = document.body.cloneNode(true);
-                                const junk = clone.querySelectorAll('script, style, noscript, svg, nav, header, footer, button, iframe');
-                                junk.forEach(el => el.remove());
-                                let text = clone.innerText || '';
-                                if (text.length < 800) text = clone.textContent || '';
-                                return text;
-                            }""")
-                        except Exception:
-                            pass
-                        
-                        if len(content.strip()) > 500:
-                            break
-                        await asyncio.sleep(2.0)
+                    try:
+                        content = await p.evaluate("() => window.__extractDesc()")
+                    except Exception:
+                        pass
 
-                    clean_text = " ".join(content.split())
-                    if len(clean_text) > 200:
-                        job.description = clean_text
+                    if len(content) > 200:
+                        job.description = content
                 except Exception:
                     pass
                 finally:
@@ -722,14 +823,14 @@ async def fetch_jobs_via_browser(search_state: Dict[str, Any]) -> List[JobRecord
 # ==========================================
 
 def score_job_match(cv_profile_json: str, job: JobRecord, score_prompt: str, scoring_mode: str) -> Tuple[int, str]:
-    clean_desc = re.sub('<[^<]+?>', ' ', job.description)
+    clean_desc = strip_html(job.description)
     
     template_vars = {
         "cv_profile_json": cv_profile_json,
         "job_title": job.title,
         "job_company": job.company,
         "apply_url": job.apply_url,
-        "job_raw": json.dumps(job.raw)[:2000], 
+        "job_raw": orjson.dumps(job.raw).decode()[:2000], 
         "job_description": clean_desc[:15000],
     }
     
@@ -754,7 +855,7 @@ def score_job_match(cv_profile_json: str, job: JobRecord, score_prompt: str, sco
             )
             content = resp.choices[0].message.content if resp and resp.choices else ""
         else:
-            resp = requests.post(
+            resp = HTTP.post(
                 LOCAL_LLM_URL,
                 json={
                     "model": "local-model",
@@ -773,12 +874,7 @@ def score_job_match(cv_profile_json: str, job: JobRecord, score_prompt: str, sco
             except (KeyError, ValueError):
                 content = resp.text
 
-        if "```" in content:
-            match = re.search(r"```(?:json)?(.*?)```", content, re.DOTALL)
-            if match:
-                content = match.group(1).strip()
-            
-        result = safe_json_loads(content)
+        result = safe_json_loads(strip_json_markdown(content))
         return int(result.get("score", 0)), str(result.get("reason", "No reason provided"))
 
     except Exception as exc:
@@ -791,7 +887,7 @@ def red_team_analysis(cv_full_text: str, job: JobRecord) -> Dict[str, Any]:
     Simulates a hostile Hiring Manager reading the full CV.
     RUNS LOCALLY via Qwen/MLX to save tokens and privacy.
     """
-    clean_desc = re.sub('<[^<]+?>', ' ', job.description)
+    clean_desc = strip_html(job.description)
     
     # Inject variables
     prompt = RED_TEAM_PROMPT.replace("{job_title}", job.title)
@@ -802,7 +898,7 @@ def red_team_analysis(cv_full_text: str, job: JobRecord) -> Dict[str, Any]:
     try:
         # --- LOCAL LLM SWITCH ---
         # Using local endpoint instead of OpenAI
-        resp = requests.post(
+        resp = HTTP.post(
             LOCAL_LLM_URL,
             json={
                 "model": "local-model",
@@ -826,13 +922,7 @@ def red_team_analysis(cv_full_text: str, job: JobRecord) -> Dict[str, Any]:
         except (KeyError, ValueError):
             content = resp.text
 
-        # Sanitize JSON 
-        if "```" in content:
-            match = re.search(r"```(?:json)?(.*?)```", content, re.DOTALL)
-            if match:
-                content = match.group(1).strip()
-        
-        return safe_json_loads(content)
+        return safe_json_loads(strip_json_markdown(content))
 
     except Exception as e:
         print(f"[RedTeam] Failed for {job.company}: {e}")
@@ -849,12 +939,13 @@ def send_telegram_message(text: str):
 
     url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
     try:
-        if len(text) > 4000:
-            for i in range(0, len(text), 4000):
-                chunk = text[i:i+4000]
-                requests.post(url, json={"chat_id": TELEGRAM_CHAT_ID, "text": chunk}, timeout=10)
-        else:
-            requests.post(url, json={"chat_id": TELEGRAM_CHAT_ID, "text": text}, timeout=10)
+        # Pooled session; no link previews, so Telegram doesn't fetch every apply URL
+        for i in range(0, max(len(text), 1), 4000):
+            HTTP.post(
+                url,
+                json={"chat_id": TELEGRAM_CHAT_ID, "text": text[i:i + 4000], "disable_web_page_preview": True},
+                timeout=10,
+            )
     except Exception as exc:
         print(f"[Telegram] Error: {exc}")
 
@@ -876,6 +967,92 @@ def summarize_jobs(jobs_with_scores):
     return msg
 
 
+# Static report chunks, built once; export_jobs_html streams the rows between them
+_REPORT_HEAD = """<!doctype html>
+<html>
+<head>
+  <meta charset="utf-8" />
+  <title>Hob-Junter Intelligence Report</title>
+  <style>
+    body { font-family: 'Segoe UI', Roboto, Helvetica, sans-serif; margin: 0; background: #f4f6f8; color: #172b4d; }
+    .container { max-width: 1200px; margin: 40px auto; padding: 0 20px; }
+    
+    .strategy-box { background: white; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); padding: 25px; margin-bottom: 30px; border-top: 5px solid #1a73e8; }
+    .strategy-header { display: flex; justify-content: space-between; align-items: flex-start; margin-bottom: 20px; border-bottom: 1px solid #eee; padding-bottom: 15px; }
+    .strategy-header h2 { margin: 0; font-size: 1.4em; }
+    .stats-box { text-align: right; font-size: 0.9em; color: #5e6c84; }
+    
+    .grid-container { display: grid; grid-template-columns: 1fr 1fr; gap: 30px; }
+    .panel h3 { margin-top: 0; color: #091e42; font-size: 1.1em; border-bottom: 2px solid #dfe1e6; padding-bottom: 8px; display: inline-block; }
+    .suggestion-list { padding-left: 20px; font-size: 0.9em; color: #333; }
+    .suggestion-list li { margin-bottom: 8px; }
+    
+    .tag-container { display: flex; flex-wrap: wrap; gap: 8px; margin-top: 10px; }
+    .tag { padding: 4px 10px; border-radius: 4px; font-size: 0.85em; font-weight: 500; }
+    .tag-role { background: #e3f2fd; color: #0d47a1; border: 1px solid #bbdefb; }
+    .tag-exclude { background: #ffebee; color: #c62828; border: 1px solid #ffcdd2; }
+
+    table { border-collapse: collapse; width: 100%; background: #fff; box-shadow: 0 1px 3px rgba(0,0,0,0.1); border-radius: 8px; overflow: hidden; }
+    th, td { padding: 15px; border-bottom: 1px solid #ebecf0; vertical-align: middle; text-align: left; }
+    th { background: #fafbfc; font-weight: 600; color: #5e6c84; font-size: 0.9em; text-transform: uppercase; letter-spacing: 0.05em; }
+    tr:hover { background: #f4f5f7; }
+    
+    .job-title { font-weight: 600; font-size: 1.05em; color: #172b4d; }
+    .job-comp { font-size: 0.9em; color: #6b778c; margin-top: 2px; }
+    .reason-cell { font-size: 0.9em; color: #42526e; line-height: 1.5; }
+    
+    .btn { display: inline-block; padding: 6px 12px; background: #0052cc; color: white; text-decoration: none; border-radius: 3px; font-size: 0.9em; font-weight: 500; }
+    .btn:hover { background: #0065ff; }
+  </style>
+</head>
+<body>
+  <div class="container">
+    """
+
+_REPORT_TABLE_HEAD = """
+    
+    <table>
+      <thead>
+        <tr><th style="width: 30%">Role</th><th style="width: 10%">Score</th><th style="width: 10%">Action</th><th>Analysis</th></tr>
+      </thead>
+      <tbody>
+        """
+
+_REPORT_FOOT = """
+      </tbody>
+    </table>
+    <p style="text-align: center; color: #888; font-size: 0.8em; margin-top: 30px;">Generated by Hob-Junter at {generated}</p>
+  </div>
+</body>
+</html>"""
+
+
+def _report_row(job, score, reason, red_team_data) -> str:
+    color = "#137333" if score >= 80 else "#f9ab00" if score >= 60 else "#d93025"
+    
+    # Build Red Team HTML if present
+    red_team_html = ""
+    if red_team_data and score >= 85:
+        questions = "<li>" + "</li><li>".join(red_team_data.get('interview_questions', [])) + "</li>"
+        hook = red_team_data.get('outreach_hook', 'N/A')
+        red_team_html = f"""
+            <div style="background: #fff0f0; padding: 12px; margin-top: 10px; border-left: 4px solid #d93025; font-size: 0.9em; border-radius: 4px;">
+                <strong style="color: #b71c1c;"> Red Team Analysis (Kill Questions):</strong>
+                <ul style="margin: 5px 0 10px 20px; color: #333;">{questions}</ul>
+                <div style="background: #e3f2fd; padding: 8px; border-left: 4px solid #1976d2; color: #0d47a1; margin-top: 5px;">
+                    <strong>📧 Sniper Outreach:</strong> "{html.escape(hook)}"
+                </div>
+            </div>
+            """
+
+    return (
+        f"<tr><td><div class='job-title'>{html.escape(job.title)}</div><div class='job-comp'>{html.escape(job.company)}</div></td>"
+        f"<td><span style='font-size:1.2em; font-weight:bold; color:{color}'>{score}</span></td>"
+        f"<td><a href='{html.escape(job.apply_url)}' target='_blank' class='btn'>Apply</a></td>"
+        f"<td class='reason-cell'>{html.escape(reason)}{red_team_html}</td></tr>"
+    )
+
+
 def export_jobs_html(jobs_with_scores, strategy_data, path: str):
     if not jobs_with_scores:
         return
@@ -925,91 +1102,19 @@ def export_jobs_html(jobs_with_scores, strategy_data, path: str):
     </div>
     """
 
-    rows = []
-    # Sort and Unpack
     sorted_jobs = sorted(jobs_with_scores, key=lambda x: x[1], reverse=True)
-    
-    for job, score, reason, red_team_data in sorted_jobs:
-        color = "#137333" if score >= 80 else "#f9ab00" if score >= 60 else "#d93025"
-        
-        # Build Red Team HTML if present
-        red_team_html = ""
-        if red_team_data and score >= 85:
-            questions = "<li>" + "</li><li>".join(red_team_data.get('interview_questions', [])) + "</li>"
-            hook = red_team_data.get('outreach_hook', 'N/A')
-            red_team_html = f"""
-            <div style="background: #fff0f0; padding: 12px; margin-top: 10px; border-left: 4px solid #d93025; font-size: 0.9em; border-radius: 4px;">
-                <strong style="color: #b71c1c;"> Red Team Analysis (Kill Questions):</strong>
-                <ul style="margin: 5px 0 10px 20px; color: #333;">{questions}</ul>
-                <div style="background: #e3f2fd; padding: 8px; border-left: 4px solid #1976d2; color: #0d47a1; margin-top: 5px;">
-                    <strong>📧 Sniper Outreach:</strong> "{html.escape(hook)}"
-                </div>
-            </div>
-            """
 
-        rows.append(
-            f"<tr><td><div class='job-title'>{html.escape(job.title)}</div><div class='job-comp'>{html.escape(job.company)}</div></td>"
-            f"<td><span style='font-size:1.2em; font-weight:bold; color:{color}'>{score}</span></td>"
-            f"<td><a href='{html.escape(job.apply_url)}' target='_blank' class='btn'>Apply</a></td>"
-            f"<td class='reason-cell'>{html.escape(reason)}{red_team_html}</td></tr>"
-        )
-        
-    html_doc = f"""<!doctype html>
-<html>
-<head>
-  <meta charset="utf-8" />
-  <title>Hob-Junter Intelligence Report</title>
-  <style>
-    body {{ font-family: 'Segoe UI', Roboto, Helvetica, sans-serif; margin: 0; background: #f4f6f8; color: #172b4d; }}
-    .container {{ max-width: 1200px; margin: 40px auto; padding: 0 20px; }}
-    
-    .strategy-box {{ background: white; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); padding: 25px; margin-bottom: 30px; border-top: 5px solid #1a73e8; }}
-    .strategy-header {{ display: flex; justify-content: space-between; align-items: flex-start; margin-bottom: 20px; border-bottom: 1px solid #eee; padding-bottom: 15px; }}
-    .strategy-header h2 {{ margin: 0; font-size: 1.4em; }}
-    .stats-box {{ text-align: right; font-size: 0.9em; color: #5e6c84; }}
-    
-    .grid-container {{ display: grid; grid-template-columns: 1fr 1fr; gap: 30px; }}
-    .panel h3 {{ margin-top: 0; color: #091e42; font-size: 1.1em; border-bottom: 2px solid #dfe1e6; padding-bottom: 8px; display: inline-block; }}
-    .suggestion-list {{ padding-left: 20px; font-size: 0.9em; color: #333; }}
-    .suggestion-list li {{ margin-bottom: 8px; }}
-    
-    .tag-container {{ display: flex; flex-wrap: wrap; gap: 8px; margin-top: 10px; }}
-    .tag {{ padding: 4px 10px; border-radius: 4px; font-size: 0.85em; font-weight: 500; }}
-    .tag-role {{ background: #e3f2fd; color: #0d47a1; border: 1px solid #bbdefb; }}
-    .tag-exclude {{ background: #ffebee; color: #c62828; border: 1px solid #ffcdd2; }}
-
-    table {{ border-collapse: collapse; width: 100%; background: #fff; box-shadow: 0 1px 3px rgba(0,0,0,0.1); border-radius: 8px; overflow: hidden; }}
-    th, td {{ padding: 15px; border-bottom: 1px solid #ebecf0; vertical-align: middle; text-align: left; }}
-    th {{ background: #fafbfc; font-weight: 600; color: #5e6c84; font-size: 0.9em; text-transform: uppercase; letter-spacing: 0.05em; }}
-    tr:hover {{ background: #f4f5f7; }}
-    
-    .job-title {{ font-weight: 600; font-size: 1.05em; color: #172b4d; }}
-    .job-comp {{ font-size: 0.9em; color: #6b778c; margin-top: 2px; }}
-    .reason-cell {{ font-size: 0.9em; color: #42526e; line-height: 1.5; }}
-    
-    .btn {{ display: inline-block; padding: 6px 12px; background: #0052cc; color: white; text-decoration: none; border-radius: 3px; font-size: 0.9em; font-weight: 500; }}
-    .btn:hover {{ background: #0065ff; }}
-  </style>
-</head>
-<body>
-  <div class="container">
-    {header_html}
-    
-    <table>
-      <thead>
-        <tr><th style="width: 30%">Role</th><th style="width: 10%">Score</th><th style="width: 10%">Action</th><th>Analysis</th></tr>
-      </thead>
-      <tbody>
-        {''.join(rows)}
-      </tbody>
-    </table>
-    <p style="text-align: center; color: #888; font-size: 0.8em; margin-top: 30px;">Generated by Hob-Junter at {datetime.now().strftime('%H:%M:%S')}</p>
-  </div>
-</body>
-</html>"""
-    
-    with open(path, "w") as f:
-        f.write(html_doc)
+    # Static page chunks are built once at import; rows are streamed straight to the
+    # file, written beside the target and swapped in, so a browser refresh never
+    # sees a half-written report
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", buffering=1 << 20) as f:
+        f.write(_REPORT_HEAD)
+        f.write(header_html)
+        f.write(_REPORT_TABLE_HEAD)
+        f.writelines(_report_row(*item) for item in sorted_jobs)
+        f.write(_REPORT_FOOT.format(generated=datetime.now().strftime('%H:%M:%S')))
+    os.replace(tmp_path, path)
     
     # Just quiet update, we show progress in console
     # print(f"[Report] Updated {path} with {len(jobs_with_scores)} matches.", end="\r")
@@ -1023,7 +1128,7 @@ def parse_hiring_cafe_search_state_from_url(url: str) -> Dict[str, Any]:
         return {}
     raw = qs["searchState"][0]
     decoded = urllib.parse.unquote(raw)
-    return json.loads(decoded)
+    return orjson.loads(decoded)
 
 
 # ==========================================
@@ -1053,25 +1158,26 @@ async def main():
     # Step 1 - OCR / Cache
     print_phase_header(1, "CV INTELLIGENCE & OCR")
     cv_text_raw = ""
+    advisor_task = None
     
     if cv_path.lower().endswith(".json"):
-        cv_profile_json = load_cv_profile_from_json(cv_path)
-        cv_text_raw = cv_profile_json 
+        cv_profile_data, cv_profile_json = load_cv_profile_from_json(cv_path)
+        cv_text_raw = cv_profile_json
     else:
         use_cache = False
         cv_text_path = DEFAULT_CV_TEXT_PATH
         
-        if os.path.exists(cv_profile_path) and os.path.exists(cv_text_path):
-            try:
-                if (os.path.getmtime(cv_profile_path) > os.path.getmtime(cv_path) and 
-                    os.path.getmtime(cv_text_path) > os.path.getmtime(cv_path)):
-                    use_cache = True
-            except OSError:
-                pass
+        # One stat per file: a missing cache file raises, so no separate exists() checks
+        try:
+            cv_mtime = os.stat(cv_path).st_mtime
+            use_cache = (os.stat(cv_profile_path).st_mtime > cv_mtime and
+                         os.stat(cv_text_path).st_mtime > cv_mtime)
+        except OSError:
+            pass
 
         if use_cache:
             print(f"[CV] Using cached profile & text...")
-            cv_profile_json = load_cv_profile_from_json(cv_profile_path)
+            cv_profile_data, cv_profile_json = load_cv_profile_from_json(cv_profile_path)
             try:
                 with open(cv_text_path, "r", encoding="utf-8") as f:
                     cv_text_raw = f.read()
@@ -1079,31 +1185,41 @@ async def main():
                 print(f"[CV] Warning: Failed to read cached text: {e}")
         else:
             print("[CV] Extracting text from PDF (Fresh Run)...")
-            cv_text_raw = extract_text_from_cv_pdf_with_gpt(cv_path, ocr_prompt)
-            
-            try:
-                with open(cv_text_path, "w", encoding="utf-8") as f:
-                    f.write(cv_text_raw)
-            except Exception as e:
-                print(f"[CV] Warning: Failed to cache raw text: {e}")
+            cv_text_raw = await asyncio.to_thread(extract_text_from_cv_pdf_with_gpt, cv_path, ocr_prompt)
+
+            def cache_raw_text():
+                try:
+                    with open(cv_text_path, "w", encoding="utf-8") as f:
+                        f.write(cv_text_raw)
+                except Exception as e:
+                    print(f"[CV] Warning: Failed to cache raw text: {e}")
+
+            # The advisor only needs the raw text, so it runs alongside the profile build
+            if not search_url and cv_text_raw:
+                advisor_task = asyncio.create_task(asyncio.to_thread(consult_career_advisor_gpt, cv_text_raw))
 
             print("[CV] Building profile...")
-            cv_profile_json = build_cv_profile(cv_text_raw, profile_prompt)
+            # ...and so does caching it to disk
+            _, (cv_profile_data, cv_profile_json) = await asyncio.gather(
+                asyncio.to_thread(cache_raw_text),
+                asyncio.to_thread(build_cv_profile, cv_text_raw, profile_prompt),
+            )
             save_cv_profile_to_file(cv_profile_json, cv_profile_path)
     
-    cv_profile_data = json.loads(cv_profile_json)
-    
     # Step 2 - Strategy
     print_phase_header(2, "STRATEGIC ALIGNMENT")
     strategy_data = {}
     if not search_url:
         print("[Advisor] Initializing strategic analysis...")
         if not cv_text_raw:
-             cv_text_for_strategy = json.dumps(cv_profile_data, indent=2)
+             cv_text_for_strategy = orjson.dumps(cv_profile_data, option=orjson.OPT_INDENT_2).decode()
         else:
              cv_text_for_strategy = cv_text_raw
 
-        advisor_response = consult_career_advisor_gpt(cv_text_for_strategy)
+        if advisor_task:
+            advisor_response = await advisor_task
+        else:
+            advisor_response = consult_career_advisor_gpt(cv_text_for_strategy)
         
         ai_suggestions = advisor_response.get("suggestions", [])
         industry = advisor_response.get("industry", "Unknown")
@@ -1146,61 +1262,83 @@ async def main():
     print(f"[Pipeline] Processing {len(valid_jobs)} jobs for scoring...\n")
 
     scored = []
-    start_time = time.time()
+    good_matches_temp = []
+    report_dirty = False
+    start_time = time.monotonic()
     total_jobs = len(valid_jobs)
-    
-    for i, job in enumerate(valid_jobs):
-        # 1. CALCULATE ETA
-        elapsed = time.time() - start_time
-        processed_count = i
-        
-        if processed_count > 0:
-            avg_time_per_job = elapsed / processed_count
-            remaining_jobs = total_jobs - processed_count
-            est_remaining_seconds = avg_time_per_job * remaining_jobs
+    # Hot names bound once for the loop; the 26 possible bars are built up front
+    bar_length = 25
+    bars = ["█" * n + "░" * (bar_length - n) for n in range(bar_length + 1)]
+    now, write, flush = time.monotonic, sys.stdout.write, sys.stdout.flush
+    last_draw, draw_interval = 0.0, 1 / PROGRESS_HZ
+
+    # Scoring runs SCORE_CONCURRENCY jobs at a time in worker threads; results are
+    # handled below in completion order. Red team analyses of high matches start as
+    # soon as the score is in, under their own semaphore, so a slow critique never
+    # holds a scoring slot; they are gathered once scoring is done.
+    sem = asyncio.Semaphore(SCORE_CONCURRENCY)
+    red_team_sem = asyncio.Semaphore(RED_TEAM_CONCURRENCY)
+    red_team_tasks = {}  # position in scored -> task
+
+    async def process_job(job):
+        async with sem:
+            score, reason = await asyncio.to_thread(score_job_match, cv_profile_json, job, score_prompt, scoring_mode)
+        return job, score, reason
+
+    async def red_team_job(job):
+        async with red_team_sem:
+            return await asyncio.to_thread(red_team_analysis, cv_text_raw, job)
+
+    for i, next_result in enumerate(asyncio.as_completed([process_job(j) for j in valid_jobs])):
+        job, score, reason = await next_result
+        done_count = i + 1
+        high_match = score >= 85 and cv_text_raw
+
+        # Redrawn at most PROGRESS_HZ times/s; always for the last job and before a HIGH MATCH line
+        t = now()
+        if t - last_draw >= draw_interval or done_count == total_jobs or high_match:
+            last_draw = t
+
+            # 1. CALCULATE ETA (from the completion rate, since jobs finish out of order)
+            est_remaining_seconds = (t - start_time) / done_count * (total_jobs - done_count)
             mins, secs = divmod(int(est_remaining_seconds), 60)
             eta_str = f"{mins}m {secs}s"
-        else:
-            eta_str = "Calc..."
-            
-        # 2. BUILD PROGRESS BAR
-        percent = ((i + 1) / total_jobs) * 100
-        bar_length = 25
-        filled_length = int(bar_length * (i + 1) // total_jobs)
-        bar = "█" * filled_length + "░" * (bar_length - filled_length)
-        
-        # 3. PRINT STATUS (Overwriting line with \r)
-        # We assume 15-20 chars for Company to avoid line wrapping
-        comp_display = (job.company[:18] + '..') if len(job.company) > 18 else job.company
-        
-        sys.stdout.write(f"\r\033[K   ⏳ [{bar}] {int(percent)}% ({i+1}/{total_jobs}) | ETA: {eta_str} | Scoring: {comp_display}")
-        sys.stdout.flush()
-        
-        # 4. PERFORM ACTION
-        score, reason = score_job_match(cv_profile_json, job, score_prompt, scoring_mode)
+
+            # 2. BUILD PROGRESS BAR
+            percent = (done_count / total_jobs) * 100
+            bar = bars[bar_length * done_count // total_jobs]
+
+            # 3. PRINT STATUS (Overwriting line with \r)
+            # We assume 15-20 chars for Company to avoid line wrapping
+            comp_display = (job.company[:18] + '..') if len(job.company) > 18 else job.company
+
+            write(f"\r\033[K   ⏳ [{bar}] {int(percent)}% ({done_count}/{total_jobs}) | ETA: {eta_str} | Scored: {comp_display}")
+            flush()
         
-        red_team_data = {}
-        # Only run Red Team for high scores (e.g. >= 85)
-        if score >= 85 and cv_text_raw:
-             # CLEAR LINE & PRINT ALERT
-             sys.stdout.write(f"\n\r\033[K   \033[1;32mHIGH MATCH DETECTED ({score}/100): {job.company} - {job.title}\033[0m\n")
-             sys.stdout.write(f"   [Red Team] Engaged... (This takes a moment)\n")
-             sys.stdout.flush()
-             
-             red_team_data = red_team_analysis(cv_text_raw, job)
-             
-             # Print completion of Red Team so user knows we are moving on
-             sys.stdout.write(f"   [Red Team] Done.\n")
+        # 4. REPORT HIGH MATCHES (e.g. >= 85) and queue their Red Team analysis
+        if high_match:
+             write(f"\n\r\033[K   \033[1;32mHIGH MATCH DETECTED ({score}/100): {job.company} - {job.title}\033[0m\n")
+             write(f"   [Red Team] Queued.\n")
+             flush()
+             red_team_tasks[len(scored)] = asyncio.create_task(red_team_job(job))
         
-        scored.append((job, score, reason, red_team_data))
+        scored.append((job, score, reason, {}))
+        if score >= threshold:
+            good_matches_temp.append((job, score, reason, {}))
+            report_dirty = True
         
-        if (i + 1) % 5 == 0:
-            good_matches_temp = [x for x in scored if x[1] >= threshold]
-            if good_matches_temp:
-                export_jobs_html(good_matches_temp, strategy_data, report_filename)
+        # Rewrite the report only when a new match has arrived since the last export
+        if done_count % 5 == 0 and report_dirty:
+            export_jobs_html(good_matches_temp, strategy_data, report_filename)
+            report_dirty = False
                 
     print("\n\n[Pipeline] Scoring complete.")
 
+    if red_team_tasks:
+        print(f"[Red Team] Waiting for {len(red_team_tasks)} analyses...")
+        for pos, red_team_data in zip(red_team_tasks, await asyncio.gather(*red_team_tasks.values())):
+            scored[pos] = scored[pos][:3] + (red_team_data,)
+
     good_matches = [x for x in scored if x[1] >= threshold]
     
     if good_matches:
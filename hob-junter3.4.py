@@ -2,21 +2,32 @@ import os
 import json
 import time
 import sys
+import functools
+import hashlib
+import math
 import re
 import html
+import sqlite3
 import urllib.parse
-import difflib
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib.parse import urlparse
-from threading import Lock
+import asyncio
 
 # Third-party
+import aiohttp
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import trafilatura
-import pypdf
-from bs4 import BeautifulSoup
-from openai import OpenAI
+import pypdfium2 as pdfium
+import lxml.etree
+import lxml.html
+from openai import AsyncOpenAI, OpenAI
+from rapidfuzz import fuzz, process
+from rapidfuzz.utils import default_process
 from googleapiclient.discovery import build
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
@@ -28,7 +39,11 @@ from google.oauth2.credentials import Credentials
 
 CONFIG_FILE = "inputs.json"
 PROFILE_FILE = "cv_profile_master.json"
-HISTORY_FILE = "job_history.json"
+HISTORY_FILE = "job_history.db"
+LEGACY_HISTORY_FILE = "job_history.json"  # Pre-SQLite history, imported once
+BLOCK_PREFIX_LEN = 4  # Dedup blocking key: first N chars of the normalized company
+HISTORY_COMMIT_EVERY = 10  # History rows per commit; flush() commits the remainder
+URL_BLOOM_ERROR_RATE = 0.01  # has_url false-positive rate; only positives reach SQLite
 REPORT_FILE = f"jobs_report_{datetime.now().strftime('%Y%m%d_%H%M')}.html"
 DEBUG = True
 
@@ -56,6 +71,29 @@ def debug(msg):
     if DEBUG:
         print(f"[DEBUG] {msg}")
 
+class Progress:
+    """Single-line counter redrawn at most PROGRESS_HZ times/s instead of one tty write per item."""
+    def __init__(self, label, total):
+        self.label, self.total = label, total
+        self.done = 0
+        self._last_draw = 0.0
+
+    def update(self, n=1):
+        self.done += n
+        now = time.monotonic()
+        if now - self._last_draw >= 1 / PROGRESS_HZ:
+            self._last_draw = now
+            self._draw()
+
+    def close(self):
+        self._draw()
+        sys.stdout.write("\n")
+        sys.stdout.flush()
+
+    def _draw(self):
+        sys.stdout.write(f"\r   > {self.label}: {self.done}/{self.total}")
+        sys.stdout.flush()
+
 SCORE_PROMPT = """You are a ruthless Executive Recruiter. 
 Assess this job for a Senior Tech Leader.
 
@@ -78,11 +116,63 @@ OUTPUT STRICT JSON:
 }
 """
 
+SCORE_BATCH_PROMPT = """You are a ruthless Executive Recruiter. 
+Assess EACH job below for a Senior Tech Leader, independently of the others.
+
+Every job carries a "data_type". If it is SNIPPET_ONLY the content is missing: MAX SCORE 65 for that job.
+
+CANDIDATE PROFILE:
+{cv_profile}
+
+JOBS:
+{jobs_json}
+
+OUTPUT STRICT JSON, one result per job, "id" copied from the input:
+{
+  "results": [
+    {
+      "id": "<job id>",
+      "score": <0-100>,
+      "company": "<extracted>",
+      "title": "<extracted>",
+      "reason": "<short justification>",
+      "manual_review_needed": <boolean>
+    }
+  ]
+}
+"""
+
 PROFILE_GEN_PROMPT = "Extract structured profile: Leadership Scope, Core Tech Stack, Strategic Skills. Return JSON."
 
-# GLOBAL STATE & LOCKS
+# FETCH / SCORING CONCURRENCY
+FETCH_CONCURRENCY = 50  # Total in-flight ATS page fetches
+FETCH_PER_HOST = 2      # Per-ATS-host cap, keeps us under rate limits
+FETCH_TIMEOUT = 15      # Seconds per connect / per read; time queued for a pool slot does not count
+SCORE_WORKERS = 8       # Concurrent OpenAI scoring workers
+SCORE_BATCH_SIZE = 8    # Max leads a scorer packs into one completion
+SHEETS_FLUSH_ROWS = 20  # Accepted rows buffered per Sheets append call
+PROGRESS_HZ = 10        # Max progress-line redraws per second
+# Shared keep-alive pool (Telegram): one TCP/TLS handshake per host, not per call.
+HTTP = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(
+        total=3,
+        read=0,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset(["POST"]),
+        raise_on_status=False,
+    ),
+)
+HTTP.mount("http://", _adapter)
+HTTP.mount("https://", _adapter)
+
+FETCH_HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+
+# GLOBAL STATE (only touched from the event loop thread, so no lock)
 BLOCKED_DOMAINS = set()
-DOMAIN_LOCK = Lock()
 
 # ==========================================
 # 2. CORE UTILS
@@ -91,60 +181,105 @@ DOMAIN_LOCK = Lock()
 def load_config():
     if os.path.exists(CONFIG_FILE):
         try:
-            with open(CONFIG_FILE, "r") as f:
-                return json.load(f)
+            with open(CONFIG_FILE, "rb") as f:
+                return orjson.loads(f.read())
         except:
             return {}
     return {}
 
 def save_config(cfg):
-    with open(CONFIG_FILE, "w") as f: json.dump(cfg, f, indent=2)
+    with open(CONFIG_FILE, "wb") as f: f.write(orjson.dumps(cfg, option=orjson.OPT_INDENT_2))
+
+_BLOCKED = frozenset(k.lower() for k in TRACKING_BLOCKLIST)
 
+@functools.lru_cache(maxsize=8192)
 def clean_url(url):
+    # Always rebuilt, so URLs differing only in host case, trailing slash or query
+    # encoding share one dedup / has_url key (same rules as the scraper's _canonical_url)
     try:
-        parsed = urllib.parse.urlparse(url)
-        qs = urllib.parse.parse_qs(parsed.query, keep_blank_values=True)
-        new_qs = {k: v for k, v in qs.items() if k.lower() not in TRACKING_BLOCKLIST}
-        new_query = urllib.parse.urlencode(new_qs, doseq=True)
+        parsed = urllib.parse.urlparse(url.strip())
+        pairs = urllib.parse.parse_qsl(parsed.query, keep_blank_values=True)
+        new_query = urllib.parse.urlencode([(k, v) for k, v in pairs if k.lower() not in _BLOCKED])
         return urllib.parse.urlunparse((
-            parsed.scheme, parsed.netloc, parsed.path, 
+            parsed.scheme.lower(), parsed.netloc.lower(), parsed.path.rstrip("/"),
             parsed.params, new_query, parsed.fragment
         ))
     except: return url
 
+_PLACEHOLDER_RE = re.compile(r"\{(\w+)\}")
+
+def compile_prompt(template, **fixed):
+    """
+    Splits a template once into [literal, field, literal, ..., literal] with the
+    fixed fields (e.g. the ~10 KB CV profile) already merged into the literals.
+    Rendering is then a single join instead of one full-prompt replace per field.
+    """
+    parts = _PLACEHOLDER_RE.split(template)
+    out = [parts[0]]
+    for i in range(1, len(parts), 2):
+        name, literal = parts[i], parts[i + 1]
+        if name in fixed:
+            out[-1] += fixed[name] + literal
+        else:
+            out += [name, literal]
+    return out
+
+def render_prompt(parts, **values):
+    return "".join(values.get(p, "{" + p + "}") if i % 2 else p for i, p in enumerate(parts))
+
 def safe_read_pdf(path):
     try:
-        reader = pypdf.PdfReader(path)
-        return "\n".join([(page.extract_text() or "") for page in reader.pages])[:50000]
+        # PDFium (C++) text extraction; stop reading pages once the cap is reached
+        pdf = pdfium.PdfDocument(path)
+        try:
+            chunks, total = [], 0
+            for page in pdf:
+                text = page.get_textpage().get_text_range()
+                chunks.append(text); total += len(text)
+                if total >= 50000: break
+            return "\n".join(chunks)[:50000]
+        finally:
+            pdf.close()
     except Exception as e:
         print(f"[Error] PDF Read: {e}"); return ""
 
+# One alternation = one pass over the header, however many signatures there are
+_GARBAGE_RE = re.compile("|".join(re.escape(sig) for sig in GARBAGE_SIGNATURES))
+
 def is_garbage_content(text):
     if len(text) < 300: return True
-    header_text = text.lower()[:1000]
-    for sig in GARBAGE_SIGNATURES:
-        if sig in header_text: return True
-    return False
+    return _GARBAGE_RE.search(text[:1000].lower()) is not None
+
+# Text nodes minus <script>/<style> content (itertext() would include the page's JSON blobs)
+_VISIBLE_TEXT = lxml.etree.XPath('.//text()[not(ancestor::script or ancestor::style)]', smart_strings=False)
+
+def node_text(el):
+    # Equivalent of BeautifulSoup's get_text(separator="\n")
+    return "\n".join(_VISIBLE_TEXT(el))
+
+JSONLD_MAX_BYTES = 200_000
+
+# smart_strings=False: plain str results, which orjson accepts (it rejects str subclasses)
+_JSONLD = lxml.etree.XPath('//script[@type="application/ld+json"]/text()', smart_strings=False)
 
-def extract_date_posted(soup):
+class _DateFound(Exception):
+    def __init__(self, value): self.value = value
+
+def _find_date(obj):
+    # Raises on the first hit so the recursion unwinds immediately
+    if isinstance(obj, dict):
+        if obj.get("@type") == "JobPosting" and obj.get("datePosted"): raise _DateFound(obj["datePosted"])
+        for v in obj.values(): _find_date(v)
+    elif isinstance(obj, list):
+        for item in obj: _find_date(item)
+
+def extract_date_posted(tree):
     try:
-        scripts = soup.find_all('script', type='application/ld+json')
-        for s in scripts:
-            if not s.string: continue
-            data = json.loads(s.string)
-            def find_date(obj):
-                if isinstance(obj, dict):
-                    if obj.get("@type") == "JobPosting" and "datePosted" in obj: return obj["datePosted"]
-                    for k, v in obj.items():
-                        res = find_date(v); 
-                        if res: return res
-                elif isinstance(obj, list):
-                    for item in obj:
-                        res = find_date(item); 
-                        if res: return res
-                return None
-            res = find_date(data)
-            if res: return res
+        for s in _JSONLD(tree):
+            # Skip blobs that can't contain a JobPosting (and oversized ones) before parsing
+            if not s or len(s) > JSONLD_MAX_BYTES or '"JobPosting"' not in s: continue
+            try: _find_date(orjson.loads(s))
+            except _DateFound as hit: return hit.value
     except: pass
     return None
 
@@ -161,7 +296,7 @@ class TelegramBot:
         if not self.token or not self.chat_id: return
         try:
             url = f"https://api.telegram.org/bot{self.token}/sendMessage"
-            requests.post(url, json={"chat_id": self.chat_id, "text": message, "parse_mode": "HTML"}, timeout=5)
+            HTTP.post(url, json={"chat_id": self.chat_id, "text": message, "parse_mode": "HTML"}, timeout=5)
         except Exception as e:
             print(f" [!] Telegram Error: {e}")
 
@@ -169,6 +304,7 @@ class SheetsClient:
     def __init__(self, spreadsheet_id):
         self.spreadsheet_id = spreadsheet_id
         self.service = None
+        self._pending_rows = []
         
     def authenticate(self):
         if not self.spreadsheet_id: return
@@ -194,128 +330,270 @@ class SheetsClient:
                 token.write(creds.to_json())
         self.service = build('sheets', 'v4', credentials=creds)
 
-    def append_row(self, job_data):
+    def queue_row(self, job_data):
         if not self.service: return
+        self._pending_rows.append([
+            datetime.now().strftime("%Y-%m-%d"),
+            job_data.get('score', 0),
+            job_data.get('company', ''),
+            job_data.get('title', ''),
+            job_data.get('url', ''),
+            job_data.get('reason', '')
+        ])
+        if len(self._pending_rows) >= SHEETS_FLUSH_ROWS: self.flush()
+
+    def flush(self):
+        # One values().append round trip for all queued rows
+        if not self.service or not self._pending_rows: return
+        rows, self._pending_rows = self._pending_rows, []
         try:
-            values = [[
-                datetime.now().strftime("%Y-%m-%d"),
-                job_data.get('score', 0),
-                job_data.get('company', ''),
-                job_data.get('title', ''),
-                job_data.get('url', ''),
-                job_data.get('reason', '')
-            ]]
-            body = {'values': values}
+            body = {'values': rows}
             self.service.spreadsheets().values().append(
                 spreadsheetId=self.spreadsheet_id, range="Sheet1!A1",
                 valueInputOption="USER_ENTERED", body=body
             ).execute()
         except Exception as e:
-            print(f" [!] Sheets Error: {e}")
+            print(f" [!] Sheets Error ({len(rows)} rows): {e}")
 
 # ==========================================
 # 4. DEDUPLICATION
 # ==========================================
 
+def _length_window(n, cutoff):
+    # fuzz.ratio <= 200*min(la, lb)/(la + lb), so strings outside [lo, hi] can never reach cutoff
+    k = cutoff / (200 - cutoff)
+    return n * k, n / k
+
+class UrlBloom:
+    """
+    Bloom filter over history URLs, sized for `capacity` entries at `error_rate`.
+    A miss is definitive; a hit still has to be confirmed against SQLite.
+    """
+    def __init__(self, capacity, error_rate=URL_BLOOM_ERROR_RATE):
+        capacity = max(capacity, 1000)
+        self.size = int(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, url):
+        # Double hashing: k positions from the two halves of one 128-bit digest
+        digest = hashlib.blake2b(url.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, url):
+        for pos in self._positions(url):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, url):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(url))
+
 class Deduplicator:
     def __init__(self, history_file=HISTORY_FILE):
         self.history_file = history_file
-        self.history = self._load_history()
-
-    def _load_history(self):
-        if os.path.exists(self.history_file):
-            try:
-                with open(self.history_file, "r") as f:
-                    return json.load(f)
-            except:
-                pass
-        return []
+        self.conn = sqlite3.connect(history_file, check_same_thread=False)
+        self.conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            CREATE TABLE IF NOT EXISTS jobs (company TEXT, title TEXT, url TEXT, date TEXT);
+            CREATE INDEX IF NOT EXISTS idx_jobs_company ON jobs(company);
+            CREATE INDEX IF NOT EXISTS idx_jobs_url ON jobs(url);
+        """)
+        self._import_legacy_json()
+        self._uncommitted = 0
+        # Parallel column lists so rapidfuzz can scan them in C. Strings are normalized
+        # once here (older rows were only lower().strip()'d); is_duplicate never re-processes them.
+        rows = self.conn.execute("SELECT company, title, url FROM jobs ORDER BY rowid").fetchall()
+        self._companies = [default_process(r[0]) for r in rows]
+        self._titles = [default_process(r[1]) for r in rows]
+        # Headroom for this run's saves; most has_url calls are misses and never query SQLite
+        self._urls = UrlBloom(2 * len(rows))
+        for r in rows:
+            if r[2]: self._urls.add(r[2])
+        # Blocking index: company prefix -> history indices, so we only fuzz-match
+        # against companies that could plausibly be the same one
+        self._blocks = defaultdict(list)
+        for i, company in enumerate(self._companies):
+            self._blocks[company[:BLOCK_PREFIX_LEN]].append(i)
+
+    def _import_legacy_json(self):
+        """One-time migration of the old job_history.json into the SQLite table."""
+        if not os.path.exists(LEGACY_HISTORY_FILE): return
+        if self.conn.execute("SELECT 1 FROM jobs LIMIT 1").fetchone(): return
+        try:
+            with open(LEGACY_HISTORY_FILE, "rb") as f:
+                history = orjson.loads(f.read())
+            self.conn.executemany(
+                "INSERT INTO jobs (company, title, url, date) VALUES (?, ?, ?, ?)",
+                [(default_process(h["company"]), default_process(h["title"]), h.get("url", ""), h.get("date", ""))
+                 for h in history]
+            )
+            self.conn.commit()
+            print(f"[Dedupe] Imported {len(history)} entries from {LEGACY_HISTORY_FILE}")
+        except Exception as e:
+            debug(f"[Dedupe] Legacy history import failed: {e}")
 
     def save(self, company, title, url):
-        self.history.append({
-            "company": company.lower().strip(),
-            "title": title.lower().strip(),
-            "url": url,
-            "date": datetime.now().isoformat()
-        })
-        with open(self.history_file, "w") as f: json.dump(self.history, f, indent=2)
+        company = default_process(company)
+        title = default_process(title)
+        self.conn.execute(
+            "INSERT INTO jobs (company, title, url, date) VALUES (?, ?, ?, ?)",
+            (company, title, url, datetime.now().isoformat())
+        )
+        # Grouped commits: one WAL sync per HISTORY_COMMIT_EVERY rows. Lookups on this
+        # connection (has_url) and the in-memory lists see the row immediately.
+        self._uncommitted += 1
+        if self._uncommitted >= HISTORY_COMMIT_EVERY:
+            self.flush()
+        if url: self._urls.add(url)
+        self._companies.append(company)
+        self._titles.append(title)
+        self._blocks[company[:BLOCK_PREFIX_LEN]].append(len(self._companies) - 1)
+
+    def flush(self):
+        if self._uncommitted:
+            self.conn.commit()
+            self._uncommitted = 0
+
+    def has_url(self, url):
+        # Exact-URL hit: no fuzzy matching needed. The Bloom filter answers most misses;
+        # possible hits are confirmed on the indexed jobs.url column
+        if url not in self._urls: return False
+        return self.conn.execute("SELECT 1 FROM jobs WHERE url = ? LIMIT 1", (url,)).fetchone() is not None
 
     def is_duplicate(self, new_company, new_title):
-        nc = new_company.lower().strip()
-        nt = new_title.lower().strip()
+        nc = default_process(new_company)
+        nt = default_process(new_title)
         if nc in ["unknown", ""] or nt in ["unknown", ""]: return False
 
-        for old in self.history:
-            oc = old["company"]
-            ot = old["title"]
-            if difflib.SequenceMatcher(None, nc, oc).ratio() > 0.85:
-                if difflib.SequenceMatcher(None, nt, ot).ratio() > 0.80:
-                    print(f"   [Dedupe] Blocks: '{new_title}' @ '{new_company}'")
-                    return True
+        # Cheap length prefilter before any fuzzy scoring
+        c_lo, c_hi = _length_window(len(nc), 85)
+        t_lo, t_hi = _length_window(len(nt), 80)
+        candidates = [
+            i for i in self._blocks.get(nc[:BLOCK_PREFIX_LEN], ())
+            if c_lo <= len(self._companies[i]) <= c_hi and t_lo <= len(self._titles[i]) <= t_hi
+        ]
+        if not candidates: return False
+
+        # All company hits, not just the best one: a company has many past titles
+        company_hits = process.extract(
+            nc, [self._companies[i] for i in candidates],
+            scorer=fuzz.ratio, score_cutoff=85, limit=None
+        )
+        for _, company_score, pos in company_hits:
+            idx = candidates[pos]
+            if company_score > 85 and fuzz.ratio(nt, self._titles[idx], score_cutoff=80) > 80:
+                print(f"   [Dedupe] Blocks: '{new_title}' @ '{new_company}'")
+                return True
         return False
 
 # ==========================================
 # 5. ROBUST EXTRACTION
 # ==========================================
 
-def fetch_ats_content_robust(url):
-    domain = urlparse(url).netloc
-    
-    with DOMAIN_LOCK:
-        if domain in BLOCKED_DOMAINS: return None, None, 'SKIPPED_DOMAIN_BLOCKED'
+@functools.lru_cache(maxsize=8192)
+def _netloc(url):
+    return urlparse(url).netloc
+
+async def fetch_ats_content_robust(session, url):
+    domain = _netloc(url)
+    if domain in BLOCKED_DOMAINS: return None, None, 'SKIPPED_DOMAIN_BLOCKED'
 
-    headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
     try:
-        resp = requests.get(url, headers=headers, timeout=15)
-        
-        if resp.status_code in [403, 429]:
-            should_log = False
-            with DOMAIN_LOCK:
+        async with session.get(url) as resp:
+            if resp.status in [403, 429]:
                 if domain not in BLOCKED_DOMAINS:
                     BLOCKED_DOMAINS.add(domain)
-                    should_log = True
-            if should_log: print(f" [!!!] DOMAIN BLOCKED ({resp.status_code}): {domain}. Circuit broken.")
-            return None, None, 'BLOCK'
-            
-        if resp.status_code != 200:
-            debug(f"[Fetch] Non-200 ({resp.status_code}) for {url}")
-            return None, None, 'ERROR'
-        
-        soup = BeautifulSoup(resp.text, 'html.parser')
-        text = ""
-        date_posted = extract_date_posted(soup)
-
-        if "boards.greenhouse.io" in url:
-            main = soup.find(id="content") or soup.find(id="main")
-            if main: text = main.get_text(separator="\n")
-        elif "jobs.lever.co" in url:
-            main = soup.find("div", class_="content-wrapper")
-            if main: text = main.get_text(separator="\n")
-        elif "ashbyhq.com" in url:
-            try:
-                script = soup.find("script", id="__NEXT_DATA__")
-                if script:
-                    data = json.loads(script.string)
-                    props = data.get('props', {}).get('pageProps', {}).get('jobPosting', {})
-                    text = props.get('description', '') or props.get('descriptionHtml', '')
-                    if "<" in text: text = BeautifulSoup(text, "html.parser").get_text(separator="\n")
-            except: pass
-            if not text: text = soup.get_text(separator="\n")
-        elif "workable.com" in url:
-            main = soup.find("main")
-            if main: text = main.get_text(separator="\n")
-
-        if not text or len(text) < 200:
-            text = trafilatura.extract(resp.text, include_comments=False)
-            
-        if not text or is_garbage_content(text): return None, None, 'GARBAGE'
+                    print(f" [!!!] DOMAIN BLOCKED ({resp.status}): {domain}. Circuit broken.")
+                return None, None, 'BLOCK'
+
+            if resp.status != 200:
+                debug(f"[Fetch] Non-200 ({resp.status}) for {url}")
+                return None, None, 'ERROR'
+
+            body = await resp.read()
+
+        # Parsing is CPU-bound; keep it off the event loop so other fetches progress
+        return await asyncio.to_thread(extract_ats_content, url, body)
 
-        return text, date_posted, 'SUCCESS'
-            
     except Exception as e:
         debug(f"[Fetch] Exception for {url}: {e}")
         return None, None, 'ERROR'
 
+# Selectors are compiled once at import and reused for every page
+_GH_CONTENT = lxml.etree.XPath('//*[@id="content"]')
+_GH_MAIN = lxml.etree.XPath('//*[@id="main"]')
+_LEVER_CONTENT = lxml.etree.XPath('//div[contains(concat(" ", normalize-space(@class), " "), " content-wrapper ")]')
+_NEXT_DATA = lxml.etree.XPath('//script[@id="__NEXT_DATA__"]/text()', smart_strings=False)
+_MAIN = lxml.etree.XPath('//main')
+_TAG_RE = re.compile(r"<[^>]+>")
+
+def _first_text(tree, selectors, min_len=50):
+    # Selectors in priority order; an empty/stub container falls through to the next one
+    for sel in selectors:
+        for el in sel(tree):
+            text = node_text(el)
+            if len(text.strip()) > min_len: return text
+    return ""
+
+def _extract_greenhouse(tree):
+    return _first_text(tree, (_GH_CONTENT, _GH_MAIN))
+
+def _extract_lever(tree):
+    return _first_text(tree, (_LEVER_CONTENT,))
+
+def _extract_ashby(tree):
+    text = ""
+    try:
+        script = _NEXT_DATA(tree)
+        if script:
+            posting = orjson.loads(script[0])['props']['pageProps']['jobPosting']
+            text = posting.get('description') or posting.get('descriptionHtml') or ''
+            if "<" in text:
+                # Plain description fragments: a tag regex is enough, no second parse
+                if "<script" in text or "<style" in text: text = node_text(lxml.html.fromstring(text))
+                else: text = html.unescape(_TAG_RE.sub(" ", text))
+    except: pass
+    return text or node_text(tree)
+
+def _extract_workable(tree):
+    return _first_text(tree, (_MAIN,))
+
+# Keyed by host, or by host minus its first label (jobs.ashbyhq.com -> ashbyhq.com)
+_EXTRACTORS = {
+    "boards.greenhouse.io": _extract_greenhouse,
+    "job-boards.greenhouse.io": _extract_greenhouse,
+    "jobs.lever.co": _extract_lever,
+    "ashbyhq.com": _extract_ashby,
+    "workable.com": _extract_workable,
+}
+
+def _extractor_for(url):
+    host = _netloc(url)
+    return _EXTRACTORS.get(host) or _EXTRACTORS.get(host.partition(".")[2])
+
+def extract_ats_content(url, body):
+    if not body: return None, None, 'GARBAGE'
+
+    # lxml (libxml2) instead of the pure-Python html.parser
+    tree = lxml.html.fromstring(body)
+    date_posted = extract_date_posted(tree)
+
+    extractor = _extractor_for(url)
+    text = extractor(tree) if extractor else ""
+
+    # Generic extraction only when no ATS branch produced usable text. Hand over the
+    # tree we already parsed and skip trafilatura's fallback extractors.
+    if len(text) < 200:
+        text = trafilatura.extract(
+            tree, include_comments=False, no_fallback=True, favor_precision=True
+        )
+
+    if not text or is_garbage_content(text): return None, None, 'GARBAGE'
+
+    return text, date_posted, 'SUCCESS'
+
 # ==========================================
 # 6. ENGINE LOGIC
 # ==========================================
@@ -324,11 +602,15 @@ class HobJunterEngine:
     def __init__(self):
         self.cfg = load_config()
         self.client = None
+        self.aclient = None
         self.google_service = None
         self.cv_profile = None
+        self._score_parts = None
+        self._score_batch_parts = None
         self.deduper = Deduplicator()
         self.telegram = None
         self.sheets = None
+        self._sink_pools = None
         self.debug = bool(self.cfg.get("debug", True))
 
     def setup(self):
@@ -355,6 +637,7 @@ class HobJunterEngine:
         DEBUG = self.debug
         
         self.client = OpenAI(api_key=self.cfg["openai_key"])
+        self.aclient = AsyncOpenAI(api_key=self.cfg["openai_key"])
         self.google_service = build("customsearch", "v1", developerKey=self.cfg["google_api_key"])
         
         # Init Notifications (Non-blocking)
@@ -371,7 +654,8 @@ class HobJunterEngine:
     def enforce_profile(self):
         if os.path.exists(PROFILE_FILE):
             print(f"[Profile] Loading MASTER profile from {PROFILE_FILE}")
-            with open(PROFILE_FILE, "r") as f: self.cv_profile = json.dumps(json.load(f))
+            with open(PROFILE_FILE, "rb") as f: self.cv_profile = orjson.dumps(orjson.loads(f.read())).decode()
+            self._compile_prompts()
             return
 
         print("[Profile] Generating Master Profile...")
@@ -385,10 +669,16 @@ class HobJunterEngine:
             messages=[{"role": "system", "content": PROFILE_GEN_PROMPT}, {"role": "user", "content": cv_text[:15000]}],
             response_format={"type": "json_object"}
         )
-        with open(PROFILE_FILE, "w") as f: json.dump(json.loads(resp.choices[0].message.content), f, indent=2)
+        profile = json.loads(resp.choices[0].message.content)
+        with open(PROFILE_FILE, "wb") as f: f.write(orjson.dumps(profile, option=orjson.OPT_INDENT_2))
         print(f"\n STOP! Verify {PROFILE_FILE} manually. Restart required.")
         sys.exit(0)
 
+    def _compile_prompts(self):
+        # The CV profile is invariant for the run: substitute it exactly once
+        self._score_parts = compile_prompt(SCORE_PROMPT, cv_profile=self.cv_profile)
+        self._score_batch_parts = compile_prompt(SCORE_BATCH_PROMPT, cv_profile=self.cv_profile)
+
     def sniper_hunt(self):
         roles = self.cfg.get("target_roles", ["Director of Engineering", "Principal SRE", "Head of Infrastructure"])
         loc = self.cfg.get("location_query", '("Bulgaria" OR "Remote Europe")')
@@ -396,11 +686,14 @@ class HobJunterEngine:
         
         print(f"\n[Sniper] Hunting: {roles}")
         raw_leads = []
+        seen = set()
+        known = 0
+        progress = Progress("Queries", len(ATS_TARGETS) * len(roles))
         
         for domain in ATS_TARGETS:
             for role in roles:
                 query = f"{domain} \"{role}\" {loc} {neg}"
-                print(f"   > Scanning {domain}...", end="\r")
+                progress.update()
                 try:
                     for start in [1, 11]: 
                         res = self.google_service.cse().list(
@@ -417,108 +710,229 @@ class HobJunterEngine:
                         # =======================
 
                         for item in res.get('items', []):
+                            url = clean_url(item['link'])
+                            # Drop repeats across queries and jobs already in history before any fetch
+                            if url in seen: continue
+                            seen.add(url)
+                            if self.deduper.has_url(url):
+                                known += 1; continue
                             raw_leads.append({
-                                "url": clean_url(item['link']),
+                                "url": url,
                                 "snippet": item.get('snippet', ''),
                                 "title": item.get('title', '')
                             })
                         time.sleep(0.5)
                 except Exception as e:
-                    if "Quota" in str(e): print("\n[!] Google Quota Exceeded."); return raw_leads
+                    if "Quota" in str(e): progress.close(); print("[!] Google Quota Exceeded."); return raw_leads
                     print(f"\n[!] Google API Error: {e}")
                     debug(f"[Google] Query '{query}' failed: {e}")
 
-        unique = {l['url']: l for l in raw_leads}.values()
-        print(f"\n[Sniper] Acquired {len(unique)} unique targets.")
-        return list(unique)
+        progress.close()
+        print(f"[Sniper] Acquired {len(raw_leads)} unique targets ({known} already in history).")
+        return raw_leads
 
     def process_leads(self, leads):
+        return asyncio.run(self._process_leads_async(leads))
+
+    async def _process_leads_async(self, leads):
+        """
+        Three-stage pipeline so OpenAI latency hides behind fetch latency:
+        fetch tasks -> fetched_q -> SCORE_WORKERS scorers -> scored_q -> one writer.
+        The writer owns dedup/history; Telegram and Sheets calls are handed to
+        sink threads so their HTTP round trips never stall the event loop.
+        """
+        fetched_q = asyncio.Queue()
+        scored_q = asyncio.Queue()
         results = []
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            future_to_lead = {executor.submit(fetch_ats_content_robust, l['url']): l for l in leads}
-            
-            for future in as_completed(future_to_lead):
-                lead = future_to_lead[future]
-                full_text, date_posted, status = future.result()
-                
-                if status == 'SKIPPED_DOMAIN_BLOCKED':
-                    print(f"   > Skipped (Circuit Breaker): {lead['title'][:20]}")
-                    continue
-
-                if date_posted:
-                    try:
-                        dt = datetime.fromisoformat(date_posted.replace('Z', '+00:00').split('T')[0])
-                        if dt < datetime.now() - timedelta(days=30):
-                            print(f"   > Skipping (Stale {date_posted}): {lead['title'][:30]}")
-                            continue
-                    except: pass 
-
-                if status == 'SUCCESS':
-                    data_type = "FULL_CONTENT"
-                    content = full_text[:12000]
-                    warning = ""
-                else:
-                    data_type = "SNIPPET_ONLY"
-                    content = f"TITLE: {lead['title']}\nSNIPPET: {lead['snippet']}"
-                    warning = "WARNING: CONTENT MISSING. MAX SCORE 65."
-
-                print(f"   > Scoring ({data_type}): {lead['title'][:30]}...", end="", flush=True)
-                
+        progress = Progress("Leads", len(leads))
+        # One single-worker pool per sink: a slow Sheets append no longer holds up
+        # Telegram alerts (or vice versa), and each sink still runs its calls in order
+        self._sink_pools = {
+            "telegram": ThreadPoolExecutor(max_workers=1, thread_name_prefix="telegram"),
+            "sheets": ThreadPoolExecutor(max_workers=1, thread_name_prefix="sheets"),
+        }
+
+        async def fetch(session, lead):
+            full_text, date_posted, status = await fetch_ats_content_robust(session, lead['url'])
+            job = self._triage_lead(lead, full_text, date_posted, status)
+            if job: await fetched_q.put(job)
+            else: progress.update()
+
+        async def scorer():
+            done = False
+            while not done:
+                job = await fetched_q.get()
+                if job is None: break
+                # Take whatever else is already waiting, up to a full batch
+                batch = [job]
+                while len(batch) < SCORE_BATCH_SIZE and not fetched_q.empty():
+                    nxt = fetched_q.get_nowait()
+                    if nxt is None:
+                        done = True
+                        break
+                    batch.append(nxt)
                 try:
-                    prompt = SCORE_PROMPT.replace("{data_type}", data_type) \
-                                         .replace("{warning_text}", warning) \
-                                         .replace("{cv_profile}", self.cv_profile) \
-                                         .replace("{job_text}", content)
-                    
-                    resp = self.client.chat.completions.create(
-                        model="gpt-4o-mini",
-                        messages=[{"role": "system", "content": "JSON only"}, {"role": "user", "content": prompt}],
-                        response_format={"type": "json_object"}
-                    )
-                    
-                    data = json.loads(resp.choices[0].message.content)
-                    score = data.get('score', 0)
-                    
-                    if data_type == "SNIPPET_ONLY" and score > 65:
-                        score = 65 
-                        data['reason'] = "[SNIPPET CAP] " + data.get('reason', '')
-
-                    company = data.get('company', 'Unknown')
-                    title = data.get('title', lead['title'])
-                    
-                    if self.deduper.is_duplicate(company, title):
-                        print(f" [Duplicate]")
-                        continue
-                    
-                    print(f" [{score}]")
-                    
-                    if score >= 60 or data.get('manual_review_needed'):
-                        # 1. SAVE TO HISTORY
-                        if status == 'SUCCESS' or score > 75:
-                            self.deduper.save(company, title, lead['url'])
-                        
-                        # 2. PUSH TO TELEGRAM (Only High Value)
-                        if self.telegram and score >= 85:
-                            msg = f" <b>{score} - {title}</b>\n{company}\n<a href='{lead['url']}'>Apply Now</a>"
-                            self.telegram.send(msg)
-
-                        # 3. PUSH TO SHEETS (All accepted)
-                        if self.sheets:
-                            self.sheets.append_row({**data, "url": lead['url']})
-
-                        results.append({
-                            **data,
-                            "score": score,
-                            "url": lead['url'],
-                            "is_snippet": (data_type == "SNIPPET_ONLY"),
-                            "status": status
-                        })
+                    scored_batch = await self._score_batch(batch)
                 except Exception as e:
-                    print(f" Err: {e}")
-                    debug(f"[Scoring] Lead error for {lead.get('url')}: {e}")
+                    print(f"   > Scoring Err (batch of {len(batch)}): {e}")
+                    scored_batch = []
+                # Leads that failed to score never reach the writer; count them here
+                # so the counter still reaches its total
+                if len(scored_batch) < len(batch): progress.update(len(batch) - len(scored_batch))
+                for scored in scored_batch:
+                    await scored_q.put(scored)
+
+        async def writer():
+            while (item := await scored_q.get()) is not None:
+                result = self._record_result(*item)
+                if result: results.append(result)
+                progress.update()
+
+        scorers = [asyncio.create_task(scorer()) for _ in range(SCORE_WORKERS)]
+        writer_task = asyncio.create_task(writer())
+
+        connector = aiohttp.TCPConnector(limit=FETCH_CONCURRENCY, limit_per_host=FETCH_PER_HOST)
+        async with aiohttp.ClientSession(
+            connector=connector, headers=FETCH_HEADERS,
+            # No total: aiohttp starts that clock before waiting for a FETCH_PER_HOST slot,
+            # so leads queued behind a busy host would time out without ever being sent
+            timeout=aiohttp.ClientTimeout(total=None, sock_connect=FETCH_TIMEOUT, sock_read=FETCH_TIMEOUT)
+        ) as session:
+            await asyncio.gather(*(fetch(session, l) for l in leads))
+
+        for _ in scorers: await fetched_q.put(None)
+        await asyncio.gather(*scorers)
+        await scored_q.put(None)
+        await writer_task
+        self.deduper.flush()
+        progress.close()
+        if self.sheets: self._sink("sheets", self.sheets.flush)
+        await asyncio.gather(*(asyncio.to_thread(pool.shutdown) for pool in self._sink_pools.values()))
         return results
 
+    def _sink(self, name, fn, *args):
+        self._sink_pools[name].submit(self._run_sink, fn, *args)
+
+    @staticmethod
+    def _run_sink(fn, *args):
+        try: fn(*args)
+        except Exception as e: print(f" [!] Sink Error: {e}")
+
+    def _triage_lead(self, lead, full_text, date_posted, status):
+        if status == 'SKIPPED_DOMAIN_BLOCKED':
+            print(f"   > Skipped (Circuit Breaker): {lead['title'][:20]}")
+            return None
+
+        if date_posted:
+            try:
+                dt = datetime.fromisoformat(date_posted.replace('Z', '+00:00').split('T')[0])
+                if dt < datetime.now() - timedelta(days=30):
+                    print(f"   > Skipping (Stale {date_posted}): {lead['title'][:30]}")
+                    return None
+            except: pass 
+
+        if status == 'SUCCESS':
+            return lead, status, "FULL_CONTENT", full_text[:12000], ""
+        content = f"TITLE: {lead['title']}\nSNIPPET: {lead['snippet']}"
+        return lead, status, "SNIPPET_ONLY", content, "WARNING: CONTENT MISSING. MAX SCORE 65."
+
+    async def _score_lead(self, lead, status, data_type, content, warning):
+        try:
+            prompt = render_prompt(
+                self._score_parts, data_type=data_type, warning_text=warning, job_text=content
+            )
+            
+            resp = await self.aclient.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[{"role": "system", "content": "JSON only"}, {"role": "user", "content": prompt}],
+                response_format={"type": "json_object"}
+            )
+            data = json.loads(resp.choices[0].message.content)
+            return self._finalize_score(lead, status, data_type, data)
+        except Exception as e:
+            print(f"   > Scoring Err ({lead['title'][:30]}): {e}")
+            debug(f"[Scoring] Lead error for {lead.get('url')}: {e}")
+            return None
+
+    async def _score_batch(self, batch):
+        """Scores several leads in one completion; leads the model skipped are retried one by one."""
+        if len(batch) == 1:
+            scored = await self._score_lead(*batch[0])
+            return [scored] if scored else []
+
+        jobs_json = json.dumps({"jobs": [
+            {"id": str(i), "data_type": data_type, "content": content}
+            for i, (_, _, data_type, content, _) in enumerate(batch)
+        ]})
+        prompt = render_prompt(self._score_batch_parts, jobs_json=jobs_json)
+        by_id = {}
+        try:
+            resp = await self.aclient.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[{"role": "system", "content": "JSON only"}, {"role": "user", "content": prompt}],
+                response_format={"type": "json_object"}
+            )
+            for r in json.loads(resp.choices[0].message.content).get("results", []):
+                if isinstance(r, dict): by_id[str(r.pop("id", ""))] = r
+        except Exception as e:
+            debug(f"[Scoring] Batch of {len(batch)} failed, falling back to single calls: {e}")
+
+        out = []
+        for i, (lead, status, data_type, content, warning) in enumerate(batch):
+            data = by_id.get(str(i))
+            if data is None:
+                scored = await self._score_lead(lead, status, data_type, content, warning)
+            else:
+                scored = self._finalize_score(lead, status, data_type, data)
+            if scored: out.append(scored)
+        return out
+
+    def _finalize_score(self, lead, status, data_type, data):
+        score = data.get('score', 0)
+        if data_type == "SNIPPET_ONLY" and score > 65:
+            score = 65 
+            data['reason'] = "[SNIPPET CAP] " + data.get('reason', '')
+        return lead, status, data_type, data, score
+
+    def _record_result(self, lead, status, data_type, data, score):
+        try:
+            company = data.get('company', 'Unknown')
+            title = data.get('title', lead['title'])
+            
+            if self.deduper.is_duplicate(company, title):
+                debug(f"Scored ({data_type}): {lead['title'][:30]}... [Duplicate]")
+                return None
+            
+            debug(f"Scored ({data_type}): {lead['title'][:30]}... [{score}]")
+            
+            if score >= 60 or data.get('manual_review_needed'):
+                # 1. SAVE TO HISTORY
+                if status == 'SUCCESS' or score > 75:
+                    self.deduper.save(company, title, lead['url'])
+                
+                # 2. PUSH TO TELEGRAM (Only High Value)
+                if self.telegram and score >= 85:
+                    msg = f" <b>{score} - {title}</b>\n{company}\n<a href='{lead['url']}'>Apply Now</a>"
+                    self._sink("telegram", self.telegram.send, msg)
+
+                # 3. PUSH TO SHEETS (All accepted)
+                if self.sheets:
+                    self._sink("sheets", self.sheets.queue_row, {**data, "url": lead['url']})
+
+                return {
+                    **data,
+                    "score": score,
+                    "url": lead['url'],
+                    "is_snippet": (data_type == "SNIPPET_ONLY"),
+                    "status": status
+                }
+        except Exception as e:
+            print(f" Err: {e}")
+            debug(f"[Scoring] Lead error for {lead.get('url')}: {e}")
+        return None
+
     def generate_report(self, results):
+        if self.sheets: self.sheets.flush()
         if not results: return
         results.sort(key=lambda x: x['score'], reverse=True)
         rows = ""
@@ -78,6 +78,48 @@ CV TEXT:
 \"\"\"{cv_text}\"\"\"
 """
 
+# Section-wise profile extraction (abuild_cv_profile): one short call per detected CV
+# section, run in parallel, plus an overview call over the whole CV for the remaining keys.
+PROFILE_OVERVIEW_PROMPT = """Extract a structured, ATS-oriented candidate profile from the CV text.
+
+Return STRICT JSON with the following keys ONLY:
+{profile_keys}
+
+HARD RULES:
+- Do NOT embellish language.
+- Do NOT infer skills, seniority, scope, or intent.
+- Do NOT normalize leadership into IC roles.
+- If information is unclear or not explicitly stated, leave the field empty.
+- Prefer factual signals over descriptive language.
+
+OUTPUT RULES:
+- STRICT JSON ONLY.
+
+CV TEXT:
+\"\"\"{cv_text}\"\"\"
+"""
+
+PROFILE_SECTION_PROMPTS = {
+    "experience": "Extract every position from this CV EXPERIENCE section as \"experience\": a list of objects with company, title, start, end, and highlights[] (verbatim facts only).",
+    "skills": "Extract every skill, tool, and technology named in this CV SKILLS section as \"skills\": a flat list of strings.",
+    "education": "Extract every degree, course, and certification from this CV EDUCATION section as \"education\": a list of objects with institution, qualification, and year.",
+    "projects": "Extract every project from this CV PROJECTS section as \"projects\": a list of objects with name, role, and highlights[] (verbatim facts only).",
+}
+
+PROFILE_SECTION_TEMPLATE = """{instruction}
+
+HARD RULES:
+- Do NOT embellish or infer anything that is not explicitly stated.
+- If information is unclear, leave the field empty.
+
+Return STRICT JSON with the single key described above.
+
+SECTION TEXT:
+\"\"\"{section_text}\"\"\"
+"""
+
+# Keep per-job placeholders AFTER the instructions and {cv_profile_json} / {cv_full_text}:
+# the shared prefix is then byte-identical across jobs and hits the provider's prompt cache.
 SCORE_PROMPT_DEFAULT = """You are an enterprise-grade Talent Intelligence Engine designed for objective candidate assessment.
 The job of the candidate is to prove to you that they are a match with the job description provided. Yours is to evaluate that match fairly and strictly based on EVIDENTIARY SUPPORT from the candidate profile.
 
@@ -116,17 +158,49 @@ JOB DESCRIPTION:
 {job_description}
 """
 
-RED_TEAM_PROMPT = """ROLE: You are a skeptical, cynical Hiring Manager for a high-stakes role.
-TASK: Review this Full CV against the Job Description. You are looking for reasons to REJECT.
-Do NOT be polite. Find the weak spots.
+SCORE_BATCH_PROMPT_DEFAULT = """You are an enterprise-grade Talent Intelligence Engine designed for objective candidate assessment.
+You will receive ONE candidate profile and SEVERAL jobs. Evaluate each job INDEPENDENTLY and strictly based on EVIDENTIARY SUPPORT from the candidate profile.
 
-JOB: {job_title} @ {job_company}
+For every job, assess whether this candidate would realistically PASS or FAIL the screening stage.
 
-JOB DESCRIPTION:
-{job_description}
+EVALUATION PROTOCOL:
+- Compare PRIMARY FUNCTION of Job vs. Candidate.
+- Check for DIRECT EVIDENCE of Mandatory Hard Skills.
+- Check for SENIORITY & ARCHETYPE ALIGNMENT.
 
-FULL CANDIDATE CV:
-{cv_full_text}
+OUTPUT INSTRUCTIONS:
+- Return STRICT JSON ONLY.
+- Return exactly one result per job, using the job "id" exactly as given.
+- The "reason" must be professional, evidence-based, and concise.
+- The Score must be an INTEGER between 0 and 100. Adhere to this scale strictly:
+
+SCORING TIER GUIDE:
+-> 0-45 (FATAL MISMATCH): Wrong domain (e.g., Marketing vs Engineering), wrong role (Junior vs VP), or missing critical mandatory skills (e.g., Job needs Embedded C++, Candidate only knows JS).
+-> 46-64 (PARTIAL MATCH): Good archetype but missing specific tech/industry stack match (e.g., Manager role fits, but stack is Java vs Python AND hands-on is required) or industry gap. Likely a "No" unless the market is dry.
+-> 65-89 (STRONG MATCH): The candidate is "Interview Ready". Core competencies, seniority, and stack align well. Minor gaps are teachable. This is a "YES".
+-> 90-100 (UNICORN MATCH): Perfect alignment. Candidate has the right combination of exact job title, years of experience, specific industry knowledge, AND the niche tools required. A "Must Hire".
+
+JSON FORMAT:
+{
+  "results": [
+    {
+      "job_id": "<id of the job>",
+      "score": <number>,
+      "reason": "<concise explanation focused on functional mismatches or strong transferable signals>"
+    }
+  ]
+}
+
+Candidate Profile:
+{cv_profile_json}
+
+JOBS (JSON array of {"id", "title", "company", "desc"}):
+{jobs_json}
+"""
+
+RED_TEAM_PROMPT = """ROLE: You are a skeptical, cynical Hiring Manager for a high-stakes role.
+TASK: Review this Full CV against the Job Description. You are looking for reasons to REJECT.
+Do NOT be polite. Find the weak spots.
 
 OUTPUT:
 Return a STRICT JSON with:
@@ -138,4 +212,14 @@ Format:
   "interview_questions": ["Question 1", "Question 2", "Question 3"],
   "outreach_hook": "Your concise sniper message here."
 }
-"""
\ No newline at end of file
+
+FULL CANDIDATE CV:
+{cv_full_text}
+
+JOB: {job_title} @ {job_company}
+
+JOB DESCRIPTION:
+{job_description}
+
+Respond with the STRICT JSON described above.
+"""
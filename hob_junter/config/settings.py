@@ -1,17 +1,20 @@
-import json
 import os
 from dataclasses import dataclass
 from typing import Optional
 
+import orjson
+
 from hob_junter.config.prompts import (
     OCR_PROMPT_DEFAULT,
     PROFILE_PROMPT_DEFAULT,
+    SCORE_BATCH_PROMPT_DEFAULT,
     SCORE_PROMPT_DEFAULT,
 )
 
 LOCAL_LLM_URL = "http://127.0.0.1:1234/v1/chat/completions"
 HIRING_BASE = "https://hiring.cafe"
 JOBS_ENDPOINT = f"{HIRING_BASE}/api/search-jobs"
+SEARCH_TEMPLATE_FILE = ".search_template.json"  # Captured search-jobs request, lets later runs skip the browser
 OPENAI_MODEL = "gpt-4o"
 CONFIG_FILE = "inputs.json"
 STRATEGIES_FILE = "strategies.json"  # <--- NEW: Strategy persistence
@@ -19,6 +22,21 @@ DEFAULT_CV_PROFILE_PATH = "cv_profile.json"
 DEFAULT_CV_TEXT_PATH = "cv_full_text.txt"
 DEFAULT_DB_PATH = "jobs.db"
 DEFAULT_CREDS_PATH = "service_account.json"
+SCORE_CONCURRENCY = 8  # Default scoring requests in flight at once (inputs.json "score_concurrency")
+RED_TEAM_CONCURRENCY = 2  # Red-team calls running alongside the scoring loop
+PROGRESS_HZ = 10  # Max redraws/s of the scoring progress line (cache/pre-filter hits arrive in bursts)
+BATCH_REQUESTS_FILE = "batch_requests.jsonl"  # Input file for scoring_mode "openai_batch"
+BATCH_POLL_SECONDS = 60
+CHECKPOINT_FILE = ".hob_junter_checkpoint.jsonl"  # Scores not yet committed to the DB, replayed after a crash
+CV_MAX_TOKENS = 6000  # Token budgets for prompt inputs (tokenizer of OPENAI_MODEL)
+JOB_DESC_MAX_TOKENS = 4000
+BATCH_DESC_MAX_TOKENS = 1000
+LLM_RPS = 5.0  # Proactive request-rate cap per LLM backend (OpenAI / local); 0 disables
+LLM_BURST = 10
+LLM_TPM = 200_000  # Proactive OpenAI tokens-per-minute cap (prompt + max completion, estimated); 0 disables
+NEAR_DUP_MIN_SIMILARITY = 0.9  # Estimated Jaccard of description shingles above which a job reuses a near-duplicate's score; 0 disables
+RED_TEAM_REUSE_MIN_SIMILARITY = 0.92  # Same, for reusing an earlier run's red team analysis of the same company; 0 disables
+PREFILTER_MIN_SIMILARITY = 0.05  # Default TF-IDF cosine(CV, job) below which a job is scored 0 without the LLM (inputs.json "prefilter_min_similarity"); 0 disables
 
 # THE GOLDEN LIST (Validated from Hiring.Cafe UI)
 TARGET_DEPARTMENTS = [
@@ -51,6 +69,10 @@ class RunSettings:
     ocr_prompt: str
     profile_prompt: str
     score_prompt: str
+    score_batch_prompt: str
+    score_batch_size: int
+    score_concurrency: int
+    prefilter_min_similarity: float
     scoring_mode: str
     red_team_mode: str
     debug: bool
@@ -78,8 +100,8 @@ def load_run_settings(config_file: str = CONFIG_FILE) -> RunSettings:
     config = {}
     if os.path.exists(config_file):
         try:
-            with open(config_file, "r") as f:
-                config = json.load(f)
+            with open(config_file, "rb") as f:
+                config = orjson.loads(f.read())
         except Exception as exc:
             print(f"[Config] Failed to read {config_file}: {exc}. Ignoring.")
             config = {}
@@ -93,8 +115,15 @@ def load_run_settings(config_file: str = CONFIG_FILE) -> RunSettings:
     ocr_prompt = config.get("ocr_prompt") or OCR_PROMPT_DEFAULT
     profile_prompt = config.get("profile_prompt") or PROFILE_PROMPT_DEFAULT
     score_prompt = config.get("score_prompt") or SCORE_PROMPT_DEFAULT
+    score_batch_prompt = config.get("score_batch_prompt") or SCORE_BATCH_PROMPT_DEFAULT
+    score_batch_size = int(config.get("score_batch_size") or 5)
+    score_concurrency = int(config.get("score_concurrency") or SCORE_CONCURRENCY)
+    # 0 is a valid setting (pre-filter off), so only a missing key falls back to the default
+    prefilter_min_similarity = config.get("prefilter_min_similarity")
+    prefilter_min_similarity = float(PREFILTER_MIN_SIMILARITY if prefilter_min_similarity is None else prefilter_min_similarity)
     scoring_mode = config.get("scoring_mode") or "local"
-    red_team_mode = config.get("red_team_mode") or scoring_mode
+    # Batch API is scoring-only; red team stays realtime on OpenAI
+    red_team_mode = config.get("red_team_mode") or ("openai" if scoring_mode == "openai_batch" else scoring_mode)
     db_path = config.get("db_path") or DEFAULT_DB_PATH
     google_creds_path = config.get("google_creds_path") or DEFAULT_CREDS_PATH
     strategies_path = config.get("strategies_path") or STRATEGIES_FILE
@@ -120,6 +149,10 @@ def load_run_settings(config_file: str = CONFIG_FILE) -> RunSettings:
         "ocr_prompt": ocr_prompt,
         "profile_prompt": profile_prompt,
         "score_prompt": score_prompt,
+        "score_batch_prompt": score_batch_prompt,
+        "score_batch_size": score_batch_size,
+        "score_concurrency": score_concurrency,
+        "prefilter_min_similarity": prefilter_min_similarity,
         "scoring_mode": scoring_mode,
         "red_team_mode": red_team_mode,
         "db_path": db_path,
@@ -128,8 +161,8 @@ def load_run_settings(config_file: str = CONFIG_FILE) -> RunSettings:
     }
 
     try:
-        with open(config_file, "w") as f:
-            json.dump(new_config, f, indent=2)
+        with open(config_file, "wb") as f:
+            f.write(orjson.dumps(new_config, option=orjson.OPT_INDENT_2))
     except Exception as exc:
         print(f"[Config] Warning: failed to write {config_file}: {exc}")
 
@@ -142,6 +175,10 @@ def load_run_settings(config_file: str = CONFIG_FILE) -> RunSettings:
         ocr_prompt=ocr_prompt,
         profile_prompt=profile_prompt,
         score_prompt=score_prompt,
+        score_batch_prompt=score_batch_prompt,
+        score_batch_size=score_batch_size,
+        score_concurrency=score_concurrency,
+        prefilter_min_similarity=prefilter_min_similarity,
         scoring_mode=scoring_mode,
         red_team_mode=red_team_mode,
         debug=bool(debug_cfg),
@@ -1,17 +1,33 @@
-import json
+import asyncio
 import re
-from typing import Any, Dict, List, Tuple
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import orjson
 
 from hob_junter.config.prompts import (
+    PROFILE_OVERVIEW_PROMPT,
     PROFILE_PROMPT_DEFAULT,
+    PROFILE_SECTION_PROMPTS,
+    PROFILE_SECTION_TEMPLATE,
     RED_TEAM_PROMPT,
+    SCORE_BATCH_PROMPT_DEFAULT,
     SCORE_PROMPT_DEFAULT,
     STRATEGY_PROMPT,
 )
-from hob_junter.config.settings import LOCAL_LLM_URL, OPENAI_MODEL
-from hob_junter.core import llm_engine
+from hob_junter.config.settings import (
+    BATCH_DESC_MAX_TOKENS,
+    BATCH_POLL_SECONDS,
+    BATCH_REQUESTS_FILE,
+    CV_MAX_TOKENS,
+    JOB_DESC_MAX_TOKENS,
+    LOCAL_LLM_URL,
+    OPENAI_MODEL,
+    SCORE_CONCURRENCY,
+)
+from hob_junter.core import llm_cache, llm_engine
 from hob_junter.core.scraper import JobRecord
-from hob_junter.utils.helpers import safe_json_loads, with_retries
+from hob_junter.utils.helpers import awith_retries, safe_json_loads, truncate_tokens, with_retries
 
 
 def extract_text_from_cv_pdf_with_gpt(client, pdf_path: str, ocr_prompt: str) -> str:
@@ -41,7 +57,7 @@ def extract_text_from_cv_pdf_with_gpt(client, pdf_path: str, ocr_prompt: str) ->
 
 
 def build_cv_profile(client, cv_text: str, profile_prompt: str = PROFILE_PROMPT_DEFAULT) -> str:
-    prompt = profile_prompt.replace("{cv_text}", cv_text[:20000])
+    prompt = profile_prompt.replace("{cv_text}", truncate_tokens(cv_text, CV_MAX_TOKENS, OPENAI_MODEL))
 
     content = with_retries(
         lambda: llm_engine.openai_chat_content(
@@ -56,12 +72,110 @@ def build_cv_profile(client, cv_text: str, profile_prompt: str = PROFILE_PROMPT_
         )
     )
 
-    parsed = json.loads(content)
-    return json.dumps(parsed)
+    return orjson.dumps(orjson.loads(content)).decode()
+
+
+_SECTION_HEADERS = {
+    "experience": (
+        "experience",
+        "work experience",
+        "professional experience",
+        "employment",
+        "employment history",
+        "work history",
+        "career history",
+    ),
+    "skills": ("skills", "technical skills", "key skills", "core competencies", "competencies"),
+    "education": ("education", "education and training", "certifications", "qualifications"),
+    "projects": ("projects", "key projects", "selected projects"),
+}
+_SECTION_BY_HEADER = {header: key for key, headers in _SECTION_HEADERS.items() for header in headers}
+# A header is a line holding nothing but one of the names above (optionally with a trailing colon)
+_SECTION_RE = re.compile(
+    r"^[ \t]*(" + "|".join(h.replace(" ", r"\s+") for h in _SECTION_BY_HEADER) + r")[ \t]*:?[ \t]*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+_OVERVIEW_KEYS = ["summary", "preferred_roles[]", "locations[]", "seniority"]
+
+
+def _split_sections(cv_text: str) -> Dict[str, str]:
+    """
+    Splits CV text on common section headers. Text before the first header lands
+    under "header"; repeated sections (e.g. two SKILLS blocks) are concatenated.
+    """
+    sections: Dict[str, str] = {}
+    key, start = "header", 0
+    for match in _SECTION_RE.finditer(cv_text):
+        sections[key] = sections.get(key, "") + cv_text[start : match.start()]
+        key = _SECTION_BY_HEADER[" ".join(match.group(1).lower().split())]
+        start = match.end()
+    sections[key] = sections.get(key, "") + cv_text[start:]
+    return {k: v.strip() for k, v in sections.items() if v.strip()}
+
+
+async def _aextract_json(aclient, system: str, prompt: str) -> Dict[str, Any]:
+    content = await awith_retries(
+        lambda: llm_engine.aopenai_chat_content(
+            client=aclient,
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": prompt},
+            ],
+            model=OPENAI_MODEL,
+            temperature=0.2,
+            response_format={"type": "json_object"},
+        )
+    )
+    return orjson.loads(content)
+
+
+async def abuild_cv_profile(
+    aclient, cv_text: str, profile_prompt: str = PROFILE_PROMPT_DEFAULT
+) -> Tuple[Dict[str, Any], str]:
+    """
+    Section-wise build_cv_profile: one call per detected CV section (experience,
+    skills, education, projects) plus an overview call for the remaining keys, all
+    in parallel, merged into one profile. CVs without at least two recognizable
+    sections, or a custom profile prompt, go through a single call as before.
+    Returns (profile dict, compact JSON string for prompts), like load_cv_profile.
+    """
+    sections = _split_sections(cv_text)
+    section_keys = [key for key in PROFILE_SECTION_PROMPTS if key in sections]
+    system = "Extract structured JSON candidate profiles."
+
+    if profile_prompt != PROFILE_PROMPT_DEFAULT or len(section_keys) < 2:
+        prompt = profile_prompt.replace("{cv_text}", truncate_tokens(cv_text, CV_MAX_TOKENS, OPENAI_MODEL))
+        profile = await _aextract_json(aclient, system, prompt)
+        return profile, orjson.dumps(profile).decode()
+
+    overview_keys = _OVERVIEW_KEYS + [f"{key}[]" for key in ("skills", "experience") if key not in section_keys]
+    overview_prompt = PROFILE_OVERVIEW_PROMPT.replace("{profile_keys}", "\n".join(f"- {k}" for k in overview_keys))
+    overview_prompt = overview_prompt.replace("{cv_text}", truncate_tokens(cv_text, CV_MAX_TOKENS, OPENAI_MODEL))
+
+    calls = [_aextract_json(aclient, system, overview_prompt)]
+    for key in section_keys:
+        prompt = PROFILE_SECTION_TEMPLATE.replace("{instruction}", PROFILE_SECTION_PROMPTS[key])
+        prompt = prompt.replace("{section_text}", truncate_tokens(sections[key], CV_MAX_TOKENS, OPENAI_MODEL))
+        calls.append(_aextract_json(aclient, system, prompt))
+
+    overview, *parts = await asyncio.gather(*calls)
+
+    profile: Dict[str, Any] = {
+        "summary": "",
+        "skills": [],
+        "experience": [],
+        "preferred_roles": [],
+        "locations": [],
+        "seniority": "",
+    }
+    profile.update(overview)
+    for key, part in zip(section_keys, parts):
+        profile[key] = part.get(key, [])
+    return profile, orjson.dumps(profile).decode()
 
 
 def consult_career_advisor_gpt(client, cv_text: str) -> Dict[str, Any]:
-    prompt = STRATEGY_PROMPT.replace("{cv_text}", cv_text[:20000])
+    prompt = STRATEGY_PROMPT.replace("{cv_text}", truncate_tokens(cv_text, CV_MAX_TOKENS, OPENAI_MODEL))
 
     content = with_retries(
         lambda: llm_engine.openai_chat_content(
@@ -76,67 +190,284 @@ def consult_career_advisor_gpt(client, cv_text: str) -> Dict[str, Any]:
         )
     )
     try:
-        return json.loads(content)
+        return orjson.loads(content)
     except Exception as exc:  # noqa: BLE001
         print(f"[Advisor] Error parsing strategy response: {exc}")
         return {}
 
 
-def score_job_match(
-    client,
-    cv_profile_json: str,
-    job: JobRecord,
-    score_prompt: str = SCORE_PROMPT_DEFAULT,
-    scoring_mode: str = "local",
-    local_llm_url: str = LOCAL_LLM_URL,
-) -> Tuple[int, str]:
-    clean_desc = re.sub("<[^<]+?>", " ", job.description)
+SCORE_SYSTEM_MESSAGE = "You are a talent intelligence engine. Output STRICT JSON."
 
+
+def _score_messages(cv_profile_json: str, job: JobRecord, score_prompt: str) -> List[Dict[str, str]]:
     template_vars = {
         "cv_profile_json": cv_profile_json,
         "job_title": job.title,
         "job_company": job.company,
         "apply_url": job.apply_url,
-        "job_raw": json.dumps(job.raw)[:2000],
-        "job_description": clean_desc[:15000],
+        # Decoded only for prompts that use it; "ignore" drops a character cut by the byte cap
+        "job_raw": job.raw_json.decode("utf-8", "ignore")[:2000] if "{job_raw}" in score_prompt else "",
+        "job_description": truncate_tokens(job.clean_description, JOB_DESC_MAX_TOKENS, OPENAI_MODEL),
     }
 
     prompt = score_prompt
     for key, val in template_vars.items():
         prompt = prompt.replace("{" + key + "}", str(val))
 
+    return [
+        {"role": "system", "content": SCORE_SYSTEM_MESSAGE},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def _parse_score(content: str) -> Tuple[int, str]:
+    result = safe_json_loads(llm_engine.strip_json_markdown(content))
+    return int(result.get("score", 0)), str(result.get("reason", "No reason provided"))
+
+
+async def ascore_job_match(
+    aclient,
+    cv_profile_json: str,
+    job: JobRecord,
+    score_prompt: str = SCORE_PROMPT_DEFAULT,
+    scoring_mode: str = "local",
+    local_llm_url: str = LOCAL_LLM_URL,
+) -> Tuple[int, str]:
+    """Scores one job against the CV profile; `aclient` is an AsyncOpenAI instance."""
+    messages = _score_messages(cv_profile_json, job, score_prompt)
+
     try:
-        content = ""
         if scoring_mode == "openai":
-            content = llm_engine.openai_chat_content(
-                client=client,
-                messages=[
-                    {"role": "system", "content": "You are a talent intelligence engine. Output STRICT JSON."},
-                    {"role": "user", "content": prompt},
-                ],
+            content = await llm_engine.aopenai_chat_content(
+                client=aclient,
+                messages=messages,
                 model=OPENAI_MODEL,
                 temperature=0.0,
                 max_tokens=512,
             )
         else:
-            content = llm_engine.local_chat_content(
+            content = await llm_engine.alocal_chat_content(
                 local_llm_url=local_llm_url,
-                messages=[
-                    {"role": "system", "content": "You are a talent intelligence engine. Output STRICT JSON."},
-                    {"role": "user", "content": prompt},
-                ],
+                messages=messages,
                 temperature=0.0,
                 max_tokens=512,
             )
 
-        content = llm_engine.strip_json_markdown(content)
-        result = safe_json_loads(content)
-        return int(result.get("score", 0)), str(result.get("reason", "No reason provided"))
+        return _parse_score(content)
 
     except Exception as exc:  # noqa: BLE001
         return 0, f"Error: {exc}"
 
 
+def _batch_messages(cv_profile_json: str, jobs: List[JobRecord], score_prompt: str) -> List[Dict[str, str]]:
+    # Positional ids keep jobs with an empty/duplicate job_id distinguishable
+    jobs_payload = [
+        {
+            "id": str(i),
+            "title": job.title,
+            "company": job.company,
+            "desc": truncate_tokens(job.clean_description, BATCH_DESC_MAX_TOKENS, OPENAI_MODEL),
+        }
+        for i, job in enumerate(jobs)
+    ]
+
+    prompt = score_prompt.replace("{cv_profile_json}", cv_profile_json)
+    prompt = prompt.replace("{jobs_json}", orjson.dumps(jobs_payload).decode())
+
+    return [
+        {"role": "system", "content": SCORE_SYSTEM_MESSAGE},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def _parse_batch(content: str, n_jobs: int) -> List[Optional[Tuple[int, str]]]:
+    results: List[Optional[Tuple[int, str]]] = [None] * n_jobs
+    parsed = safe_json_loads(llm_engine.strip_json_markdown(content))
+
+    entries = parsed.get("results", []) if isinstance(parsed, dict) else parsed
+    for entry in entries or []:
+        if not isinstance(entry, dict):
+            continue
+        try:
+            pos = int(entry.get("job_id", entry.get("id")))
+            score = int(entry.get("score", 0))
+        except (TypeError, ValueError):
+            continue
+        if 0 <= pos < n_jobs:
+            results[pos] = (score, str(entry.get("reason", "No reason provided")))
+
+    return results
+
+
+async def ascore_jobs_batch(
+    aclient,
+    cv_profile_json: str,
+    jobs: List[JobRecord],
+    score_prompt: str = SCORE_BATCH_PROMPT_DEFAULT,
+    scoring_mode: str = "local",
+    local_llm_url: str = LOCAL_LLM_URL,
+) -> List[Optional[Tuple[int, str]]]:
+    """
+    Scores several jobs in a single LLM call so the CV profile is only sent once;
+    `aclient` is an AsyncOpenAI instance. Returns one entry per input job; None where
+    the model skipped the job, so the caller can fall back to ascore_job_match for it.
+    """
+    messages = _batch_messages(cv_profile_json, jobs, score_prompt)
+
+    try:
+        if scoring_mode == "openai":
+            content = await llm_engine.aopenai_chat_content(
+                client=aclient,
+                messages=messages,
+                model=OPENAI_MODEL,
+                temperature=0.0,
+                max_tokens=256 * len(jobs),
+                response_format={"type": "json_object"},
+            )
+        else:
+            content = await llm_engine.alocal_chat_content(
+                local_llm_url=local_llm_url,
+                messages=messages,
+                temperature=0.0,
+                max_tokens=256 * len(jobs),
+            )
+        return _parse_batch(content, len(jobs))
+    except Exception as exc:  # noqa: BLE001
+        print(f"[Scoring] Batch request failed: {exc}")
+        return [None] * len(jobs)
+
+
+def batch_score_jobs(
+    client,
+    cv_profile_json: str,
+    jobs: List[JobRecord],
+    score_prompt: str = SCORE_PROMPT_DEFAULT,
+    requests_path: str = BATCH_REQUESTS_FILE,
+    poll_seconds: int = BATCH_POLL_SECONDS,
+) -> List[Optional[Tuple[int, str]]]:
+    """
+    Scores jobs through the OpenAI Batch API (half the token price of realtime calls).
+    Blocks until the batch reaches a terminal state. Returns one entry per job;
+    None for anything the batch did not answer, so the caller can re-score it realtime.
+    """
+    results: List[Optional[Tuple[int, str]]] = [None] * len(jobs)
+    cache_keys: Dict[int, str] = {}
+
+    # Positional custom_ids: job_id can be empty or repeated across strategies
+    with open(requests_path, "wb") as f:
+        for i, job in enumerate(jobs):
+            body = {
+                "model": OPENAI_MODEL,
+                "messages": _score_messages(cv_profile_json, job, score_prompt),
+                "temperature": 0.0,
+                "max_tokens": 512,
+            }
+            # Same key as the realtime call with identical params, so both paths share answers
+            key = llm_cache.make_key(backend="openai", **body)
+            cached = llm_cache.get(key)
+            if cached is not None:
+                results[i] = _parse_score(cached)
+                continue
+            cache_keys[i] = key
+            line = {"custom_id": f"job-{i}", "method": "POST", "url": "/v1/chat/completions", "body": body}
+            f.write(orjson.dumps(line) + b"\n")
+
+    if not cache_keys:
+        print(f"[Batch] All {len(jobs)} jobs answered from the LLM cache; nothing to submit.")
+        return results
+    if len(cache_keys) < len(jobs):
+        print(f"[Batch] {len(jobs) - len(cache_keys)} job(s) answered from the LLM cache.")
+
+    try:
+        with open(requests_path, "rb") as f:
+            upload = client.files.create(file=f, purpose="batch")
+        batch = client.batches.create(
+            input_file_id=upload.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        print(f"[Batch] Submitted {len(cache_keys)} jobs as batch {batch.id}. Polling every {poll_seconds}s...")
+
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(poll_seconds)
+            batch = client.batches.retrieve(batch.id)
+            counts = batch.request_counts
+            if counts:
+                print(f"[Batch] {batch.status}: {counts.completed}/{counts.total} done, {counts.failed} failed")
+
+        if batch.status != "completed":
+            print(f"[Batch] Batch ended with status '{batch.status}'.")
+        # Expired/cancelled batches can still carry partial output
+        if not batch.output_file_id:
+            return results
+
+        output = client.files.content(batch.output_file_id).text
+    except Exception as exc:  # noqa: BLE001
+        print(f"[Batch] Batch scoring failed: {exc}")
+        return results
+
+    for raw_line in output.splitlines():
+        entry = safe_json_loads(raw_line)
+        try:
+            pos = int(entry["custom_id"].split("-", 1)[1])
+            response = entry["response"]
+            if response.get("status_code") != 200:
+                continue
+            content = response["body"]["choices"][0]["message"]["content"]
+        except (KeyError, IndexError, TypeError, ValueError, AttributeError):
+            continue
+        if pos in cache_keys:
+            results[pos] = _parse_score(content)
+            llm_cache.put(cache_keys[pos], content)
+
+    return results
+
+
+async def ascore_jobs(
+    aclient,
+    cv_profile_json: str,
+    jobs: List[JobRecord],
+    batch_size: int = 5,
+    concurrency: int = SCORE_CONCURRENCY,
+    score_prompt: str = SCORE_PROMPT_DEFAULT,
+    score_batch_prompt: str = SCORE_BATCH_PROMPT_DEFAULT,
+    scoring_mode: str = "local",
+    local_llm_url: str = LOCAL_LLM_URL,
+) -> AsyncIterator[Tuple[int, int, str]]:
+    """
+    Scores all jobs with up to `concurrency` LLM requests in flight.
+    Jobs are packed `batch_size` per request; anything a batch skips is re-scored
+    individually. Yields (index into jobs, score, reason) as results arrive.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def score_one(job):
+        async with semaphore:
+            return await ascore_job_match(
+                aclient, cv_profile_json, job, score_prompt, scoring_mode, local_llm_url
+            )
+
+    async def score_chunk(start):
+        chunk = jobs[start : start + batch_size]
+        results = [None] * len(chunk)
+        if len(chunk) > 1:
+            async with semaphore:
+                results = await ascore_jobs_batch(
+                    aclient, cv_profile_json, chunk, score_batch_prompt, scoring_mode, local_llm_url
+                )
+        missing = [k for k, r in enumerate(results) if r is None]
+        retried = await asyncio.gather(*(score_one(chunk[k]) for k in missing))
+        for k, r in zip(missing, retried):
+            results[k] = r
+        return start, results
+
+    chunks = [score_chunk(start) for start in range(0, len(jobs), max(1, batch_size))]
+    for next_done in asyncio.as_completed(chunks):
+        start, results = await next_done
+        for k, (score, reason) in enumerate(results):
+            yield start + k, score, reason
+
+
 def red_team_analysis(
     cv_full_text: str,
     job: JobRecord,
@@ -145,12 +476,10 @@ def red_team_analysis(
     client=None,
     prompt_template: str = RED_TEAM_PROMPT,
 ) -> Dict[str, Any]:
-    clean_desc = re.sub("<[^<]+?>", " ", job.description)
-
-    prompt = prompt_template.replace("{job_title}", job.title)
+    prompt = prompt_template.replace("{cv_full_text}", truncate_tokens(cv_full_text, CV_MAX_TOKENS, OPENAI_MODEL))
+    prompt = prompt.replace("{job_title}", job.title)
     prompt = prompt.replace("{job_company}", job.company)
-    prompt = prompt.replace("{job_description}", clean_desc[:10000])
-    prompt = prompt.replace("{cv_full_text}", cv_full_text[:20000])
+    prompt = prompt.replace("{job_description}", truncate_tokens(job.clean_description, JOB_DESC_MAX_TOKENS, OPENAI_MODEL))
 
     messages = [
         {
@@ -1,23 +1,87 @@
 import sqlite3
 import datetime
+import threading
+import zlib
+
+RAW_DATA_MAX_BYTES = 32_000
+
+_SCHEMA = '''
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-65536;
+    PRAGMA mmap_size=268435456;
+    CREATE TABLE IF NOT EXISTS jobs (
+        job_id TEXT PRIMARY KEY,
+        company TEXT,
+        title TEXT,
+        score INTEGER,
+        status TEXT,
+        processed_at TIMESTAMP,
+        url TEXT,
+        raw_data BLOB
+    );
+    -- Expression index so the lower(company)/lower(title) lookup in is_job_processed is a SEARCH, not a SCAN
+    CREATE INDEX IF NOT EXISTS idx_jobs_comp_title_lc ON jobs(lower(company), lower(title));
+    -- Narrow view for anything that only needs the metadata, never the raw_data blob pages
+    CREATE VIEW IF NOT EXISTS jobs_view AS
+        SELECT job_id, company, title, score, status, processed_at, url FROM jobs;
+'''
+
+# One connection per DB file for the whole process; writers serialize on _DB_LOCK
+_CONNECTIONS = {}
+_DB_LOCK = threading.Lock()
 
 def get_db_connection(db_path):
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    # Гарантираме, че таблицата съществува
-    conn.execute('''
-        CREATE TABLE IF NOT EXISTS jobs (
-            job_id TEXT PRIMARY KEY,
-            company TEXT,
-            title TEXT,
-            score INTEGER,
-            status TEXT,
-            processed_at TIMESTAMP,
-            url TEXT,
-            raw_data TEXT
+    """
+    Returns the process-wide connection for db_path, opening it (schema + PRAGMAs)
+    only the first time or after it was closed.
+    """
+    with _DB_LOCK:
+        conn = _CONNECTIONS.get(db_path)
+        if conn is not None:
+            try:
+                conn.total_changes  # raises once the connection is closed
+                return conn
+            except sqlite3.ProgrammingError:
+                pass
+        conn = sqlite3.connect(db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.executescript(_SCHEMA)
+        _CONNECTIONS[db_path] = conn
+        return conn
+
+# Stays under SQLite's default bound-parameter limit (999 on older builds)
+_IN_CHUNK = 900
+
+def get_processed_keys(conn, ids, pairs):
+    """
+    Returns the subsets of ids and (company, title) pairs (lowercased/stripped like
+    is_job_processed) already in the DB, using chunked indexed queries over just this
+    feed's candidates instead of one query per job or a load of the whole history.
+    """
+    ids = [job_id for job_id in dict.fromkeys(ids) if job_id]
+    pairs = list(dict.fromkeys(pairs))
+    seen_ids = set()
+    seen_pairs = set()
+    for i in range(0, len(ids), _IN_CHUNK):
+        chunk = ids[i:i + _IN_CHUNK]
+        rows = conn.execute(
+            f"SELECT job_id FROM jobs WHERE job_id IN ({','.join('?' * len(chunk))})", chunk
         )
-    ''')
-    return conn
+        seen_ids.update(row[0] for row in rows)
+    # Joined against a VALUES list so each pair is a SEARCH on idx_jobs_comp_title_lc
+    step = _IN_CHUNK // 2
+    for i in range(0, len(pairs), step):
+        chunk = pairs[i:i + step]
+        rows = conn.execute(
+            "SELECT v.column1, v.column2 FROM (VALUES "
+            + ",".join(["(?, ?)"] * len(chunk))
+            + ") AS v JOIN jobs ON lower(jobs.company) = v.column1 AND lower(jobs.title) = v.column2",
+            [value for pair in chunk for value in pair],
+        )
+        seen_pairs.update((row[0], row[1]) for row in rows)
+    return seen_ids, seen_pairs
 
 def is_job_processed(conn, job):
     """
@@ -42,32 +106,55 @@ def is_job_processed(conn, job):
         
     return False
 
+def _pack_raw(raw_json):
+    """
+    job.raw_json (compact JSON bytes of the API payload) zlib-compressed, capped at
+    RAW_DATA_MAX_BYTES before compression. Read back with unpack_raw.
+    """
+    if not raw_json:
+        return None
+    return sqlite3.Binary(zlib.compress(raw_json[:RAW_DATA_MAX_BYTES], 6))
+
+def unpack_raw(blob):
+    """Inverse of _pack_raw; rows written before compression come back as their original text."""
+    if blob is None:
+        return None
+    if isinstance(blob, str):
+        return blob
+    return zlib.decompress(blob).decode("utf-8", "replace")
+
+def _job_row(job, score, now):
+    raw_blob = _pack_raw(job.raw_json)
+    return (job.job_id, job.company, job.title, score, "analyzed", now, job.apply_url, raw_blob)
+
+_UPSERT_JOB = """
+    INSERT OR REPLACE INTO jobs 
+    (job_id, company, title, score, status, processed_at, url, raw_data) 
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
 def mark_job_as_processed(conn, job, score):
     """
-    Saves the job result to the DB.
+    Saves one job result to the DB. Costs a commit per call: loops should collect
+    (job, score) pairs and hand them to mark_jobs_as_processed instead.
     """
     try:
-        now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        # Използваме job.raw (dict) или празен string ако го няма
-        raw_str = str(getattr(job, 'raw', '')) 
-        
-        conn.execute(
-            """
-            INSERT OR REPLACE INTO jobs 
-            (job_id, company, title, score, status, processed_at, url, raw_data) 
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                job.job_id, 
-                job.company, 
-                job.title, 
-                score, 
-                "analyzed", 
-                now, 
-                job.apply_url, 
-                raw_str
-            )
-        )
-        conn.commit()
+        mark_jobs_as_processed(conn, [(job, score)])
+    except Exception:
+        pass  # already reported by mark_jobs_as_processed
+
+def mark_jobs_as_processed(conn, results):
+    """
+    Saves many (job, score) results in one transaction: one commit/fsync per
+    harvest instead of per job. Failures roll back the batch and propagate.
+    """
+    if not results:
+        return
+    now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    rows = [_job_row(job, score, now) for job, score in results]
+    try:
+        with _DB_LOCK, conn:
+            conn.executemany(_UPSERT_JOB, rows)
     except Exception as e:
-        print(f"[DB Error] Failed to save job: {e}")
\ No newline at end of file
+        print(f"[DB Error] Failed to save {len(rows)} jobs: {e}")
+        raise
@@ -0,0 +1,85 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Tuple
+
+DEFAULT_CACHE_PATH = ".desc_cache.db"
+DEFAULT_TTL_SECONDS = 7 * 86400
+
+_conn = None
+_enabled = True
+_ttl = DEFAULT_TTL_SECONDS
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def configure(enabled: bool = True, path: str = DEFAULT_CACHE_PATH, ttl: int = DEFAULT_TTL_SECONDS):
+    """
+    On-disk cache of scraped apply-page descriptions keyed by URL, so reruns only
+    fetch pages for jobs they have not seen. Disabled entirely with enabled=False.
+    """
+    global _conn, _enabled, _ttl
+    _enabled = enabled
+    _ttl = ttl
+    if not enabled:
+        return
+    with _lock:
+        _conn = sqlite3.connect(path, check_same_thread=False)
+        _conn.execute(
+            "CREATE TABLE IF NOT EXISTS descriptions (key TEXT PRIMARY KEY, content TEXT, created REAL)"
+        )
+        _conn.execute("DELETE FROM descriptions WHERE created < ?", (time.time() - _ttl,))
+        _conn.commit()
+
+
+def make_key(url: str) -> str:
+    """blake2b rather than sha256: a lookup key, not a security boundary."""
+    return hashlib.blake2b(url.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def get_many(urls: Iterable[str]) -> Dict[str, str]:
+    """Returns {url: description} for every url with a fresh cached entry."""
+    if not _enabled:
+        return {}
+    if _conn is None:
+        configure()
+    keys = {make_key(url): url for url in urls}
+    if not keys:
+        return {}
+    found: Dict[str, str] = {}
+    key_list = list(keys)
+    with _lock:
+        # Chunked to stay under SQLite's bound-parameter limit
+        for i in range(0, len(key_list), 500):
+            chunk = key_list[i:i + 500]
+            rows = _conn.execute(
+                f"SELECT key, content FROM descriptions WHERE created >= ? AND key IN ({','.join('?' * len(chunk))})",
+                (time.time() - _ttl, *chunk),
+            ).fetchall()
+            found.update((keys[key], content) for key, content in rows)
+        _stats["hits"] += len(found)
+        _stats["misses"] += len(keys) - len(found)
+    return found
+
+
+def put_many(items: List[Tuple[str, str]]):
+    """Stores (url, description) pairs in one transaction."""
+    if not _enabled or not items:
+        return
+    if _conn is None:
+        configure()
+    now = time.time()
+    try:
+        with _lock:
+            _conn.executemany(
+                "INSERT OR REPLACE INTO descriptions (key, content, created) VALUES (?, ?, ?)",
+                [(make_key(url), content, now) for url, content in items],
+            )
+            _conn.commit()
+    except Exception as e:
+        print(f"[Desc Cache] Failed to store descriptions: {e}")
+
+
+def cache_stats():
+    return dict(_stats, enabled=_enabled)
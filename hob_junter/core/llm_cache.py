@@ -0,0 +1,73 @@
+import hashlib
+import sqlite3
+import threading
+import time
+
+import orjson
+
+DEFAULT_CACHE_PATH = ".llm_cache.db"
+DEFAULT_TTL_SECONDS = 7 * 86400
+
+_conn = None
+_enabled = True
+_ttl = DEFAULT_TTL_SECONDS
+_lock = threading.Lock()  # scoring and red team call in from worker threads
+_stats = {"hits": 0, "misses": 0}
+
+
+def configure(enabled: bool = True, path: str = DEFAULT_CACHE_PATH, ttl: int = DEFAULT_TTL_SECONDS):
+    """
+    Exact-match response cache for LLM calls, persisted in SQLite so reruns over
+    the same CV + jobs cost no tokens. Disabled entirely with enabled=False.
+    """
+    global _conn, _enabled, _ttl
+    _enabled = enabled
+    _ttl = ttl
+    if not enabled:
+        return
+    with _lock:
+        _conn = sqlite3.connect(path, check_same_thread=False)
+        _conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, content TEXT, created REAL)"
+        )
+        _conn.execute("DELETE FROM responses WHERE created < ?", (time.time() - _ttl,))
+        _conn.commit()
+
+
+def make_key(**parts) -> str:
+    """Stable hash of everything that shapes the response (model, messages, sampling, format)."""
+    return hashlib.sha256(orjson.dumps(parts, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+def get(key: str):
+    if not _enabled:
+        return None
+    if _conn is None:
+        configure()
+    with _lock:
+        row = _conn.execute(
+            "SELECT content FROM responses WHERE key = ? AND created >= ?",
+            (key, time.time() - _ttl),
+        ).fetchone()
+        _stats["hits" if row else "misses"] += 1
+    return row[0] if row else None
+
+
+def put(key: str, content: str):
+    if not _enabled or content is None:
+        return
+    if _conn is None:
+        configure()
+    try:
+        with _lock:
+            _conn.execute(
+                "INSERT OR REPLACE INTO responses (key, content, created) VALUES (?, ?, ?)",
+                (key, content, time.time()),
+            )
+            _conn.commit()
+    except Exception as e:
+        print(f"[LLM Cache] Failed to store response: {e}")
+
+
+def cache_stats():
+    return dict(_stats, enabled=_enabled)
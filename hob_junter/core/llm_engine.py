@@ -1,34 +1,170 @@
-import json
+import atexit
+import hashlib
+import itertools
 import os
-import time
+import re
+import threading
 from datetime import datetime
+import httpx
+import orjson
 import requests
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from hob_junter.config.settings import LLM_BURST, LLM_RPS, LLM_TPM
+from hob_junter.core import llm_cache
+from hob_junter.utils.helpers import TokenBucket
+
+# Shared keep-alive pool for local LLM calls (scoring + red team workers).
+# read=0: never re-send a generation that already timed out.
+HTTP = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=20,
+    pool_maxsize=20,
+    max_retries=Retry(
+        total=3,
+        read=0,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset(["POST"]),
+        raise_on_status=False,
+    ),
+)
+HTTP.mount("http://", _adapter)
+HTTP.mount("https://", _adapter)
+
+# Async counterpart for concurrent scoring. Created lazily so it binds to the
+# running event loop; closed via aclose_async_http() at the end of the run.
+ASYNC_HTTP_MAX_CONNECTIONS = 20
+_async_http = None
+
+# LOCAL_LLM_URL may be a list of equivalent servers; calls are spread round-robin
+_endpoint_counter = itertools.count()
+
+
+def _get_async_http() -> httpx.AsyncClient:
+    global _async_http
+    if _async_http is None or _async_http.is_closed:
+        limits = httpx.Limits(
+            max_connections=ASYNC_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=ASYNC_HTTP_MAX_CONNECTIONS,
+        )
+        _async_http = httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(retries=3, limits=limits)
+        )
+    return _async_http
+
+
+async def aclose_async_http():
+    global _async_http
+    if _async_http is not None:
+        await _async_http.aclose()
+        _async_http = None
+
+
+# Throttle before sending instead of discovering the limit through 429s and retries
+_OPENAI_BUCKET = TokenBucket(LLM_RPS, LLM_BURST)
+_OPENAI_TPM_BUCKET = TokenBucket(LLM_TPM / 60, LLM_TPM)  # Refills a minute's budget per minute
+_LOCAL_BUCKET = TokenBucket(LLM_RPS, LLM_BURST)
+
+
+def _estimate_tokens(messages, max_tokens=None) -> int:
+    """Rough request size for the TPM bucket: ~4 chars per token plus the completion cap; images are not counted."""
+    chars = 0
+    for m in messages:
+        content = m.get("content")
+        if isinstance(content, str):
+            chars += len(content)
+        elif isinstance(content, list):
+            chars += sum(len(part.get("text", "")) for part in content if isinstance(part, dict))
+    return chars // 4 + (max_tokens or 0)
+
+
+def _pick_endpoint(local_llm_url):
+    if isinstance(local_llm_url, (list, tuple)):
+        return local_llm_url[next(_endpoint_counter) % len(local_llm_url)]
+    return local_llm_url
+
+# Black Box recorder for LLM traffic, controlled by HOB_JUNTER_LOG_LLM:
+#   unset/0 - off
+#   1       - one compact JSON line per call (source, sha256 of the messages, response length)
+#   2       - full prompt + response, as before
+LLM_LOG_FILE = "llm_traffic.log"
+LLM_LOG_LEVEL = int(os.getenv("HOB_JUNTER_LOG_LLM", "0") or 0)
+_log_fh = None
+_log_lock = threading.Lock()
+
+
+def _log_handle():
+    # Opened once per process with a large buffer; flushed/closed at exit
+    global _log_fh
+    if _log_fh is None:
+        _log_fh = open(LLM_LOG_FILE, "a", encoding="utf-8", buffering=1 << 16)
+        atexit.register(_log_fh.close)
+    return _log_fh
+
 
 def _log_traffic(source, messages, response_content):
     """
     Writes input/output to a local log file for debugging.
     This is the Black Box recorder.
     """
+    if LLM_LOG_LEVEL <= 0:
+        return
     try:
-        log_entry = (
-            f"\n{'='*30} {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} [{source}] {'='*30}\n"
-            f"--- PROMPT / MESSAGES ---\n"
-            f"{json.dumps(messages, ensure_ascii=False, indent=2)}\n\n"
-            f"--- RAW RESPONSE ---\n"
-            f"{response_content}\n"
-            f"{'='*80}\n"
-        )
-        with open("llm_traffic.log", "a", encoding="utf-8") as f:
-            f.write(log_entry)
+        if LLM_LOG_LEVEL >= 2:
+            log_entry = (
+                f"\n{'='*30} {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} [{source}] {'='*30}\n"
+                f"--- PROMPT / MESSAGES ---\n"
+                f"{orjson.dumps(messages, option=orjson.OPT_INDENT_2).decode()}\n\n"
+                f"--- RAW RESPONSE ---\n"
+                f"{response_content}\n"
+                f"{'='*80}\n"
+            )
+        else:
+            log_entry = orjson.dumps({
+                "ts": datetime.now().isoformat(timespec="seconds"),
+                "source": source,
+                "msg_sha256": hashlib.sha256(orjson.dumps(messages)).hexdigest(),
+                "resp_len": len(response_content or ""),
+            }).decode() + "\n"
+        with _log_lock:
+            _log_handle().write(log_entry)
     except Exception as e:
-        print(f"[Log Error] Failed to write to llm_traffic.log: {e}")
+        print(f"[Log Error] Failed to write to {LLM_LOG_FILE}: {e}")
 
 
 def create_openai_client(api_key: str):
     return OpenAI(api_key=api_key)
 
 
+def create_async_openai_client(api_key: str):
+    return AsyncOpenAI(api_key=api_key)
+
+
+def _openai_params(messages, model, temperature, max_tokens, response_format):
+    params = {
+        "model": model,
+        "messages": messages,
+        "temperature": temperature,
+    }
+    if max_tokens:
+        params["max_tokens"] = max_tokens
+    if response_format:
+        params["response_format"] = response_format
+    return params
+
+
+def _openai_log_source(response):
+    # Surfaces prompt-prefix cache hits (instructions + CV shared across jobs)
+    try:
+        cached = response.usage.prompt_tokens_details.cached_tokens
+        return f"OPENAI cached_tokens={cached}/{response.usage.prompt_tokens}"
+    except AttributeError:
+        return "OPENAI"
+
+
 def openai_chat_content(
     client,
     messages,
@@ -40,22 +176,21 @@ def openai_chat_content(
     """
     Wrapper for OpenAI chat completion with AUTO-LOGGING.
     """
-    params = {
-        "model": model,
-        "messages": messages,
-        "temperature": temperature,
-    }
-    if max_tokens:
-        params["max_tokens"] = max_tokens
-    if response_format:
-        params["response_format"] = response_format
+    params = _openai_params(messages, model, temperature, max_tokens, response_format)
+    cache_key = llm_cache.make_key(backend="openai", **params)
+    cached = llm_cache.get(cache_key)
+    if cached is not None:
+        return cached
 
     try:
+        _OPENAI_BUCKET.acquire()
+        _OPENAI_TPM_BUCKET.acquire(_estimate_tokens(messages, max_tokens))
         response = client.chat.completions.create(**params)
         content = response.choices[0].message.content
         
         # LOG IT!
-        _log_traffic("OPENAI", messages, content)
+        _log_traffic(_openai_log_source(response), messages, content)
+        llm_cache.put(cache_key, content)
         
         return content
 
@@ -64,6 +199,46 @@ def openai_chat_content(
         raise e
 
 
+async def aopenai_chat_content(
+    client,
+    messages,
+    model="gpt-4o",
+    temperature=0.0,
+    max_tokens=None,
+    response_format=None,
+):
+    """
+    Async twin of openai_chat_content; `client` is an AsyncOpenAI instance.
+    """
+    params = _openai_params(messages, model, temperature, max_tokens, response_format)
+    cache_key = llm_cache.make_key(backend="openai", **params)
+    cached = llm_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    try:
+        await _OPENAI_BUCKET.acquire_async()
+        await _OPENAI_TPM_BUCKET.acquire_async(_estimate_tokens(messages, max_tokens))
+        response = await client.chat.completions.create(**params)
+        content = response.choices[0].message.content
+        _log_traffic(_openai_log_source(response), messages, content)
+        llm_cache.put(cache_key, content)
+        return content
+
+    except Exception as e:
+        _log_traffic("OPENAI_ERROR", messages, str(e))
+        raise e
+
+
+def _local_content(data):
+    # Handle different local server response formats (Ollama vs LM Studio)
+    if "choices" in data:
+        return data["choices"][0]["message"]["content"]
+    if "message" in data:
+        return data["message"]["content"]
+    return str(data)
+
+
 def local_chat_content(
     local_llm_url,
     messages,
@@ -80,27 +255,25 @@ def local_chat_content(
         "max_tokens": max_tokens,
         "stream": False
     }
+    cache_key = llm_cache.make_key(backend="local", **payload)
+    cached = llm_cache.get(cache_key)
+    if cached is not None:
+        return cached
     
     try:
-        resp = requests.post(
-            local_llm_url, 
+        _LOCAL_BUCKET.acquire()
+        resp = HTTP.post(
+            _pick_endpoint(local_llm_url), 
             json=payload, 
             headers={"Content-Type": "application/json"},
             timeout=timeout
         )
         resp.raise_for_status()
-        data = resp.json()
-        
-        # Handle different local server response formats (Ollama vs LM Studio)
-        if "choices" in data:
-            content = data["choices"][0]["message"]["content"]
-        elif "message" in data:
-            content = data["message"]["content"]
-        else:
-            content = str(data)
+        content = _local_content(resp.json())
 
         # LOG IT!
         _log_traffic("LOCAL_LLM", messages, content)
+        llm_cache.put(cache_key, content)
         
         return content
 
@@ -109,6 +282,46 @@ def local_chat_content(
         return f'{{"error": "{str(e)}", "score": 0, "reason": "Local LLM connection failed"}}'
 
 
+async def alocal_chat_content(
+    local_llm_url,
+    messages,
+    temperature=0.7,
+    max_tokens=1024,
+    timeout=120,
+):
+    """
+    Async twin of local_chat_content over the shared httpx.AsyncClient.
+    """
+    payload = {
+        "messages": messages,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "stream": False
+    }
+    cache_key = llm_cache.make_key(backend="local", **payload)
+    cached = llm_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    try:
+        await _LOCAL_BUCKET.acquire_async()
+        resp = await _get_async_http().post(
+            _pick_endpoint(local_llm_url),
+            json=payload,
+            headers={"Content-Type": "application/json"},
+            timeout=timeout,
+        )
+        resp.raise_for_status()
+        content = _local_content(resp.json())
+        _log_traffic("LOCAL_LLM", messages, content)
+        llm_cache.put(cache_key, content)
+        return content
+
+    except Exception as e:
+        _log_traffic("LOCAL_ERROR", messages, str(e))
+        return f'{{"error": "{str(e)}", "score": 0, "reason": "Local LLM connection failed"}}'
+
+
 def upload_file_for_assistants(client, file_path):
     """
     Uploads a file to OpenAI for RAG/Assistants usage.
@@ -117,17 +330,20 @@ def upload_file_for_assistants(client, file_path):
         return client.files.create(file=f, purpose="assistants")
 
 
+_FENCE_RE = re.compile(r"```(?:[a-zA-Z]*\n|json)?\s*(.*?)```", re.DOTALL)
+
+
 def strip_json_markdown(text):
     """
-    Removes ```json ... ``` wrappers commonly returned by LLMs.
+    Removes ```json ... ``` wrappers commonly returned by LLMs, including a fence
+    preceded by prose or left unterminated by a truncated reply.
     """
     text = text.strip()
+    if "```" not in text:
+        return text
+    match = _FENCE_RE.search(text)
+    if match:
+        return match.group(1).strip()
     if text.startswith("```"):
-        # Find the first newline
-        first_newline = text.find("\n")
-        if first_newline != -1:
-            # Check if the last line is ```
-            if text.endswith("```"):
-                return text[first_newline+1:-3].strip()
-            return text[first_newline+1:].strip()
-    return text
\ No newline at end of file
+        return text.partition("\n")[2].strip()
+    return text
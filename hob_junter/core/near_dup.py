@@ -0,0 +1,207 @@
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from array import array
+from operator import eq
+from typing import Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_CACHE_PATH = ".near_dup_cache.db"
+DEFAULT_TTL_SECONDS = 30 * 86400
+MIN_SHINGLES = 30  # Fewer shingles than this are too few to fingerprint reliably
+
+# One-permutation MinHash: each 3-word shingle lands in one of NUM_BUCKETS and
+# only the smallest hash per bucket is kept. LSH bands of BAND_ROWS buckets find
+# candidates; the bucket agreement ratio estimates their Jaccard similarity.
+NUM_BUCKETS = 64
+BAND_ROWS = 4
+_EMPTY = 0xFFFFFFFF
+
+# Unicode words, same as prefilter: an ASCII-only tokenizer reduces non-Latin postings
+# to their shared tech keywords and makes unrelated ones look identical
+_TOKEN_RE = re.compile(r"[^\W\d_][\w+#]+")
+# Bumped whenever signature() changes, so fingerprints from an older tokenizer are dropped
+SIGNATURE_VERSION = 2
+
+_conn = None
+_enabled = True
+_ttl = DEFAULT_TTL_SECONDS
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+# context -> (signatures, answers, band index); loaded from disk on first lookup
+_index: Dict[str, Tuple[List[Tuple[int, ...]], List[Tuple[int, str]], Dict[Tuple[int, int], List[int]]]] = {}
+
+
+def configure(enabled: bool = True, path: str = DEFAULT_CACHE_PATH, ttl: int = DEFAULT_TTL_SECONDS):
+    """
+    Score cache for near-duplicate job descriptions (reposts of the same template),
+    keyed by a MinHash fingerprint instead of exact text. Disabled with enabled=False.
+    """
+    global _conn, _enabled, _ttl
+    _enabled = enabled
+    _ttl = ttl
+    if not enabled:
+        return
+    with _lock:
+        _conn = sqlite3.connect(path, check_same_thread=False)
+        _conn.execute(
+            "CREATE TABLE IF NOT EXISTS scores "
+            "(context TEXT, signature BLOB, score INTEGER, reason TEXT, created REAL)"
+        )
+        _conn.execute("CREATE INDEX IF NOT EXISTS idx_scores_context ON scores(context)")
+        if _conn.execute("PRAGMA user_version").fetchone()[0] != SIGNATURE_VERSION:
+            _conn.execute("DELETE FROM scores")
+            _conn.execute(f"PRAGMA user_version = {SIGNATURE_VERSION}")
+        _conn.execute("DELETE FROM scores WHERE created < ?", (time.time() - _ttl,))
+        _conn.commit()
+        _index.clear()
+
+
+def signature(text: str) -> Optional[Tuple[int, ...]]:
+    """MinHash fingerprint of the text's word 3-shingles, or None if it has fewer than MIN_SHINGLES."""
+    words = _TOKEN_RE.findall(text.lower())
+    if len(words) - 2 < MIN_SHINGLES:
+        return None
+    sig = [_EMPTY] * NUM_BUCKETS
+    for i in range(len(words) - 2):
+        h = zlib.crc32(f"{words[i]} {words[i + 1]} {words[i + 2]}".encode())
+        bucket, value = h % NUM_BUCKETS, h // NUM_BUCKETS
+        if value < sig[bucket]:
+            sig[bucket] = value
+    return tuple(sig)
+
+
+def similarity(a: Sequence[int], b: Sequence[int]) -> float:
+    """Estimated Jaccard similarity: agreeing buckets over buckets filled in either signature."""
+    # Bucket comparison runs in C via map(eq); the per-bucket Python loop is only
+    # needed to discount buckets empty in both, which requires an empty one in each
+    agree = sum(map(eq, a, b))
+    if _EMPTY in a and _EMPTY in b:
+        both_empty = sum(1 for x, y in zip(a, b) if x == _EMPTY and y == _EMPTY)
+        filled = len(a) - both_empty
+        return (agree - both_empty) / filled if filled else 0.0
+    return agree / len(a)
+
+
+def _bands(sig: Tuple[int, ...]):
+    for band in range(0, NUM_BUCKETS, BAND_ROWS):
+        yield band, hash(sig[band:band + BAND_ROWS])
+
+
+def _load(context: str):
+    entry = _index.get(context)
+    if entry is None:
+        entry = ([], [], {})
+        _index[context] = entry
+        rows = _conn.execute(
+            "SELECT signature, score, reason FROM scores WHERE context = ? AND created >= ?",
+            (context, time.time() - _ttl),
+        ).fetchall()
+        for blob, score, reason in rows:
+            _add(entry, tuple(array("I", blob)), score, reason)
+    return entry
+
+
+def _add(entry, sig: Tuple[int, ...], score: int, reason: str):
+    sigs, answers, bands = entry
+    pos = len(sigs)
+    sigs.append(sig)
+    answers.append((score, reason))
+    for band in _bands(sig):
+        bands.setdefault(band, []).append(pos)
+
+
+def signatures(texts: Sequence[str]) -> List[Optional[Tuple[int, ...]]]:
+    """Fingerprints a whole feed in one call (run via asyncio.to_thread to keep it off the event loop)."""
+    return [signature(text) for text in texts]
+
+
+def lookup_many(
+    context: str, sigs: Dict[int, Optional[Tuple[int, ...]]], min_similarity: float
+) -> Dict[int, Tuple[int, str, float]]:
+    """
+    {key: (score, reason, similarity)} for every key whose closest cached near-duplicate
+    reaches min_similarity. The context's index is loaded and locked once for the whole batch.
+    """
+    if not _enabled or min_similarity <= 0:
+        return {}
+    if _conn is None:
+        configure()
+    found: Dict[int, Tuple[int, str, float]] = {}
+    with _lock:
+        cached_sigs, answers, bands = _load(context)
+        for key, sig in sigs.items():
+            if sig is None:
+                continue
+            candidates = {pos for band in _bands(sig) for pos in bands.get(band, ())}
+            best, best_sim = None, min_similarity
+            for pos in candidates:
+                sim = similarity(sig, cached_sigs[pos])
+                if sim >= best_sim:
+                    best, best_sim = pos, sim
+            if best is None:
+                _stats["misses"] += 1
+                continue
+            _stats["hits"] += 1
+            found[key] = (*answers[best], best_sim)
+    return found
+
+
+def lookup(context: str, sig: Optional[Tuple[int, ...]], min_similarity: float) -> Optional[Tuple[int, str, float]]:
+    """(score, reason, similarity) of the closest cached near-duplicate, if any reaches min_similarity."""
+    return lookup_many(context, {0: sig}, min_similarity).get(0)
+
+
+def put_many(context: str, items: List[Tuple[Optional[Tuple[int, ...]], int, str]]):
+    """Stores (signature, score, reason) triples in one transaction; items without a signature are skipped."""
+    items = [(sig, score, reason) for sig, score, reason in items if sig is not None]
+    if not _enabled or not items:
+        return
+    if _conn is None:
+        configure()
+    now = time.time()
+    try:
+        with _lock:
+            _conn.executemany(
+                "INSERT INTO scores (context, signature, score, reason, created) VALUES (?, ?, ?, ?, ?)",
+                [(context, sqlite3.Binary(array("I", sig).tobytes()), score, reason, now) for sig, score, reason in items],
+            )
+            _conn.commit()
+            if context in _index:
+                for sig, score, reason in items:
+                    _add(_index[context], sig, score, reason)
+    except Exception as e:
+        print(f"[Near-dup Cache] Failed to store scores: {e}")
+
+
+def put(context: str, sig: Optional[Tuple[int, ...]], score: int, reason: str):
+    put_many(context, [(sig, score, reason)])
+
+
+def group_near_duplicates(sigs: Dict[int, Optional[Tuple[int, ...]]], min_similarity: float) -> Dict[int, int]:
+    """
+    Within one run: maps each job that near-duplicates an earlier one (by key order)
+    to that earlier representative, so only representatives need scoring.
+    """
+    if min_similarity <= 0:
+        return {}
+    entry = ([], [], {})
+    keys: List[int] = []
+    follower_of: Dict[int, int] = {}
+    for key, sig in sigs.items():
+        if sig is None:
+            continue
+        sigs_seen, _, bands = entry
+        candidates = {pos for band in _bands(sig) for pos in bands.get(band, ())}
+        match = next((pos for pos in sorted(candidates) if similarity(sig, sigs_seen[pos]) >= min_similarity), None)
+        if match is not None:
+            follower_of[key] = keys[match]
+            continue
+        keys.append(key)
+        _add(entry, sig, 0, "")
+    return follower_of
+
+
+def cache_stats():
+    return dict(_stats, enabled=_enabled)
@@ -0,0 +1,74 @@
+import math
+import re
+from collections import Counter
+from typing import Dict, List
+
+from hob_junter.core.scraper import JobRecord
+
+PREFILTER_MIN_DESC_CHARS = 200  # Jobs with less text than this always go to the LLM
+PREFILTER_DESC_CHARS = 2000
+PREFILTER_MIN_TOKENS = 50  # Jobs with fewer tokens in the CV's script (Latin vs. other) always go to the LLM
+
+# Any Unicode letter first, so Cyrillic postings tokenize too (no digits/underscore as the lead character)
+_TOKEN_RE = re.compile(r"[^\W\d_][\w+#]+")
+
+
+def _term_counts(text: str) -> Counter:
+    return Counter(_TOKEN_RE.findall(text.lower()))
+
+
+def _tfidf(counts: Counter, idf: Dict[str, float]) -> Dict[str, float]:
+    vec = {term: (1.0 + math.log(tf)) * idf[term] for term, tf in counts.items()}
+    norm = math.sqrt(sum(w * w for w in vec.values())) or 1.0
+    return {term: w / norm for term, w in vec.items()}
+
+
+def relevance_scores(cv_text: str, docs: List[str]) -> List[float]:
+    """
+    TF-IDF cosine similarity of each doc against the CV, with IDF fitted on the CV
+    plus this batch of docs. Pure stdlib, so it costs milliseconds per harvest.
+    """
+    cv_counts = _term_counts(cv_text)
+    doc_counts = [_term_counts(doc) for doc in docs]
+
+    df: Counter = Counter(cv_counts.keys())
+    for counts in doc_counts:
+        df.update(counts.keys())
+    n = len(docs) + 1
+    idf = {term: math.log((n + 1) / (freq + 1)) + 1.0 for term, freq in df.items()}
+
+    cv_vec = _tfidf(cv_counts, idf)
+    scores = []
+    for counts in doc_counts:
+        vec = _tfidf(counts, idf)
+        scores.append(sum(w * cv_vec.get(term, 0.0) for term, w in vec.items()))
+    return scores
+
+
+def _comparable_tokens(text: str, ascii_script: bool) -> int:
+    """Tokens written in the given script (ASCII/Latin or not), i.e. ones that could overlap the CV."""
+    return sum(1 for token in _TOKEN_RE.findall(text.lower()) if token.isascii() == ascii_script)
+
+
+def prefilter_jobs(cv_profile_json: str, jobs: List[JobRecord], min_similarity: float) -> Dict[int, float]:
+    """
+    Returns {index: similarity} for jobs whose lexical overlap with the CV profile is
+    below min_similarity: obvious no-matches that can be scored 0 without an LLM call.
+    Jobs with too little description text to judge are never rejected, and neither
+    are jobs written mostly in another script than the CV (a Bulgarian posting vs. an
+    English CV shares almost no tokens whatever the fit).
+    """
+    if min_similarity <= 0 or not jobs:
+        return {}
+
+    cv_tokens = _TOKEN_RE.findall(cv_profile_json.lower())
+    cv_ascii = sum(map(str.isascii, cv_tokens)) * 2 >= len(cv_tokens)
+    docs = [f"{job.title} {job.clean_description[:PREFILTER_DESC_CHARS]}" for job in jobs]
+    sims = relevance_scores(cv_profile_json, docs)
+    return {
+        i: sim
+        for i, (job, doc, sim) in enumerate(zip(jobs, docs, sims))
+        if sim < min_similarity
+        and len(job.clean_description) >= PREFILTER_MIN_DESC_CHARS
+        and _comparable_tokens(doc, cv_ascii) >= PREFILTER_MIN_TOKENS
+    }
@@ -1,29 +1,65 @@
+import asyncio
 import html
+import os
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 
-import requests
+import httpx
 
 from hob_junter.core.scraper import JobRecord
 
+TELEGRAM_CHUNK_SIZE = 4000
+TELEGRAM_API_URL = "https://api.telegram.org/bot{token}/sendMessage"
 
-def send_telegram_message(text: str, bot_token: Optional[str], chat_id: Optional[str]):
+
+def _chunk_lines(text: str, size: int) -> List[str]:
+    # Split on line boundaries so no HTML tag (all single-line) is cut in half
+    chunks, current = [], ""
+    for line in text.splitlines(keepends=True):
+        while len(line) > size:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(line[:size])
+            line = line[size:]
+        if len(current) + len(line) > size:
+            chunks.append(current)
+            current = ""
+        current += line
+    if current or not chunks:
+        chunks.append(current)
+    return chunks
+
+
+async def send_telegram_message_async(text: str, bot_token: Optional[str], chat_id: Optional[str]):
     if not bot_token or not chat_id:
         return
 
-    url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
+    url = TELEGRAM_API_URL.format(token=bot_token)
+    chunks = _chunk_lines(text, TELEGRAM_CHUNK_SIZE)
+    if len(chunks) > 1:
+        # Chunks are sent concurrently, so number them to keep the order readable
+        chunks = [f"({i + 1}/{len(chunks)})\n{chunk}" for i, chunk in enumerate(chunks)]
+
+    # Previews would make Telegram fetch every apply link in the summary
+    base = {"chat_id": chat_id, "parse_mode": "HTML", "disable_web_page_preview": True}
     try:
-        if len(text) > 4000:
-            for i in range(0, len(text), 4000):
-                chunk = text[i : i + 4000]
-                requests.post(url, json={"chat_id": chat_id, "text": chunk}, timeout=10)
-        else:
-            requests.post(url, json={"chat_id": chat_id, "text": text}, timeout=10)
+        async with httpx.AsyncClient(timeout=10) as session:
+            responses = await asyncio.gather(
+                *[session.post(url, json={**base, "text": chunk}) for chunk in chunks],
+                return_exceptions=True,
+            )
+        for resp in responses:
+            if isinstance(resp, Exception):
+                print(f"[Telegram] Error: {resp}")
+            elif resp.status_code != 200:
+                print(f"[Telegram] Error: HTTP {resp.status_code} {resp.text[:200]}")
     except Exception as exc:  # noqa: BLE001
         print(f"[Telegram] Error: {exc}")
 
 
 def summarize_jobs(jobs_with_scores: List[Tuple[JobRecord, int, str, Dict]]) -> str:
+    """Top-10 digest for Telegram, formatted for parse_mode=HTML."""
     if not jobs_with_scores:
         return "No new matches."
 
@@ -31,7 +67,11 @@ def summarize_jobs(jobs_with_scores: List[Tuple[JobRecord, int, str, Dict]]) ->
     sorted_jobs = sorted(jobs_with_scores, key=lambda x: x[1], reverse=True)
 
     for job, score, reason, _ in sorted_jobs[:10]:
-        msg += f"\n {score}/100 - {job.title} @ {job.company}\nLink: {job.apply_url}\nReason: {reason[:100]}...\n"
+        msg += (
+            f"\n<b>{score}/100</b> - {html.escape(job.title)} @ {html.escape(job.company)}\n"
+            f"<a href=\"{html.escape(job.apply_url)}\">Apply</a>\n"
+            f"Reason: {html.escape(reason[:100])}...\n"
+        )
 
     if len(sorted_jobs) > 10:
         msg += f"\n...and {len(sorted_jobs) - 10} more in the HTML report."
@@ -39,35 +79,132 @@ def summarize_jobs(jobs_with_scores: List[Tuple[JobRecord, int, str, Dict]]) ->
     return msg
 
 
-def export_jobs_html(
-    jobs_with_scores: List[Tuple[JobRecord, int, str, Dict]],
-    strategy_data: Dict,
-    path: str,
-):
-    if not jobs_with_scores:
-        return
+_HTML_HEAD = """<!doctype html>
+<html>
+<head>
+  <meta charset="utf-8" />
+  <title>Hob-Junter Intelligence Report</title>
+  <style>
+    body { font-family: 'Segoe UI', Roboto, Helvetica, sans-serif; margin: 0; background: #f4f6f8; color: #172b4d; }
+    .container { max-width: 1200px; margin: 40px auto; padding: 0 20px; }
+    
+    .strategy-box { background: white; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); padding: 25px; margin-bottom: 30px; border-top: 5px solid #1a73e8; }
+    .strategy-header { display: flex; justify-content: space-between; align-items: flex-start; margin-bottom: 20px; border-bottom: 1px solid #eee; padding-bottom: 15px; }
+    .strategy-header h2 { margin: 0; font-size: 1.4em; }
+    .stats-box { text-align: right; font-size: 0.9em; color: #5e6c84; }
+    
+    .grid-container { display: grid; grid-template-columns: 1fr 1fr; gap: 30px; }
+    .panel h3 { margin-top: 0; color: #091e42; font-size: 1.1em; border-bottom: 2px solid #dfe1e6; padding-bottom: 8px; display: inline-block; }
+    .suggestion-list { padding-left: 20px; font-size: 0.9em; color: #333; }
+    .suggestion-list li { margin-bottom: 8px; }
+    
+    .tag-container { display: flex; flex-wrap: wrap; gap: 8px; margin-top: 10px; }
+    .tag { padding: 4px 10px; border-radius: 4px; font-size: 0.85em; font-weight: 500; }
+    .tag-role { background: #e3f2fd; color: #0d47a1; border: 1px solid #bbdefb; }
+    .tag-exclude { background: #ffebee; color: #c62828; border: 1px solid #ffcdd2; }
+
+    table { border-collapse: collapse; width: 100%; background: #fff; box-shadow: 0 1px 3px rgba(0,0,0,0.1); border-radius: 8px; overflow: hidden; }
+    th, td { padding: 15px; border-bottom: 1px solid #ebecf0; vertical-align: middle; text-align: left; }
+    th { background: #fafbfc; font-weight: 600; color: #5e6c84; font-size: 0.9em; text-transform: uppercase; letter-spacing: 0.05em; }
+    tr:hover { background: #f4f5f7; }
+    
+    .job-title { font-weight: 600; font-size: 1.05em; color: #172b4d; }
+    .job-comp { font-size: 0.9em; color: #6b778c; margin-top: 2px; }
+    .reason-cell { font-size: 0.9em; color: #42526e; line-height: 1.5; }
+    
+    .btn { display: inline-block; padding: 6px 12px; background: #0052cc; color: white; text-decoration: none; border-radius: 3px; font-size: 0.9em; font-weight: 500; }
+    .btn:hover { background: #0065ff; }
+  </style>
+</head>
+<body>
+  <div class="container">
+"""
+
+_TABLE_HEAD = """
+    <table>
+      <thead>
+        <tr><th style="width: 30%">Role</th><th style="width: 10%">Score</th><th style="width: 10%">Action</th><th>Analysis</th></tr>
+      </thead>
+      <tbody>
+"""
+
+_HTML_FOOT = """
+      </tbody>
+    </table>
+    <p style="text-align: center; color: #888; font-size: 0.8em; margin-top: 30px;">Generated by Hob-Junter at {generated}</p>
+  </div>
+</body>
+</html>"""
+
+_ROW_TPL = (
+    "<tr><td><div class='job-title'>{title}</div><div class='job-comp'>{company}</div></td>"
+    "<td><span style='font-size:1.2em; font-weight:bold; color:{color}'>{score}</span></td>"
+    "<td><a href='{url}' target='_blank' class='btn'>Apply</a></td>"
+    "<td class='reason-cell'>{reason}{red_team}</td></tr>\n"
+)
+
+_RED_TEAM_TPL = """
+            <div style="background: #fff0f0; padding: 12px; margin-top: 10px; border-left: 4px solid #d93025; font-size: 0.9em; border-radius: 4px;">
+                <strong style="color: #b71c1c;"> Red Team Analysis (Kill Questions):</strong>
+                <ul style="margin: 5px 0 10px 20px; color: #333;">{questions}</ul>
+                <div style="background: #e3f2fd; padding: 8px; border-left: 4px solid #1976d2; color: #0d47a1; margin-top: 5px;">
+                    <strong>📧 Sniper Outreach:</strong> "{hook}"
+                </div>
+            </div>
+            """
+
+
+_esc = html.escape
+_render = _ROW_TPL.format
+
 
+def _render_row(job: JobRecord, score: int, reason: str, red_team_data: Dict) -> str:
+    color = "#137333" if score >= 80 else "#f9ab00" if score >= 60 else "#d93025"
+
+    red_team_html = ""
+    if red_team_data and score >= 85:
+        questions = "".join(f"<li>{_esc(str(q))}</li>" for q in red_team_data.get("interview_questions", []))
+        hook = red_team_data.get("outreach_hook", "N/A")
+        red_team_html = _RED_TEAM_TPL.format(questions=questions, hook=_esc(hook))
+
+    return _render(
+        title=_esc(job.title),
+        company=_esc(job.company),
+        color=color,
+        score=score,
+        url=_esc(job.apply_url),
+        reason=_esc(reason),
+        red_team=red_team_html,
+    )
+
+
+def _strategy_header_html(strategy_data: Dict, matches_found) -> str:
     strategy_data = strategy_data or {}
     advisor = strategy_data.get("advisor_response", {})
     final_roles = strategy_data.get("final_roles", [])
     exclusions = strategy_data.get("exclusions", [])
 
-    archetype = advisor.get("archetype", "N/A")
+    # Strategy fields come from the LLM, so escape them once up front
+    archetype = _esc(str(advisor.get("archetype", "N/A")))
+    industry = _esc(str(advisor.get("industry", "Unknown")))
     ai_suggestions = advisor.get("suggestions", [])
 
-    suggestions_html = ""
-    for sugg in ai_suggestions:
-        suggestions_html += f"<li><strong>{sugg.get('role')}</strong>: {sugg.get('reason')}</li>"
+    suggestions_html = "".join(
+        f"<li><strong>{_esc(str(sugg.get('role')))}</strong>: {_esc(str(sugg.get('reason')))}</li>"
+        for sugg in ai_suggestions
+    )
+    roles_html = "".join(f'<span class="tag tag-role">{_esc(str(r))}</span>' for r in final_roles)
+    exclusions_html = "".join(f'<span class="tag tag-exclude">{_esc(str(e))}</span>' for e in exclusions)
 
-    header_html = f"""
+    return f"""
     <div class="strategy-box">
       <div class="strategy-header">
         <div>
           <h2>MISSION DOSSIER: <span style="color:#1a73e8">{archetype}</span></h2>
-          <p><strong>Target Industry:</strong> {advisor.get('industry', 'Unknown')}</p>
+          <p><strong>Target Industry:</strong> {industry}</p>
         </div>
         <div class="stats-box">
-           <div><strong>Matches Found:</strong> {len(jobs_with_scores)}</div>
+           <div><strong>Matches Found:</strong> {matches_found}</div>
            <div><strong>Active Filters:</strong> {len(final_roles)} Roles</div>
         </div>
       </div>
@@ -83,95 +220,69 @@ def export_jobs_html(
            <h3>⚡ Active Search Parameters</h3>
            <p style="font-size:0.9em; color:#555;">These are the actual keywords and filters currently being hunted:</p>
            <div class="tag-container">
-             {''.join([f'<span class="tag tag-role">{r}</span>' for r in final_roles])}
+             {roles_html}
            </div>
            
-           {f'<h4>Exclusions (NOT):</h4><div class="tag-container">' + ''.join([f'<span class="tag tag-exclude">{e}</span>' for e in exclusions]) + '</div>' if exclusions else ''}
+           {f'<h4>Exclusions (NOT):</h4><div class="tag-container">{exclusions_html}</div>' if exclusions else ''}
         </div>
       </div>
     </div>
     """
 
-    rows = []
+
+def export_jobs_html(
+    jobs_with_scores: List[Tuple[JobRecord, int, str, Dict]],
+    strategy_data: Dict,
+    path: str,
+):
+    if not jobs_with_scores:
+        return
+
+    header_html = _strategy_header_html(strategy_data, len(jobs_with_scores))
     sorted_jobs = sorted(jobs_with_scores, key=lambda x: x[1], reverse=True)
 
-    for job, score, reason, red_team_data in sorted_jobs:
-        color = "#137333" if score >= 80 else "#f9ab00" if score >= 60 else "#d93025"
+    # Stream straight to disk so the report never exists twice in memory; the temp
+    # file is swapped in whole so a browser refresh never sees a half-written report
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8", buffering=1 << 20) as f:
+        f.write(_HTML_HEAD)
+        f.write(header_html)
+        f.write(_TABLE_HEAD)
+        f.writelines(_render_row(*item) for item in sorted_jobs)
+        f.write(_HTML_FOOT.format(generated=datetime.now().strftime("%H:%M:%S")))
+    os.replace(tmp_path, path)
 
-        red_team_html = ""
-        if red_team_data and score >= 85:
-            questions = "<li>" + "</li><li>".join(red_team_data.get("interview_questions", [])) + "</li>"
-            hook = red_team_data.get("outreach_hook", "N/A")
-            red_team_html = f"""
-            <div style="background: #fff0f0; padding: 12px; margin-top: 10px; border-left: 4px solid #d93025; font-size: 0.9em; border-radius: 4px;">
-                <strong style="color: #b71c1c;"> Red Team Analysis (Kill Questions):</strong>
-                <ul style="margin: 5px 0 10px 20px; color: #333;">{questions}</ul>
-                <div style="background: #e3f2fd; padding: 8px; border-left: 4px solid #1976d2; color: #0d47a1; margin-top: 5px;">
-                    <strong>📧 Sniper Outreach:</strong> "{html.escape(hook)}"
-                </div>
-            </div>
-            """
 
-        rows.append(
-            f"<tr><td><div class='job-title'>{html.escape(job.title)}</div><div class='job-comp'>{html.escape(job.company)}</div></td>"
-            f"<td><span style='font-size:1.2em; font-weight:bold; color:{color}'>{score}</span></td>"
-            f"<td><a href='{html.escape(job.apply_url)}' target='_blank' class='btn'>Apply</a></td>"
-            f"<td class='reason-cell'>{html.escape(reason)}{red_team_html}</td></tr>"
-        )
+class HTMLReportWriter:
+    """
+    Live report while scoring runs: the file is opened on the first match, and each
+    match is appended as one row (arrival order, red team still pending) instead of
+    re-rendering every match so far. export_jobs_html() writes the final sorted
+    report over it once scoring and red teaming are done.
+    """
 
-    html_doc = f"""<!doctype html>
-<html>
-<head>
-  <meta charset="utf-8" />
-  <title>Hob-Junter Intelligence Report</title>
-  <style>
-    body {{ font-family: 'Segoe UI', Roboto, Helvetica, sans-serif; margin: 0; background: #f4f6f8; color: #172b4d; }}
-    .container {{ max-width: 1200px; margin: 40px auto; padding: 0 20px; }}
-    
-    .strategy-box {{ background: white; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); padding: 25px; margin-bottom: 30px; border-top: 5px solid #1a73e8; }}
-    .strategy-header {{ display: flex; justify-content: space-between; align-items: flex-start; margin-bottom: 20px; border-bottom: 1px solid #eee; padding-bottom: 15px; }}
-    .strategy-header h2 {{ margin: 0; font-size: 1.4em; }}
-    .stats-box {{ text-align: right; font-size: 0.9em; color: #5e6c84; }}
-    
-    .grid-container {{ display: grid; grid-template-columns: 1fr 1fr; gap: 30px; }}
-    .panel h3 {{ margin-top: 0; color: #091e42; font-size: 1.1em; border-bottom: 2px solid #dfe1e6; padding-bottom: 8px; display: inline-block; }}
-    .suggestion-list {{ padding-left: 20px; font-size: 0.9em; color: #333; }}
-    .suggestion-list li {{ margin-bottom: 8px; }}
-    
-    .tag-container {{ display: flex; flex-wrap: wrap; gap: 8px; margin-top: 10px; }}
-    .tag {{ padding: 4px 10px; border-radius: 4px; font-size: 0.85em; font-weight: 500; }}
-    .tag-role {{ background: #e3f2fd; color: #0d47a1; border: 1px solid #bbdefb; }}
-    .tag-exclude {{ background: #ffebee; color: #c62828; border: 1px solid #ffcdd2; }}
-
-    table {{ border-collapse: collapse; width: 100%; background: #fff; box-shadow: 0 1px 3px rgba(0,0,0,0.1); border-radius: 8px; overflow: hidden; }}
-    th, td {{ padding: 15px; border-bottom: 1px solid #ebecf0; vertical-align: middle; text-align: left; }}
-    th {{ background: #fafbfc; font-weight: 600; color: #5e6c84; font-size: 0.9em; text-transform: uppercase; letter-spacing: 0.05em; }}
-    tr:hover {{ background: #f4f5f7; }}
-    
-    .job-title {{ font-weight: 600; font-size: 1.05em; color: #172b4d; }}
-    .job-comp {{ font-size: 0.9em; color: #6b778c; margin-top: 2px; }}
-    .reason-cell {{ font-size: 0.9em; color: #42526e; line-height: 1.5; }}
-    
-    .btn {{ display: inline-block; padding: 6px 12px; background: #0052cc; color: white; text-decoration: none; border-radius: 3px; font-size: 0.9em; font-weight: 500; }}
-    .btn:hover {{ background: #0065ff; }}
-  </style>
-</head>
-<body>
-  <div class="container">
-    {header_html}
-    
-    <table>
-      <thead>
-        <tr><th style="width: 30%">Role</th><th style="width: 10%">Score</th><th style="width: 10%">Action</th><th>Analysis</th></tr>
-      </thead>
-      <tbody>
-        {''.join(rows)}
-      </tbody>
-    </table>
-    <p style="text-align: center; color: #888; font-size: 0.8em; margin-top: 30px;">Generated by Hob-Junter at {datetime.now().strftime('%H:%M:%S')}</p>
-  </div>
-</body>
-</html>"""
+    def __init__(self, path: str, strategy_data: Dict):
+        self.path = path
+        self.strategy_data = strategy_data
+        self._file = None
+
+    def add_match(self, job: JobRecord, score: int, reason: str):
+        if self._file is None:
+            self._file = open(self.path, "w", encoding="utf-8")
+            self._file.write(_HTML_HEAD)
+            self._file.write(_strategy_header_html(self.strategy_data, "scoring in progress"))
+            self._file.write(_TABLE_HEAD)
+        self._file.write(_render_row(job, score, reason, {}))
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.write(_HTML_FOOT.format(generated=datetime.now().strftime("%H:%M:%S")))
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
 
-    with open(path, "w") as f:
-        f.write(html_doc)
+    def __exit__(self, *exc):
+        self.close()
@@ -1,20 +1,76 @@
 import asyncio
-import json
+import functools
+import html
+import re
+import sys
 import urllib.parse
-import random
 import time
-from dataclasses import dataclass
-from typing import Any, Dict, List
-
-from playwright.async_api import async_playwright
-
-from hob_junter.config.settings import HIRING_BASE, JOBS_ENDPOINT
-from hob_junter.utils.helpers import debug_print
-
-
-@dataclass
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import httpx
+import ijson
+import orjson
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError, async_playwright
+
+from hob_junter.config.settings import HIRING_BASE, JOBS_ENDPOINT, SEARCH_TEMPLATE_FILE
+from hob_junter.core import desc_cache
+from hob_junter.utils.helpers import TokenBucket, debug_print
+
+# Pagination replay: pages requested per window / max in-flight requests
+REPLAY_WINDOW = 10
+REPLAY_CONCURRENCY = 10
+STRATEGY_CONCURRENCY = 4  # Browser strategies harvested at once, one context each
+# search-jobs requests per second (and burst) across all concurrent strategies
+SEARCH_RPS = 20.0
+SEARCH_BURST = 20
+REPLAY_MAX_ATTEMPTS = 3  # Tries per page when the API answers 429/503
+RETRY_AFTER_MAX_SECONDS = 30.0
+DESC_FETCH_CONCURRENCY = 12  # Apply-page tabs open at once for the description backfill
+DESC_HTTP_CONCURRENCY = 30  # Plain-HTTP apply-page fetches in flight (tried before the browser)
+DESC_HTTP_MIN_CHARS = 500  # Less text than this from plain HTTP means a JS-rendered page
+RAW_JSON_MAX_BYTES = 32_000  # JobRecord.raw_json cap (same as the DB raw_data cap)
+WARM_BROWSER_MIN_JOBS = 20  # Pages to backfill before Chromium is launched up front, alongside the HTTP pass
+_DESC_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/124.0 Safari/537.36"
+)
+# Apply pages are scraped for text only; these never need to load
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "stylesheet", "media"})
+# Left to httpx when replaying the template outside the browser
+_API_SKIP_HEADERS = {"content-length", "host", "connection", "accept-encoding", "cookie"}
+
+# Query params that only track where a click came from; dropped when comparing apply URLs
+_TRACKING_PARAMS = frozenset({"ref", "source", "src", "gh_src", "lever-source", "lever-origin"})
+
+_TAG_RE = re.compile("<[^<]+?>")
+_WS_RE = re.compile(r"\s+")
+# script/style bodies are code, not description text; drop them before stripping tags
+_SCRIPT_STYLE_RE = re.compile(r"<(script|style)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+
+
+def strip_html(raw: str) -> str:
+    """Tags (and script/style bodies) to spaces, entities decoded."""
+    if "<" in raw:
+        raw = _TAG_RE.sub(" ", _SCRIPT_STYLE_RE.sub(" ", raw))
+    return html.unescape(raw) if "&" in raw else raw
+
+
+def clean_text(raw: str) -> str:
+    """strip_html plus whitespace runs collapsed to single spaces (one C-level regex pass)."""
+    return _WS_RE.sub(" ", strip_html(raw)).strip()
+
+
+def _job_id_of(job: Dict[str, Any]) -> str:
+    # Interned: the same ids come back from every strategy and page, so set lookups reuse one object
+    return sys.intern(str(job.get("id") or job.get("objectID") or ""))
+
+
+_EMPTY: Dict[str, Any] = {}
+
+
+@dataclass(slots=True)
 class JobRecord:
-    raw: Dict[str, Any]
     job_id: str
     title: str
     company: str
@@ -22,30 +78,155 @@ class JobRecord:
     source_url: str
     description: str = ""
     strategy_name: str = "Default"
+    raw: Optional[Dict[str, Any]] = field(default=None, repr=False)  # Full API payload, debug runs only
+    # Compact JSON of the API payload, truncated to RAW_JSON_MAX_BYTES, kept in every run for
+    # the {job_raw} prompt variable and the DB raw_data column
+    raw_json: bytes = field(default=b"", repr=False)
+    _clean: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    def set_description(self, text: str):
+        """Replaces the description (e.g. with scraped page text) and drops the cached clean copy."""
+        self.description = text
+        self._clean = None
+
+    @property
+    def clean_description(self) -> str:
+        """Tag-stripped, whitespace-collapsed description, computed once per job on first use (after scraping)."""
+        if self._clean is None:
+            self._clean = clean_text(self.description)
+        return self._clean
 
     @staticmethod
-    def from_api(job: Dict[str, Any], strategy_name: str = "Default") -> "JobRecord":
-        job_id = str(job.get("id") or job.get("objectID") or "")
-        info = job.get("job_information", {})
-        processed_job = job.get("v5_processed_job_data", {})
-        processed_comp = job.get("v5_processed_company_data", {})
-
-        title = (
-            info.get("title")
-            or info.get("job_title_raw")
-            or processed_job.get("core_job_title")
-            or ""
-        )
+    def from_api(job: Dict[str, Any], strategy_name: str = "Default", keep_raw: bool = False) -> "JobRecord":
+        get = job.get
+        info = get("job_information") or _EMPTY
+        processed_job = get("v5_processed_job_data") or _EMPTY
+
+        title = info.get("title") or info.get("job_title_raw") or processed_job.get("core_job_title") or ""
         company = (
             processed_job.get("company_name")
-            or processed_comp.get("name")
+            or (get("v5_processed_company_data") or _EMPTY).get("name")
             or "Unknown Company"
         )
-        apply_url = job.get("apply_url") or ""
-        source_url = HIRING_BASE
-        description = info.get("description", "")
 
-        return JobRecord(job, job_id, title, company, apply_url, source_url, description, strategy_name)
+        return JobRecord(
+            _job_id_of(job),
+            title,
+            company,
+            get("apply_url") or "",
+            HIRING_BASE,
+            info.get("description", ""),
+            strategy_name,
+            job if keep_raw else None,
+            orjson.dumps(job, default=str)[:RAW_JSON_MAX_BYTES],
+        )
+
+
+_BATCH_KEYS = ("results", "jobs", "data", "items", "content")
+
+
+def _is_search_response(resp) -> bool:
+    return resp.request.method == "POST" and resp.url.endswith("/api/search-jobs")
+
+
+def _extract_batch(data: Any) -> List[Dict[str, Any]]:
+    """Unwraps the job list from a search-jobs payload (bare list or keyed dict)."""
+    if isinstance(data, list):
+        return data
+    if not isinstance(data, dict):
+        return []
+    return next((data[k] for k in _BATCH_KEYS if isinstance(data.get(k), list)), [])
+
+
+class _AsyncBody:
+    """Async file-like view of an httpx response stream, as ijson's *_async parsers expect."""
+
+    def __init__(self, resp: httpx.Response):
+        self._chunks = resp.aiter_bytes()
+
+    async def read(self, size: int = -1) -> bytes:
+        if size == 0:
+            return b""  # ijson probes with read(0) to detect bytes vs str
+        return await anext(self._chunks, b"")
+
+
+async def _stream_batch(resp: httpx.Response) -> List[Dict[str, Any]]:
+    """
+    Streaming counterpart of _extract_batch for large search-jobs pages: builds the
+    job items one by one from parser events, so neither the whole body nor the full
+    response tree is held in memory.
+    """
+    items: List[Dict[str, Any]] = []
+    prefix = builder = None
+    async for path, event, value in ijson.parse_async(_AsyncBody(resp), use_float=True):
+        if prefix is None:
+            # Same shapes as _extract_batch: a bare list, or the first list under one of _BATCH_KEYS
+            if event == "start_array" and (path == "" or path in _BATCH_KEYS):
+                prefix = f"{path}.item" if path else "item"
+            continue
+        if builder is None:
+            if path == prefix and event == "start_map":
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+            elif event == "end_array" and f"{path}.item".lstrip(".") == prefix:
+                break  # The job list is done; skip whatever trails it
+            continue
+        builder.event(event, value)
+        if path == prefix and event == "end_map":
+            items.append(builder.value)
+            builder = None
+    return items
+
+
+def _retry_after(headers) -> float:
+    """Seconds to wait from a Retry-After header (delta-seconds form), capped; 1s if absent or a date."""
+    try:
+        return min(max(float(headers.get("retry-after", 1)), 0.0), RETRY_AFTER_MAX_SECONDS)
+    except (TypeError, ValueError):
+        return 1.0
+
+
+def _canonical_url(url: str) -> str:
+    """Apply URL minus fragment, tracking params and trailing slash, with a lowercased host."""
+    try:
+        parts = urllib.parse.urlsplit(url.strip())
+    except ValueError:
+        return url
+    query = urllib.parse.urlencode(
+        [
+            (k, v)
+            for k, v in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+            if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS
+        ]
+    )
+    return urllib.parse.urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/"), query, "")
+    )
+
+
+def _merge_batch(
+    batch: List[Dict[str, Any]], jobs: List[JobRecord], seen: set,
+    strategy_name: str = "Default", seen_global: Optional[set] = None, keep_raw: bool = False,
+) -> int:
+    """
+    Appends unseen jobs from a raw batch. Returns how many were new to this strategy.
+    Jobs another strategy already harvested (seen_global) still count as new for
+    pagination, but are not built into a second JobRecord.
+    """
+    added = 0
+    for item in batch:
+        # Check the id on the raw item so already-seen jobs never build a JobRecord
+        job_id = _job_id_of(item)
+        if job_id in seen:
+            continue
+        seen.add(job_id)
+        added += 1
+        if seen_global is not None and job_id:
+            if job_id in seen_global:
+                continue
+            seen_global.add(job_id)
+        jobs.append(JobRecord.from_api(item, strategy_name=strategy_name, keep_raw=keep_raw))
+    return added
 
 
 # Kept for legacy interactive fallback if needed
@@ -60,67 +241,61 @@ def input_exclusions_interactive() -> List[str]:
     return []
 
 
+# Every search is forced to Bulgaria; built once rather than per strategy.
+# Kept a plain dict (not a MappingProxyType) because orjson only serializes dicts.
+_BULGARIA_LOCATION: Dict[str, Any] = {
+    "id": "QxY1yZQBoEtHp_8UEq3V",
+    "types": ["country"],
+    "address_components": [
+        {
+            "long_name": "Bulgaria",
+            "short_name": "BG",
+            "types": ["country"]
+        }
+    ],
+    "formatted_address": "Bulgaria",
+    "population": 7000039,
+    "workplace_types": [],
+    "options": {
+        "flexible_regions": ["anywhere_in_continent", "anywhere_in_world"]
+    }
+}
+_LOCATIONS = [_BULGARIA_LOCATION]
+
+
 def construct_search_url(roles: List[str], locations: List[str], departments: List[str], exclusions=None) -> str:
     """
     Constructs a Hiring.Cafe URL.
     NOW: Explicit 'departments' list control.
+    Memoized on tuple copies of the inputs, so strategies sharing roles/departments/
+    exclusions build their URL once per process. `locations` is unused (always Bulgaria).
     """
-    import json
-    import urllib.parse
+    if exclusions and not isinstance(exclusions, str):
+        exclusions = tuple(exclusions)
+    return _search_url(tuple(roles), tuple(departments or ()), exclusions or None)
 
-    # 1. Base Logic for Departments
-    final_departments = departments if departments else []
 
-    # 2. Build Job Title Query
-    role_queries = [f'\\"{r.strip()}\\"' for r in roles if r and r.strip()]
-    query_parts = " OR ".join(role_queries)
-    full_query = f"({query_parts})"
+@functools.lru_cache(maxsize=128)
+def _search_url(roles: tuple, departments: tuple, exclusions) -> str:
+    # 1. Build Job Title Query
+    full_query = "(" + " OR ".join('\\"' + r.strip() + '\\"' for r in roles if r and r.strip()) + ")"
 
-    # 3. Handle Exclusions
+    # 2. Handle Exclusions
     if exclusions:
-        if isinstance(exclusions, str):
-            excl_source = exclusions.split(",")
-        else:
-            excl_source = exclusions
-            
-        excl_list = [f'NOT \\"{e.strip()}\\"' for e in excl_source if e and e.strip()]
-        
+        excl_source = exclusions.split(",") if isinstance(exclusions, str) else exclusions
+        excl_list = ['NOT \\"' + e.strip() + '\\"' for e in excl_source if e and e.strip()]
         if excl_list:
             full_query += " " + " ".join(excl_list)
 
-    # 4. FORCE BULGARIA LOCATION
-    bulgaria_location = {
-        "id": "QxY1yZQBoEtHp_8UEq3V",
-        "types": ["country"],
-        "address_components": [
-            {
-                "long_name": "Bulgaria",
-                "short_name": "BG",
-                "types": ["country"]
-            }
-        ],
-        "formatted_address": "Bulgaria",
-        "population": 7000039,
-        "workplace_types": [],
-        "options": {
-            "flexible_regions": ["anywhere_in_continent", "anywhere_in_world"]
-        }
-    }
-    
-    final_locations = [bulgaria_location]
-
-    # 5. Construct State Object
+    # 3. Construct State Object (location is always Bulgaria)
     state = {
-        "departments": final_departments,
+        "departments": list(departments),
         "jobTitleQuery": full_query,
-        "locations": final_locations
+        "locations": _LOCATIONS,
     }
 
-    # 6. Encode and Return
-    json_str = json.dumps(state)
-    encoded = urllib.parse.quote(json_str)
-    
-    return f"https://hiring.cafe/?searchState={encoded}"
+    # 4. Encode and Return
+    return f"https://hiring.cafe/?searchState={urllib.parse.quote(orjson.dumps(state))}"
 
 
 def parse_hiring_cafe_search_state_from_url(url: str) -> Dict[str, Any]:
@@ -130,217 +305,488 @@ def parse_hiring_cafe_search_state_from_url(url: str) -> Dict[str, Any]:
         return {}
     raw = qs["searchState"][0]
     decoded = urllib.parse.unquote(raw)
-    return json.loads(decoded)
+    return orjson.loads(decoded)
 
 
-async def fetch_jobs_via_browser(strategy_urls: List[str], debug: bool = False) -> List[JobRecord]:
+def _load_search_template() -> Optional[Dict[str, Any]]:
+    try:
+        with open(SEARCH_TEMPLATE_FILE, "rb") as f:
+            template = orjson.loads(f.read())
+    except FileNotFoundError:
+        return None
+    except Exception as exc:  # noqa: BLE001
+        print(f"[Hiring] Ignoring unreadable {SEARCH_TEMPLATE_FILE}: {exc}")
+        return None
+    if not isinstance(template, dict) or not {"url", "headers", "payload"} <= template.keys():
+        return None
+    return template
+
+
+def _save_search_template(url: str, headers: Dict[str, str], payload: Dict[str, Any]):
+    """Persists the captured search-jobs request so later runs can skip the browser."""
+    template = {"url": url, "headers": headers, "payload": payload}
+    try:
+        with open(SEARCH_TEMPLATE_FILE, "wb") as f:
+            f.write(orjson.dumps(template))
+    except Exception as exc:  # noqa: BLE001
+        print(f"[Hiring] Failed to cache search template: {exc}")
+
+
+async def _fetch_strategies_via_api(
+    strategy_urls: List[str], template: Dict[str, Any], debug: bool = False
+) -> Optional[List[List[JobRecord]]]:
     """
-    Iterates through a list of Strategy URLs using a single browser instance.
-    Deduplicates jobs across strategies using ID.
+    Paginates every strategy straight against the search-jobs API, reusing a
+    request template captured by an earlier browser run. Strategies run
+    concurrently over one pooled client. Returns None if the template is rejected
+    (e.g. expired headers), so the caller can fall back to the browser.
     """
-    if not strategy_urls:
-        return []
+    headers = {k: v for k, v in template["headers"].items() if k.lower() not in _API_SKIP_HEADERS}
+    sem = asyncio.Semaphore(REPLAY_CONCURRENCY)
+    limiter = TokenBucket(SEARCH_RPS, SEARCH_BURST)
+    seen_global: set = set()
 
-    p = await async_playwright().start()
-    browser = await p.chromium.launch(
-        headless=False, args=["--disable-blink-features=AutomationControlled"]
-    )
+    async with httpx.AsyncClient(
+        headers=headers, timeout=30, limits=httpx.Limits(max_connections=REPLAY_CONCURRENCY)
+    ) as client:
+
+        async def fetch_page(base: Dict[str, Any], page_num: int):
+            async with sem:
+                payload = orjson.dumps({**base, "page": page_num})
+                # No fixed pacing: the bucket caps the rate, and the server's Retry-After sets backoff
+                for _ in range(REPLAY_MAX_ATTEMPTS):
+                    await limiter.acquire_async()
+                    async with client.stream("POST", template["url"], content=payload) as resp:
+                        if resp.status_code not in (429, 503):
+                            if resp.status_code != 200:
+                                return None
+                            return await _stream_batch(resp)
+                        delay = _retry_after(resp.headers)
+                    await asyncio.sleep(delay)
+                return None
+
+        async def paginate(idx: int, url: str) -> List[JobRecord]:
+            base = {**template["payload"], "searchState": parse_hiring_cafe_search_state_from_url(url)}
+            jobs: List[JobRecord] = []
+            seen: set = set()
+            window_start = 0
+            while True:
+                window = range(window_start, window_start + REPLAY_WINDOW)
+                batches = await asyncio.gather(*[fetch_page(base, n) for n in window], return_exceptions=True)
+                if window_start == 0 and (isinstance(batches[0], Exception) or batches[0] is None):
+                    raise RuntimeError(f"search-jobs rejected the cached template: {batches[0]}")
+
+                count = 0
+                hit_end = False
+                for batch in batches:
+                    if isinstance(batch, Exception) or not batch:
+                        hit_end = True
+                        continue
+                    count += _merge_batch(
+                        batch, jobs, seen, strategy_name=f"Strategy-{idx+1}",
+                        seen_global=seen_global, keep_raw=debug,
+                    )
+
+                if count == 0 or hit_end:
+                    break
+                window_start += REPLAY_WINDOW
+
+            print(f"[Hiring] Strategy {idx+1} yielded {len(seen)} raw jobs ({len(jobs)} new).")
+            return jobs
+
+        print(f"[Hiring] Querying the search API directly for {len(strategy_urls)} strategies...")
+        # TaskGroup cancels the remaining strategies as soon as one fails, so none keep
+        # hitting the API while the browser fallback runs
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tasks = [tg.create_task(paginate(i, u)) for i, u in enumerate(strategy_urls)]
+        except Exception as exc:  # noqa: BLE001
+            cause = exc.exceptions[0] if isinstance(exc, ExceptionGroup) else exc
+            print(f"[Hiring] Direct API fetch failed ({cause}); falling back to the browser.")
+            return None
+        return [task.result() for task in tasks]
+
+
+class _ResponseCapture:
+    """
+    search-jobs response interceptor for one strategy's page. Captures the paginated
+    request template (saved to disk once per run, via the shared template_saved
+    event) and merges every response batch into the strategy's jobs.
+    """
+
+    def __init__(self, strategy_name: str, seen_global: set, template_saved: asyncio.Event, debug: bool = False):
+        self.strategy_name = strategy_name
+        self.seen_global = seen_global  # job ids harvested by any strategy this run
+        self.template_saved = template_saved
+        self.debug = debug
+        self.jobs: List[JobRecord] = []
+        self.seen: set = set()
+        self.payload: Dict[str, Any] = {}
+        self.url = JOBS_ENDPOINT
+        self.headers: Dict[str, str] = {}
+        self.template_ready = asyncio.Event()
+        self.response_seen = asyncio.Event()  # set whenever a search-jobs page adds jobs
+
+    def on_response(self, resp):
+        # Filter synchronously: only search-jobs responses cost a Task
+        if _is_search_response(resp):
+            asyncio.create_task(self.handle(resp))
+
+    async def handle(self, resp):
+        try:
+            req_data = resp.request.post_data_json or {}
+            page_val = req_data.get("page")
+
+            is_candidate = (
+                isinstance(req_data, dict)
+                and req_data.get("searchState")
+                and page_val is not None
+                and page_val >= 1
+            )
+
+            if is_candidate and not self.payload:
+                self.payload = req_data
+                if resp.request.url: self.url = resp.request.url
+
+                req_headers = resp.request.headers or {}
+                self.headers = {
+                    k: v for k, v in req_headers.items()
+                    if k.lower() not in {"content-length", "host", "connection"}
+                }
+                self.template_ready.set()
+                if not self.template_saved.is_set():
+                    self.template_saved.set()
+                    _save_search_template(self.url, self.headers, self.payload)
+
+            try:
+                data = orjson.loads(await resp.body())
+            except Exception: return
+
+            # Pass Strategy ID purely for debugging/tracing
+            if _merge_batch(
+                _extract_batch(data), self.jobs, self.seen,
+                strategy_name=self.strategy_name, seen_global=self.seen_global, keep_raw=self.debug,
+            ):
+                self.response_seen.set()
+
+        except Exception as exc:
+            debug_print(f"[Playwright] Response error: {exc}", enabled=self.debug)
+
+
+async def _run_browser_strategy(
+    browser, idx: int, url: str, capture: _ResponseCapture, limiter: TokenBucket, debug: bool = False
+) -> List[JobRecord]:
+    """
+    One strategy in its own context of `browser`: opens the search, scrolls until
+    the request template is captured, then replays the remaining pages.
+    Returns whatever was harvested, even if the strategy fails halfway.
+    """
     context = await browser.new_context()
-    
-    # Store unique jobs keyed by ID to prevent dupes across strategies
-    unique_jobs_map: Dict[str, JobRecord] = {} 
-    
     try:
         page = await context.new_page()
-        
-        for idx, url in enumerate(strategy_urls):
-            # Extract strategy name/meta if possible, or just use index
-            print(f"\n[Hiring] Executing Strategy {idx+1}/{len(strategy_urls)}...")
-            
-            # --- Per-Strategy Scraping Logic ---
-            
-            jobs_found_in_strategy = []
-            seen_in_strategy = set()
-            captured_payload = {}
-            captured_url = JOBS_ENDPOINT
-            captured_headers = {}
-            page_size = 1000
-            template_ready = asyncio.Event()
-
-            # Network interceptor specifically for this iteration
-            async def process_response(resp):
-                nonlocal captured_payload, captured_url, captured_headers, page_size
-                try:
-                    if resp.request.method != "POST": return
-                    if not resp.url.endswith("/api/search-jobs"): return
+        page.on("response", capture.on_response)
+
+        print(f"[Hiring] Strategy {idx+1}: opening search...")
+        # Return as soon as the first search XHR lands instead of waiting for network idle
+        await limiter.acquire_async()
+        try:
+            async with page.expect_response(_is_search_response, timeout=30000):
+                await page.goto(url, wait_until="commit")
+        except PlaywrightTimeoutError:
+            debug_print(f"[Playwright] Strategy {idx+1}: no search-jobs response within 30s", enabled=debug)
+
+        # Cookie banner check
+        try:
+            banner_close = page.locator('button[aria-label="Close banner"]').first
+            if await banner_close.is_visible(): await banner_close.click(timeout=500)
+        except Exception: pass
+
+        # Scroll only until the paginated request template is captured;
+        # the API replay below fetches the remaining pages directly.
+        for _ in range(40): # Cap scroll attempts
+            if page.is_closed(): break
+            if capture.template_ready.is_set() and capture.jobs: break
+            try:
+                capture.response_seen.clear()
+                await page.evaluate("window.scrollTo(0, document.body.scrollHeight);")
+                if capture.template_ready.is_set():
+                    # Template is in; wait for its page to be parsed, not a fixed delay
+                    await asyncio.wait_for(capture.response_seen.wait(), timeout=2.5)
+                else:
+                    await asyncio.wait_for(capture.template_ready.wait(), timeout=1.2)
+            except asyncio.TimeoutError: pass
+            except Exception: break
+            if len(capture.jobs) > 2000: break
+
+        # API Replay for missed pages (windowed, bounded concurrency)
+        if capture.payload:
+            print(f"[Hiring] Strategy {idx+1}: replaying API for missed pages...")
+            replay_sem = asyncio.Semaphore(REPLAY_CONCURRENCY)
+            captured_payload, captured_url, captured_headers = capture.payload, capture.url, capture.headers
+
+            async def fetch_page(page_num: int):
+                async with replay_sem:
+                    payload = dict(captured_payload)
+                    payload["page"] = page_num
+                    data = orjson.dumps(payload).decode()
+                    for _ in range(REPLAY_MAX_ATTEMPTS):
+                        await limiter.acquire_async()
+                        resp = await context.request.post(captured_url, data=data, headers=captured_headers)
+                        if resp.status in (429, 503):
+                            await asyncio.sleep(_retry_after(resp.headers))
+                            continue
+                        if resp.status != 200: return None
+
+                        return _extract_batch(orjson.loads(await resp.body()))
+                    return None
+
+            window_start = captured_payload.get("page", 1) + 1
+
+            while True:
+                window = range(window_start, window_start + REPLAY_WINDOW)
+                batches = await asyncio.gather(
+                    *[fetch_page(n) for n in window], return_exceptions=True
+                )
+
+                count = 0
+                hit_end = False
+                for batch in batches:
+                    if isinstance(batch, Exception) or batch is None:
+                        hit_end = True
+                        continue
+                    count += _merge_batch(
+                        batch, capture.jobs, capture.seen, strategy_name=capture.strategy_name,
+                        seen_global=capture.seen_global, keep_raw=debug,
+                    )
 
-                    req_data = resp.request.post_data_json or {}
-                    page_val = req_data.get("page")
+                # A whole window with nothing new means we ran off the end
+                if count == 0 or hit_end: break
+                window_start += REPLAY_WINDOW
 
-                    is_candidate = (
-                        isinstance(req_data, dict)
-                        and req_data.get("searchState")
-                        and page_val is not None
-                        and page_val >= 1
-                    )
+        print(f"[Hiring] Strategy {idx+1} yielded {len(capture.seen)} raw jobs ({len(capture.jobs)} new).")
 
-                    if is_candidate and not captured_payload:
-                        captured_payload = req_data
-                        page_size = req_data.get("size", page_size)
-                        if resp.request.url: captured_url = resp.request.url
+    except Exception as e:
+        print(f"[Error] Strategy {idx+1} crashed: {e}")
+    finally:
+        await context.close()
 
-                        req_headers = resp.request.headers or {}
-                        captured_headers = {
-                            k: v for k, v in req_headers.items()
-                            if k.lower() not in {"content-length", "host", "connection"}
-                        }
-                        template_ready.set()
+    return capture.jobs
 
-                    try:
-                        data = await resp.json()
-                    except Exception: return
-
-                    batch = []
-                    if isinstance(data, list): batch = data
-                    else:
-                        for key in ["results", "jobs", "data", "items", "content"]:
-                            if key in data and isinstance(data[key], list):
-                                batch = data[key]; break
-
-                    for item in batch:
-                        # Pass Strategy ID purely for debugging/tracing
-                        jr = JobRecord.from_api(item, strategy_name=f"Strategy-{idx+1}")
-                        if jr.job_id not in seen_in_strategy:
-                            seen_in_strategy.add(jr.job_id)
-                            jobs_found_in_strategy.append(jr)
-
-                except Exception as exc:
-                    debug_print(f"[Playwright] Response error: {exc}", enabled=debug)
-            def response_handler(resp):
-                asyncio.create_task(process_response(resp))
-
-            page.on("response", response_handler)
 
-            try:
-                print(f"[Hiring] Opening search...")
-                await page.goto(url, wait_until="networkidle")
-                
-                # Cookie banner check
-                try:
-                    await page.wait_for_timeout(1000)
-                    banner_close = page.locator('button[aria-label="Close banner"]')
-                    if await banner_close.count() > 0: await banner_close.first.click()
-                except Exception: pass
+async def _fetch_strategies_via_browser(browser, strategy_urls: List[str], debug: bool = False) -> List[List[JobRecord]]:
+    """
+    Runs the strategy URLs concurrently, one context of `browser` each, and returns
+    the jobs found per strategy. Captures the search request template on the way.
+    Request pacing comes from a shared token bucket instead of idle sleeps between strategies.
+    """
+    seen_global: set = set()
+    template_saved = asyncio.Event()
+    limiter = TokenBucket(SEARCH_RPS, SEARCH_BURST)
+    sem = asyncio.Semaphore(STRATEGY_CONCURRENCY)
 
-                # Scroll
-                print("[Hiring] Scrolling feed...")
-                stagnant_height = 0
-                try: last_height = await page.evaluate("document.body.scrollHeight")
-                except: last_height = 0
+    async def run(idx: int, url: str) -> List[JobRecord]:
+        async with sem:
+            capture = _ResponseCapture(f"Strategy-{idx+1}", seen_global, template_saved, debug=debug)
+            return await _run_browser_strategy(browser, idx, url, capture, limiter, debug=debug)
 
-                for _ in range(40): # Cap scroll attempts
-                    if page.is_closed(): break
-                    try:
-                        await page.evaluate("window.scrollTo(0, document.body.scrollHeight);")
-                        await page.wait_for_timeout(1200)
-                        new_height = await page.evaluate("document.body.scrollHeight")
-                    except Exception: break
-
-                    if new_height <= last_height: stagnant_height += 1
-                    else: stagnant_height = 0
-                    last_height = new_height
-
-                    if template_ready.is_set() and stagnant_height >= 3: break
-                    if len(jobs_found_in_strategy) > 2000: break
-
-                # API Replay for missed pages
-                if captured_payload:
-                    print("[Hiring] Replaying API for missed pages...")
-                    current_page = captured_payload.get("page", 1) + 1
-                    empty_fetches = 0
-                    
-                    while empty_fetches < 2:
-                        try:
-                            payload = dict(captured_payload)
-                            payload["page"] = current_page
-                            resp = await context.request.post(
-                                captured_url, data=json.dumps(payload), headers=captured_headers
-                            )
-                            if resp.status != 200: break
-
-                            data = await resp.json()
-                            batch = []
-                            if isinstance(data, list): batch = data
-                            else:
-                                for key in ["results", "jobs", "data", "items", "content"]:
-                                    if key in data and isinstance(data[key], list):
-                                        batch = data[key]; break
-                            
-                            if not batch:
-                                empty_fetches += 1
-                            else:
-                                count = 0
-                                for item in batch:
-                                    jr = JobRecord.from_api(item, strategy_name=f"Strategy-{idx+1}")
-                                    if jr.job_id not in seen_in_strategy:
-                                        seen_in_strategy.add(jr.job_id)
-                                        jobs_found_in_strategy.append(jr)
-                                        count += 1
-                                empty_fetches = 0 if count > 0 else empty_fetches + 1
-                            
-                            current_page += 1
-                            await asyncio.sleep(0.3)
-                        except Exception: break
-
-                print(f"[Hiring] Strategy {idx+1} yielded {len(jobs_found_in_strategy)} raw jobs.")
-                
-                # Merge into global dict (DEDUPLICATION POINT)
-                for j in jobs_found_in_strategy:
-                    dedup_key = j.job_id or f"{j.company}|{j.title}"
-                    if dedup_key not in unique_jobs_map:
-                        unique_jobs_map[dedup_key] = j
-                
-                # Sleep between strategies to avoid rate limits
-                if idx < len(strategy_urls) - 1:
-                    wait_time = random.uniform(5.0, 10.0)
-                    print(f"[Hiring] Sleeping {wait_time:.1f}s before next strategy...")
-                    await asyncio.sleep(wait_time)
-            finally:
-                page.remove_listener("response", response_handler)
+    print(f"\n[Hiring] Executing {len(strategy_urls)} strategies ({STRATEGY_CONCURRENCY} at a time)...")
+    return list(await asyncio.gather(*[run(i, u) for i, u in enumerate(strategy_urls)]))
 
-    except Exception as e:
-        print(f"[Error] Browser loop crashed: {e}")
+
+async def _fetch_descriptions_http(jobs: List[JobRecord], leftovers: asyncio.Queue):
+    """
+    Plain-HTTP pass of the description backfill: most ATS apply pages are
+    server-rendered, so their text needs no browser. Jobs that still need one
+    (errors, or too little text, i.e. JS-rendered pages) are put on `leftovers`
+    as soon as they fail, and a None sentinel follows once the pass is done.
+    """
+    sem = asyncio.Semaphore(DESC_HTTP_CONCURRENCY)
+
+    try:
+        async with httpx.AsyncClient(
+            follow_redirects=True,
+            timeout=20,
+            headers={"User-Agent": _DESC_USER_AGENT},
+            limits=httpx.Limits(max_connections=DESC_HTTP_CONCURRENCY),
+        ) as client:
+
+            async def fetch_desc(job: JobRecord):
+                try:
+                    async with sem:
+                        resp = await client.get(job.apply_url)
+                    if resp.status_code < 400 and "html" in resp.headers.get("content-type", "html"):
+                        content = clean_text(resp.text)[:50000]
+                        if len(content) >= DESC_HTTP_MIN_CHARS:
+                            job.set_description(content)
+                            return
+                except Exception:  # noqa: BLE001
+                    pass
+                leftovers.put_nowait(job)
+
+            await asyncio.gather(*[fetch_desc(j) for j in jobs])
     finally:
-        await browser.close()
-        await p.stop()
+        leftovers.put_nowait(None)
 
-    all_jobs = list(unique_jobs_map.values())
-    print(f"[Hiring] Total UNIQUE jobs across all strategies: {len(all_jobs)}")
-
-    # Post-process descriptions if needed
-    jobs_needing_scrape = [j for j in all_jobs if j.apply_url and len(j.description) < 200]
-    if jobs_needing_scrape:
-        print(f"[Hiring] Fetching full descriptions for {len(jobs_needing_scrape)} jobs...")
-        # Re-launch browser just for scraping details if needed (cleaner state)
-        p2 = await async_playwright().start()
-        browser2 = await p2.chromium.launch(headless=True) # Headless is fine for text
-        ctx2 = await browser2.new_context()
-        sem = asyncio.Semaphore(5)
-
-        async def fetch_desc(job: JobRecord):
-            if not job.apply_url: return
-            async with sem:
-                page = await ctx2.new_page()
+
+async def _skip_heavy_resources(route):
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def _backfill_descriptions(browser, first: JobRecord, jobs: asyncio.Queue) -> int:
+    """
+    Loads each job's apply page and keeps its visible text as the description:
+    `first`, then whatever arrives on `jobs` until its None sentinel, so it can run
+    while the HTTP pass is still producing leftovers. Runs in a fresh context on the
+    already-running browser, with up to DESC_FETCH_CONCURRENCY pages that are reused
+    across URLs. Returns how many pages it loaded.
+    """
+    ctx = await browser.new_context()
+    await ctx.route("**/*", _skip_heavy_resources)
+    handed = [first]  # Picked up by the first worker before it reads the queue
+    loaded = 0
+
+    async def worker():
+        nonlocal loaded
+        page = None
+        try:
+            while True:
+                job = handed.pop() if handed else await jobs.get()
+                if job is None:
+                    break
+                loaded += 1
+                # Opened on first use; a crashed tab is swapped for a fresh one
+                if page is None or page.is_closed():
+                    page = await ctx.new_page()
                 try:
                     await page.goto(job.apply_url, timeout=40000, wait_until="domcontentloaded")
-                    content = await page.evaluate("document.body.innerText")
-                    clean = " ".join(content.split())
-                    if len(clean) > 200: job.description = clean
-                except: pass
-                finally: await page.close()
-
-        await asyncio.gather(*[fetch_desc(j) for j in jobs_needing_scrape])
-        await browser2.close()
-        await p2.stop()
+                    # Whitespace collapse + cap happen in the page to keep the CDP payload small
+                    content = await page.evaluate(
+                        "(document.body.innerText || '').replace(/\\s+/g, ' ').trim().slice(0, 50000)"
+                    )
+                    if len(content) > 200: job.set_description(content)
+                except Exception: pass
+        finally:
+            # Leave the sentinel for the other workers
+            jobs.put_nowait(None)
+
+    try:
+        await asyncio.gather(*[worker() for _ in range(DESC_FETCH_CONCURRENCY)])
+    finally:
+        await ctx.close()
+    return loaded
+
+
+async def _launch_browser(headless: bool):
+    """Starts Playwright + Chromium; returns (playwright, browser) for the caller to close."""
+    p = await async_playwright().start()
+    try:
+        args = [] if headless else ["--disable-blink-features=AutomationControlled"]
+        return p, await p.chromium.launch(headless=headless, args=args)
+    except Exception:
+        await p.stop()
+        raise
+
+
+async def fetch_jobs_via_browser(strategy_urls: List[str], debug: bool = False) -> List[JobRecord]:
+    """
+    Harvests every strategy, straight from the search API when a request template
+    was cached by an earlier run, otherwise through the browser.
+    Deduplicates jobs across strategies using ID.
+    """
+    if not strategy_urls:
+        return []
+
+    per_strategy = None
+    template = _load_search_template()
+    if template:
+        per_strategy = await _fetch_strategies_via_api(strategy_urls, template, debug=debug)
+
+    # One Playwright/Chromium for the whole harvest: launched for the search only
+    # when the API path is unavailable, and reused (or warm-started) for the description backfill.
+    p = browser = None
+    try:
+        if per_strategy is None:
+            p, browser = await _launch_browser(headless=False)
+            per_strategy = await _fetch_strategies_via_browser(browser, strategy_urls, debug=debug)
+
+        # Store unique jobs keyed by ID to prevent dupes across strategies (DEDUPLICATION POINT).
+        # Reposts under a new ID are caught by company + title or by the canonical apply URL,
+        # before any description is scraped or any LLM call is spent on them.
+        unique_jobs_map: Dict[str, JobRecord] = {}
+        seen_pairs: set = set()
+        seen_urls: set = set()
+        reposts = 0
+        for jobs_found_in_strategy in per_strategy:
+            for j in jobs_found_in_strategy:
+                dedup_key = j.job_id or f"{j.company}|{j.title}"
+                if dedup_key in unique_jobs_map:
+                    continue
+                pair = (j.company.lower().strip(), j.title.lower().strip())
+                url = _canonical_url(j.apply_url) if j.apply_url else None
+                if pair in seen_pairs or (url and url in seen_urls):
+                    reposts += 1
+                    continue
+                seen_pairs.add(pair)
+                if url:
+                    seen_urls.add(url)
+                unique_jobs_map[dedup_key] = j
+
+        all_jobs = list(unique_jobs_map.values())
+        print(f"[Hiring] Total UNIQUE jobs across all strategies: {len(all_jobs)}")
+        if reposts:
+            print(f"[Hiring] Dropped {reposts} repost(s) of the same company + title or apply URL.")
+
+        # Post-process descriptions if needed; pages scraped by an earlier run come from disk.
+        # Judged on the tag-stripped text: markup-padded stubs still count as short,
+        # and short-but-clean API descriptions are not inflated by their tags.
+        jobs_needing_scrape = [j for j in all_jobs if j.apply_url and len(j.clean_description) < 200]
+        cached = desc_cache.get_many(j.apply_url for j in jobs_needing_scrape)
+        if cached:
+            print(f"[Hiring] {len(cached)} description(s) reused from the cache.")
+            for j in jobs_needing_scrape:
+                if j.apply_url in cached:
+                    j.set_description(cached[j.apply_url])
+            jobs_needing_scrape = [j for j in jobs_needing_scrape if j.apply_url not in cached]
+        to_scrape = jobs_needing_scrape
+
+        if jobs_needing_scrape:
+            print(f"[Hiring] Fetching full descriptions for {len(jobs_needing_scrape)} jobs...")
+            # Pages the HTTP pass gives up on go to the browser as they fail, so both
+            # passes overlap instead of the browser waiting for the slowest HTTP fetch
+            leftovers: asyncio.Queue = asyncio.Queue()
+            http_pass = asyncio.create_task(_fetch_descriptions_http(jobs_needing_scrape, leftovers))
+            # Warm start: a big enough batch almost always has JS-rendered pages, so Chromium
+            # boots (headless is fine for text) while the HTTP pass runs instead of after it
+            launch = None
+            if browser is None and len(jobs_needing_scrape) >= WARM_BROWSER_MIN_JOBS:
+                launch = asyncio.create_task(_launch_browser(headless=True))
+            try:
+                first = await leftovers.get()
+                if first is not None:
+                    print("[Hiring] JS-rendered pages found; browser pass running alongside the HTTP pass...")
+                    if launch is not None:
+                        p, browser = await launch
+                    elif browser is None:
+                        p, browser = await _launch_browser(headless=True)
+                    loaded = await _backfill_descriptions(browser, first, leftovers)
+                    print(f"[Hiring] {loaded} JS-rendered page(s) loaded in the browser.")
+            finally:
+                await http_pass
+                if launch is not None and browser is None:
+                    # Warmed up for nothing; still collected so it gets closed below
+                    try:
+                        p, browser = await launch
+                    except Exception:
+                        pass
+
+        desc_cache.put_many([(j.apply_url, j.description) for j in to_scrape if len(j.clean_description) > 200])
+    finally:
+        if browser is not None:
+            await browser.close()
+        if p is not None:
+            await p.stop()
 
     return all_jobs
@@ -1,7 +1,13 @@
 import gspread
-import time
 from datetime import datetime
+from typing import List
 from hob_junter.core.scraper import JobRecord
+from hob_junter.utils.helpers import with_retries
+
+SHEET_HEADER = ["Date", "Company", "Role", "Score", "Link", "Status", "Reason", "Notes"]
+
+# Rows staged during the run, written in one append by flush_rows()
+_pending_rows: List[list] = []
 
 def get_gspread_client(creds_path: str):
     try:
@@ -10,34 +16,60 @@ def get_gspread_client(creds_path: str):
         print(f"[Sheets] Auth Error: {exc}")
         return None
 
-def log_job_to_sheet(client, spreadsheet_id: str, job: JobRecord, score: int, reason: str):
-    if not client or not spreadsheet_id:
-        return
+def stage_job_row(job: JobRecord, score: int, reason: str):
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
 
+    # Status defaults to "New"
+    _pending_rows.append([
+        timestamp,
+        job.company,
+        job.title,
+        score,
+        job.apply_url,
+        "New",          # Status
+        reason[:100],   # Short reason
+        ""              # Notes (empty)
+    ])
+
+def open_sheet(client, spreadsheet_id: str):
+    """
+    Opens the first worksheet once per run and writes the header row if the sheet
+    is blank, so flushes need no lookups of their own. Returns None on failure.
+    """
+    if not client or not spreadsheet_id:
+        return None
     try:
         sheet = client.open_by_key(spreadsheet_id).sheet1
-        
-        # Check if headers exist (lazy check)
         if not sheet.get_values("A1:A1"):
-            sheet.append_row(["Date", "Company", "Role", "Score", "Link", "Status", "Reason", "Notes"])
-
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-        
-        # Status defaults to "New"
-        row = [
-            timestamp,
-            job.company,
-            job.title,
-            score,
-            job.apply_url,
-            "New",          # Status
-            reason[:100],   # Short reason
-            ""              # Notes (empty)
-        ]
-        
-        sheet.append_row(row)
-        # Avoid hitting API limits
-        time.sleep(1) 
-        
+            with_retries(lambda: sheet.append_row(SHEET_HEADER, value_input_option="USER_ENTERED"))
+        return sheet
+    except Exception as exc:
+        print(f"[Sheets] Open Error: {exc}")
+        return None
+
+def flush_rows(sheet) -> int:
+    """
+    Appends every staged row to `sheet` (from open_sheet) in a single values.append
+    request. Returns how many rows were written; on failure the rows stay staged for
+    the next flush.
+    """
+    if not sheet or not _pending_rows:
+        return 0
+
+    rows = list(_pending_rows)
+    try:
+        # Rate limits are handled by retrying the single batch, not by sleeping per row
+        with_retries(lambda: sheet.append_rows(rows, value_input_option="USER_ENTERED"))
+        del _pending_rows[: len(rows)]
+        return len(rows)
+
     except Exception as exc:
-        print(f"[Sheets] Write Error: {exc}")
\ No newline at end of file
+        print(f"[Sheets] Write Error: {exc}")
+        return 0
+
+def log_job_to_sheet(client, spreadsheet_id: str, job: JobRecord, score: int, reason: str):
+    """Single-row write; prefer open_sheet + stage_job_row + flush_rows for a whole run."""
+    if not client or not spreadsheet_id:
+        return
+    stage_job_row(job, score, reason)
+    flush_rows(open_sheet(client, spreadsheet_id))
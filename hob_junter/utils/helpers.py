@@ -1,7 +1,15 @@
-import json
+import asyncio
+import functools
+import hashlib
+import mmap
+import os
 import sys
+import threading
 import time
-from typing import Any
+from typing import Any, Dict, Tuple
+
+import orjson
+import tiktoken
 
 
 def print_phase_header(phase_num: int, title: str):
@@ -23,6 +31,54 @@ def with_retries(fn, attempts: int = 3, base_delay: float = 1.0):
             time.sleep(delay)
 
 
+async def awith_retries(fn, attempts: int = 3, base_delay: float = 1.0):
+    """with_retries for coroutines: fn is a zero-arg callable returning an awaitable."""
+    for i in range(attempts):
+        try:
+            return await fn()
+        except Exception as exc:  # noqa: BLE001
+            if i == attempts - 1:
+                raise
+            delay = base_delay * (2**i)
+            print(f"[Retry] {i + 1}/{attempts} failed: {exc}. {delay:.1f}s...")
+            await asyncio.sleep(delay)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by the sync wrappers (worker threads) and the
+    async ones (event loop). Callers reserve a token under the lock and sleep outside
+    it, so waiting never blocks other callers. rate <= 0 disables throttling.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, n: int) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= n
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self, n: int = 1):
+        if self.rate > 0:
+            wait = self._reserve(n)
+            if wait:
+                time.sleep(wait)
+
+    async def acquire_async(self, n: int = 1):
+        if self.rate > 0:
+            wait = self._reserve(n)
+            if wait:
+                await asyncio.sleep(wait)
+
+
 def debug_print(msg: str, enabled: bool = False):
     if enabled:
         print(f"[DEBUG] {msg}")
@@ -30,28 +86,107 @@ def debug_print(msg: str, enabled: bool = False):
 
 
 def safe_json_loads(raw: str) -> Any:
-    import json
-
     try:
-        return json.loads(raw)
+        return orjson.loads(raw)
     except Exception:  # noqa: BLE001
         return {}
 
 
-def load_cv_profile_from_json(path: str) -> str:
-    with open(path, "r") as f:
+@functools.lru_cache(maxsize=None)
+def _token_encoding(model: str):
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+@functools.lru_cache(maxsize=16)
+def truncate_tokens(text: str, max_tokens: int, model: str) -> str:
+    """
+    Trims text to at most max_tokens tokens of the model's tokenizer. Cached, so the
+    CV that goes into every scoring prompt is only encoded once per run.
+    """
+    if len(text) <= max_tokens:  # every token is at least one character
+        return text
+    enc = _token_encoding(model)
+    ids = enc.encode(text, disallowed_special=())
+    if len(ids) <= max_tokens:
+        return text
+    return enc.decode(ids[:max_tokens])
+
+
+def file_content_hash(path: str) -> str:
+    """
+    Short blake2b digest of a file's bytes, used to key derived caches. Hashed
+    straight from a read-only mmap, so a large PDF is never copied into memory.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:  # mmap refuses empty files
+            return hashlib.blake2b(b"", digest_size=16).hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return hashlib.blake2b(mm, digest_size=16).hexdigest()
+
+
+def hashed_cache_path(path: str, digest: str) -> str:
+    """cv_profile.json + digest -> cv_profile_<digest>.json"""
+    root, ext = os.path.splitext(path)
+    return f"{root}_{digest}{ext}"
+
+
+def checkpoint_key(job, context: str = "") -> str:
+    # Same identity the scraper dedups on: job_id, or company|title for id-less jobs.
+    # Prefixed with a digest of what shaped the score (CV, prompts, backend), so a run
+    # resumed after either changed never replays the old scores.
+    return f"{context}:{job.job_id or f'{job.company}|{job.title}'}"
+
+
+def load_checkpoint(path: str) -> Dict[str, Tuple[int, str]]:
+    """
+    Reads the scoring checkpoint (one JSON line per scored job) left behind by an
+    interrupted run. A torn last line from a crash is skipped.
+    """
+    done: Dict[str, Tuple[int, str]] = {}
+    try:
+        with open(path, "rb") as f:
+            for line in f:
+                try:
+                    entry = orjson.loads(line)
+                    done[entry["key"]] = (int(entry["score"]), str(entry["reason"]))
+                except Exception:  # noqa: BLE001
+                    continue
+    except FileNotFoundError:
+        pass
+    return done
+
+
+def load_cv_profile(path: str) -> Tuple[Dict[str, Any], str]:
+    """Parses a CV profile file once: (profile dict, compact JSON string for prompts)."""
+    with open(path, "rb") as f:
         data = f.read()
     try:
-        parsed = json.loads(data)
-        return json.dumps(parsed)
+        profile = orjson.loads(data)
     except Exception as exc:  # noqa: BLE001
         raise ValueError("CV JSON file is invalid JSON") from exc
+    return profile, orjson.dumps(profile).decode()
+
+
+def load_cv_profile_from_json(path: str) -> str:
+    return load_cv_profile(path)[1]
 
 
 def save_cv_profile_to_file(profile_json: str, path: str):
     try:
-        with open(path, "w") as f:
-            f.write(profile_json)
+        # UTF-8 bytes, exactly what load_cv_profile's binary orjson read expects
+        with open(path, "wb") as f:
+            f.write(profile_json.encode("utf-8"))
         print(f"[CV] Cached profile to {path}")
     except Exception as exc:  # noqa: BLE001
         print(f"[CV] Warning: failed to cache profile to {path}: {exc}")
+
+
+def save_cv_text_to_file(cv_text: str, path: str):
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(cv_text)
+    except Exception as exc:  # noqa: BLE001
+        print(f"[CV] Warning: failed to cache CV text to {path}: {exc}")
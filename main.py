@@ -1,54 +1,78 @@
 import asyncio
-import json
+import mmap
 import os
 import sys
 import time
 from datetime import datetime
+from itertools import chain
 from typing import List, Dict
 
+import orjson
+import uvloop
+
 from hob_junter.config.settings import (
+    CHECKPOINT_FILE,
     DEFAULT_CV_TEXT_PATH, 
     LOCAL_LLM_URL, 
+    NEAR_DUP_MIN_SIMILARITY,
+    PROGRESS_HZ,
+    RED_TEAM_CONCURRENCY,
+    RED_TEAM_REUSE_MIN_SIMILARITY,
     load_env_settings, 
     load_run_settings,
     TARGET_DEPARTMENTS
 )
 from hob_junter.core.analyzer import (
-    build_cv_profile,
+    abuild_cv_profile,
     consult_career_advisor_gpt,
     extract_text_from_cv_pdf_with_gpt,
     red_team_analysis,
-    score_job_match,
+    ascore_jobs,
+    batch_score_jobs,
+)
+from hob_junter.core.database import get_db_connection, get_processed_keys, mark_jobs_as_processed
+from hob_junter.core import desc_cache, llm_cache, near_dup
+from hob_junter.core.llm_engine import aclose_async_http, create_async_openai_client, create_openai_client
+from hob_junter.core.prefilter import prefilter_jobs
+from hob_junter.core.reporter import (
+    HTMLReportWriter,
+    export_jobs_html,
+    send_telegram_message_async,
+    summarize_jobs,
 )
-from hob_junter.core.database import get_db_connection, is_job_processed, mark_job_as_processed
-from hob_junter.core.llm_engine import create_openai_client
-from hob_junter.core.reporter import export_jobs_html, send_telegram_message, summarize_jobs
 from hob_junter.core.scraper import (
     construct_search_url,
     fetch_jobs_via_browser,
 )
-from hob_junter.core.sheets import get_gspread_client, log_job_to_sheet 
+from hob_junter.core.sheets import flush_rows, get_gspread_client, open_sheet, stage_job_row
 from hob_junter.utils.helpers import (
-    load_cv_profile_from_json,
+    checkpoint_key,
+    file_content_hash,
+    hashed_cache_path,
+    load_checkpoint,
+    load_cv_profile,
     print_phase_header,
     save_cv_profile_to_file,
+    save_cv_text_to_file,
 )
 
 
 def load_strategies(path: str) -> List[Dict]:
-    if not os.path.exists(path):
-        return []
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        # Parsed straight from a read-only mmap: no bytes copy of the file, however many strategies pile up
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+    except FileNotFoundError:
+        return []
     except Exception as e:
         print(f"[Error] Failed to load strategies: {e}")
         return []
 
 
 def save_strategies(path: str, strategies: List[Dict]):
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(strategies, f, indent=2)
+    with open(path, "wb") as f:
+        f.write(orjson.dumps(strategies, option=orjson.OPT_INDENT_2))
     print(f"[Config] Saved {len(strategies)} strategies to {path}")
 
 
@@ -56,7 +80,7 @@ def interactive_setup_wizard(cv_profile_data: Dict, client, run_settings) -> Lis
     print_phase_header(2, "STRATEGIC SETUP (AI ARCHITECT)")
     
     print("[Advisor] Analyzing CV against Hiring.Cafe taxonomy...")
-    cv_text_summary = json.dumps(cv_profile_data, indent=2)
+    cv_text_summary = orjson.dumps(cv_profile_data, option=orjson.OPT_INDENT_2).decode()
     
     # Calls the new STRATEGY_PROMPT which returns "strategies" list
     advisor_response = consult_career_advisor_gpt(client, cv_text_summary)
@@ -117,14 +141,33 @@ async def run_pipeline():
 
     # Sheets Init
     sheets_client = None
+    sheet_task = None
     if run_settings.spreadsheet_id and os.path.exists(run_settings.google_creds_path):
         sheets_client = get_gspread_client(run_settings.google_creds_path)
         if sheets_client:
             print(f"[Init] Connected to Google Sheets.")
+            # Worksheet open + header check run in the background while the CV and jobs load
+            sheet_task = asyncio.create_task(
+                asyncio.to_thread(open_sheet, sheets_client, run_settings.spreadsheet_id)
+            )
     else:
         print("[Init] Google Sheets disabled (missing ID or creds file).")
 
+    # Reruns reuse identical LLM responses and scraped descriptions; --no-cache forces fresh ones
+    # Both caches live next to the jobs DB
+    cache_dir = os.path.dirname(run_settings.db_path)
+    llm_cache.configure(
+        enabled="--no-cache" not in sys.argv, path=os.path.join(cache_dir, llm_cache.DEFAULT_CACHE_PATH)
+    )
+    desc_cache.configure(
+        enabled="--no-cache" not in sys.argv, path=os.path.join(cache_dir, desc_cache.DEFAULT_CACHE_PATH)
+    )
+    near_dup.configure(
+        enabled="--no-cache" not in sys.argv, path=os.path.join(cache_dir, near_dup.DEFAULT_CACHE_PATH)
+    )
+
     client = create_openai_client(env_settings.openai_api_key)
+    aclient = create_async_openai_client(env_settings.openai_api_key)
     debug = run_settings.debug
 
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -135,40 +178,39 @@ async def run_pipeline():
     cv_text_raw = ""
 
     if run_settings.cv_path.lower().endswith(".json"):
-        cv_profile_json = load_cv_profile_from_json(run_settings.cv_path)
+        # Parsed once here; the dict and the compact string are both kept for the run
+        cv_profile_data, cv_profile_json = load_cv_profile(run_settings.cv_path)
         cv_text_raw = cv_profile_json
     else:
-        # Cache logic same as before...
+        # Cache is keyed by CV content, so touching/copying the PDF keeps it valid
+        cv_hash = file_content_hash(run_settings.cv_path)
+        cv_profile_path = hashed_cache_path(run_settings.cv_profile_path, cv_hash)
+        cv_text_path = hashed_cache_path(DEFAULT_CV_TEXT_PATH, cv_hash)
+        # Opening the cache files is the existence check: no separate stat() calls,
+        # and no window between checking for a file and reading it
         use_cache = False
-        cv_text_path = DEFAULT_CV_TEXT_PATH
-
-        if os.path.exists(run_settings.cv_profile_path) and os.path.exists(cv_text_path):
-            try:
-                if (
-                    os.path.getmtime(run_settings.cv_profile_path) > os.path.getmtime(run_settings.cv_path)
-                    and os.path.getmtime(cv_text_path) > os.path.getmtime(run_settings.cv_path)
-                ):
-                    use_cache = True
-            except OSError:
-                pass
+        try:
+            with open(cv_text_path, "r", encoding="utf-8") as f:
+                cv_text_raw = f.read()
+            cv_profile_data, cv_profile_json = load_cv_profile(cv_profile_path)
+            use_cache = True
+        except FileNotFoundError:
+            cv_text_raw = ""
 
         if use_cache:
             print(f"[CV] Using cached profile & text...")
-            cv_profile_json = load_cv_profile_from_json(run_settings.cv_profile_path)
-            try:
-                with open(cv_text_path, "r", encoding="utf-8") as f:
-                    cv_text_raw = f.read()
-            except Exception:
-                pass
         else:
             print("[CV] Extracting text from PDF (Fresh Run)...")
-            cv_text_raw = extract_text_from_cv_pdf_with_gpt(client, run_settings.cv_path, run_settings.ocr_prompt)
-            with open(cv_text_path, "w", encoding="utf-8") as f: f.write(cv_text_raw)
+            cv_text_raw = await asyncio.to_thread(
+                extract_text_from_cv_pdf_with_gpt, client, run_settings.cv_path, run_settings.ocr_prompt
+            )
             print("[CV] Building profile...")
-            cv_profile_json = build_cv_profile(client, cv_text_raw, run_settings.profile_prompt)
-            save_cv_profile_to_file(cv_profile_json, run_settings.cv_profile_path)
-
-    cv_profile_data = json.loads(cv_profile_json)
+            # The profile only needs the text in memory, so caching it to disk overlaps the LLM calls
+            _, (cv_profile_data, cv_profile_json) = await asyncio.gather(
+                asyncio.to_thread(save_cv_text_to_file, cv_text_raw, cv_text_path),
+                abuild_cv_profile(aclient, cv_text_raw, run_settings.profile_prompt),
+            )
+            save_cv_profile_to_file(cv_profile_json, cv_profile_path)
 
     # Phase 2 - Strategy Loading / Setup
     strategies = load_strategies(run_settings.strategies_path)
@@ -205,6 +247,12 @@ async def run_pipeline():
         print(f"     URL:   {url[:60]}...")
         target_urls.append(url)
 
+    # Strategies with the same roles/departments/exclusions build the same URL; scrape it once
+    unique_urls = list(dict.fromkeys(target_urls))
+    if len(unique_urls) < len(target_urls):
+        print(f" [=] {len(target_urls) - len(unique_urls)} strategy URL(s) duplicate another strategy; scraping each once.")
+    target_urls = unique_urls
+
     # Phase 3 - Scrape
     print_phase_header(3, "DEPLOYING SCRAPERS (MULTI-STRATEGY)")
     
@@ -222,12 +270,17 @@ async def run_pipeline():
     print(f"[Pipeline] Syncing {len(valid_jobs)} jobs with Database...")
     new_jobs = []
     known_count = 0
-    
-    for job in valid_jobs:
-        if is_job_processed(db_conn, job):
+
+    # Chunked IN queries over just this feed's ids/pairs, then set lookups; also drops repeats within this run
+    feed_pairs = [(job.company.lower().strip(), job.title.lower().strip()) for job in valid_jobs]
+    seen_ids, seen_pairs = get_processed_keys(db_conn, [job.job_id for job in valid_jobs], feed_pairs)
+    for job, pair in zip(valid_jobs, feed_pairs):
+        if (job.job_id and job.job_id in seen_ids) or pair in seen_pairs:
             known_count += 1
-        else:
-            new_jobs.append(job)
+            continue
+        seen_ids.add(job.job_id)
+        seen_pairs.add(pair)
+        new_jobs.append(job)
             
     print(f"\n   [+] FEED:      {len(valid_jobs)} jobs found online.")
     print(f"   [-] KNOWN:     {known_count} jobs skipped.")
@@ -244,57 +297,250 @@ async def run_pipeline():
     # Reuse strategy data structure for reporting
     strategy_report_data = {
         "advisor_response": {"archetype": "Multi-Strategy Execution"},
-        "final_roles": [r for s in strategies for r in s["roles"]], # Aggregate for display
-        "exclusions": [e for s in strategies for e in s["exclusions"]]
+        # Aggregated once for display; terms shared by several strategies are listed once
+        "final_roles": list(dict.fromkeys(chain.from_iterable(s["roles"] for s in strategies))),
+        "exclusions": list(dict.fromkeys(chain.from_iterable(s["exclusions"] for s in strategies))),
     }
 
     print(f"[Pipeline] Processing {len(new_jobs)} new candidates...\n")
     
-    for i, job in enumerate(new_jobs):
-        sys.stdout.write(f"\r\033[K    Processing {i+1}/{len(new_jobs)}: {job.company[:20]}")
-        sys.stdout.flush()
-
-        score, reason = score_job_match(
-            client=client,
-            cv_profile_json=cv_profile_json,
+    batch_size = max(1, run_settings.score_batch_size)
+
+    # Red team runs in background workers so high matches don't stall scoring.
+    # Workers write their result back into `scored` at the queued position.
+    red_team_queue: asyncio.Queue = asyncio.Queue()
+    # Near-duplicate reposts by the same company share one analysis: keyed by
+    # (near-dup representative, company), so later copies await the first one's run
+    dup_of = {}
+    red_team_runs = {}
+
+    async def red_team_cached(job):
+        # Across runs, a near-identical posting by the same company under the same CV
+        # reuses the stored analysis; analyses are kept in the near-dup cache as JSON
+        context = llm_cache.make_key(
+            kind="red_team", cv=cv_text_raw, mode=run_settings.red_team_mode, company=job.company.lower().strip()
+        )
+        sig = near_dup.signature(job.clean_description)
+        try:
+            hit = await asyncio.to_thread(near_dup.lookup, context, sig, RED_TEAM_REUSE_MIN_SIMILARITY)
+        except Exception as e:  # noqa: BLE001
+            print(f"\n   [Red Team] Cache lookup failed, running a fresh analysis: {e}")
+            hit = None
+        if hit:
+            print(f"\n   [Red Team] Reusing the analysis of a near-identical posting ({hit[2]:.0%}): {job.title}")
+            return orjson.loads(hit[1])
+        red_team_data = await asyncio.to_thread(
+            red_team_analysis,
+            cv_full_text=cv_text_raw,
             job=job,
-            score_prompt=run_settings.score_prompt,
-            scoring_mode=run_settings.scoring_mode,
+            mode=run_settings.red_team_mode,
             local_llm_url=LOCAL_LLM_URL,
+            client=client,
         )
+        if red_team_data and "error" not in red_team_data:
+            await asyncio.to_thread(near_dup.put, context, sig, 0, orjson.dumps(red_team_data).decode())
+        return red_team_data
 
-        red_team_data = {}
-        if score >= run_settings.threshold and cv_text_raw:
-            sys.stdout.write(f"\n   HIGH MATCH ({score}): {job.title}\n")
-            red_team_data = red_team_analysis(
-                cv_full_text=cv_text_raw, 
-                job=job, 
-                mode=run_settings.red_team_mode, 
-                local_llm_url=LOCAL_LLM_URL,
-                client=client
+    async def red_team_worker():
+        while True:
+            pos, idx, job = await red_team_queue.get()
+            try:
+                key = (dup_of.get(idx, idx), job.company.lower().strip())
+                run = red_team_runs.get(key)
+                if run is None:
+                    run = red_team_runs[key] = asyncio.ensure_future(red_team_cached(job))
+                try:
+                    red_team_data = await run
+                except Exception as e:  # noqa: BLE001
+                    # The run is shared: every job awaiting it lands here, and none may kill its worker
+                    print(f"\n   [Red Team] Analysis failed for {job.title}: {e}")
+                    red_team_data = {}
+                scored[pos] = scored[pos][:3] + (red_team_data,)
+            finally:
+                red_team_queue.task_done()
+
+    red_team_workers = [asyncio.create_task(red_team_worker()) for _ in range(RED_TEAM_CONCURRENCY)]
+
+    use_batch_api = run_settings.scoring_mode == "openai_batch" and "--interactive" not in sys.argv
+    realtime_mode = "openai" if run_settings.scoring_mode == "openai_batch" else run_settings.scoring_mode
+
+    async def realtime_scores(indices):
+        # Up to score_concurrency (inputs.json, default 8) requests in flight; results arrive out of order
+        async for k, score, reason in ascore_jobs(
+            aclient,
+            cv_profile_json,
+            [new_jobs[i] for i in indices],
+            batch_size=batch_size,
+            concurrency=max(1, run_settings.score_concurrency),
+            score_prompt=run_settings.score_prompt,
+            score_batch_prompt=run_settings.score_batch_prompt,
+            scoring_mode=realtime_mode,
+            local_llm_url=LOCAL_LLM_URL,
+        ):
+            yield indices[k], score, reason
+
+    # Scores from a run that died before its DB commit are replayed instead of re-asking the
+    # LLM, but only under the same CV, score prompts and backend (part of every checkpoint key)
+    checkpoint = load_checkpoint(CHECKPOINT_FILE)
+    checkpoint_context = llm_cache.make_key(
+        cv=cv_profile_json,
+        prompt=run_settings.score_prompt,
+        batch_prompt=run_settings.score_batch_prompt,
+        mode=run_settings.scoring_mode,
+    )
+    # Near-duplicate scores are only reused under the same CV, prompts and scoring backend
+    near_dup_context = llm_cache.make_key(
+        cv=cv_profile_json,
+        prompt=run_settings.score_prompt,
+        batch_prompt=run_settings.score_batch_prompt,
+        mode=realtime_mode,
+    )
+    near_dup_new = []  # (signature, score, reason) of fresh LLM scores, stored in one transaction at the end
+    # Pre-filter rejects are never stored as processed (DB or checkpoint), so a later
+    # run with a different cutoff or tokenizer still gets to score them
+    prefiltered = set()
+
+    async def all_scores():
+        resumed = {}
+        for i, job in enumerate(new_jobs):
+            key = checkpoint_key(job, checkpoint_context)
+            if key in checkpoint:
+                resumed[i] = checkpoint[key]
+        if resumed:
+            print(f"[Checkpoint] Reusing {len(resumed)} score(s) from an interrupted run.")
+        for i, (score, reason) in resumed.items():
+            yield i, score, reason
+
+        todo = [i for i in range(len(new_jobs)) if i not in resumed]
+
+        # Obvious no-matches are scored 0 locally and never reach the LLM
+        rejected = {
+            todo[k]: sim
+            for k, sim in prefilter_jobs(cv_profile_json, [new_jobs[i] for i in todo], run_settings.prefilter_min_similarity).items()
+        }
+        if rejected:
+            print(f"[Prefilter] {len(rejected)} job(s) below relevance cutoff; skipping the LLM for them.")
+        prefiltered.update(rejected)
+        for i, sim in rejected.items():
+            yield i, 0, f"Pre-filter: low relevance to CV (similarity {sim:.2f})"
+
+        pending = [i for i in todo if i not in rejected]
+
+        # Reposts of an already-scored template reuse that score: first against earlier
+        # runs, then within this run (only one job per near-duplicate group is sent out)
+        # Fingerprinted in one pass off the event loop, before any result is consumed
+        sigs = dict(zip(pending, await asyncio.to_thread(
+            near_dup.signatures, [new_jobs[i].clean_description for i in pending]
+        )))
+        dup_hits = near_dup.lookup_many(near_dup_context, sigs, NEAR_DUP_MIN_SIMILARITY)
+        if dup_hits:
+            print(f"[Near-dup] {len(dup_hits)} job(s) match an already-scored description; reusing those scores.")
+        for i, (score, reason, _) in dup_hits.items():
+            yield i, score, reason
+        pending = [i for i in pending if i not in dup_hits]
+
+        follower_of = near_dup.group_near_duplicates({i: sigs[i] for i in pending}, NEAR_DUP_MIN_SIMILARITY)
+        dup_of.update(follower_of)
+        followers = {}
+        for i, rep in follower_of.items():
+            followers.setdefault(rep, []).append(i)
+        if follower_of:
+            print(f"[Near-dup] {len(follower_of)} job(s) repeat another description in this feed; scoring each group once.")
+        pending = [i for i in pending if i not in follower_of]
+
+        async for i, score, reason in llm_scores(pending):
+            if not reason.startswith("Error:"):
+                near_dup_new.append((sigs[i], score, reason))
+            yield i, score, reason
+            for f in followers.get(i, ()):
+                yield f, score, reason
+
+    async def llm_scores(pending):
+        if use_batch_api and pending:
+            batch_scores = await asyncio.to_thread(
+                batch_score_jobs, client, cv_profile_json, [new_jobs[i] for i in pending], run_settings.score_prompt
             )
+            for i, r in zip(pending, batch_scores):
+                if r is not None:
+                    yield i, r[0], r[1]
+            pending = [i for i, r in zip(pending, batch_scores) if r is None]
+            if pending:
+                print(f"[Batch] {len(pending)} job(s) not returned by the batch; scoring them realtime.")
+        if pending:
+            async for item in realtime_scores(pending):
+                yield item
+
+    done = 0
+    processed = []  # (job, score), written to the DB in one transaction
+    live_report = HTMLReportWriter(report_filename, strategy_report_data)  # Appended per match, rewritten sorted at the end
+    start_time = time.monotonic()
+    last_draw = 0.0
+    ckpt = open(CHECKPOINT_FILE, "a", encoding="utf-8", buffering=1)
+    # Hot names bound once: cache/pre-filter hits make most iterations pure Python
+    total, threshold, draw_interval = len(new_jobs), run_settings.threshold, 1 / PROGRESS_HZ
+    monotonic, write, dumps = time.monotonic, sys.stdout.write, orjson.dumps
+    try:
+        async for idx, score, reason in all_scores():
+            job = new_jobs[idx]
+            done += 1
+            # Redrawn at most PROGRESS_HZ times/s, and always for the last result
+            now = monotonic()
+            if now - last_draw >= draw_interval or done == total:
+                last_draw = now
+                # ETA from the completion rate, since results arrive out of order
+                eta_secs = int((now - start_time) / done * (total - done))
+                write(f"\r\033[K    Processing {done}/{total} | ETA: {eta_secs // 60}m {eta_secs % 60}s | {job.company[:20]}")
+                sys.stdout.flush()
+
+            scored.append((job, score, reason, {}))
+            if score >= threshold and cv_text_raw:
+                write(f"\n   HIGH MATCH ({score}): {job.title}\n")
+                red_team_queue.put_nowait((len(scored) - 1, idx, job))
+
+            if idx not in prefiltered:
+                processed.append((job, score))
+                ckpt.write(dumps({"key": checkpoint_key(job, checkpoint_context), "score": score, "reason": reason}).decode() + "\n")
+
+            if score >= threshold:
+                live_report.add_match(job, score, reason)
+                if sheets_client:
+                    stage_job_row(job, score, reason)
+    finally:
+        live_report.close()
+        # Persist whatever was scored, even if the run is interrupted. The single Sheets
+        # append and the single DB / near-dup transactions run side by side in worker
+        # threads, so queued red team analyses keep going on the loop meanwhile.
+        ckpt.close()
+        sheet = await sheet_task if sheet_task else None
+        sheet_count, *_ = await asyncio.gather(
+            asyncio.to_thread(flush_rows, sheet),
+            asyncio.to_thread(near_dup.put_many, near_dup_context, near_dup_new),
+            asyncio.to_thread(mark_jobs_as_processed, db_conn, processed),
+        )
+        # Everything is in the DB now; only a failed commit leaves the checkpoint behind
+        os.remove(CHECKPOINT_FILE)
 
-        scored.append((job, score, reason, red_team_data))
-        mark_job_as_processed(db_conn, job, score)
-
-        if sheets_client and score >= run_settings.threshold:
-            log_job_to_sheet(sheets_client, run_settings.spreadsheet_id, job, score, reason)
-            sheet_count += 1
-
-        # Periodic save
-        if (i + 1) % 5 == 0:
-            good_matches_temp = [x for x in scored if x[1] >= run_settings.threshold]
-            if good_matches_temp:
-                export_jobs_html(good_matches_temp, strategy_report_data, report_filename)
+    if red_team_queue.qsize():
+        print(f"\n\n[Pipeline] Waiting for {red_team_queue.qsize()} red team analyses...")
+    await red_team_queue.join()
+    for worker in red_team_workers:
+        worker.cancel()
+    await aclose_async_http()
 
     print("\n\n[Pipeline] Scoring complete.")
+    stats = llm_cache.cache_stats()
+    if stats["enabled"]:
+        print(f"[Pipeline] LLM cache: {stats['hits']} hits, {stats['misses']} misses.")
+    stats = near_dup.cache_stats()
+    if stats["enabled"] and stats["hits"] + stats["misses"]:
+        print(f"[Pipeline] Near-dup cache: {stats['hits']} hits, {stats['misses']} misses.")
     db_conn.close()
 
     good_matches = [x for x in scored if x[1] >= run_settings.threshold]
 
     if good_matches:
         export_jobs_html(good_matches, strategy_report_data, report_filename)
-        send_telegram_message(
+        await send_telegram_message_async(
             summarize_jobs(good_matches),
             bot_token=env_settings.telegram_bot_token,
             chat_id=env_settings.telegram_chat_id,
@@ -307,4 +553,5 @@ async def run_pipeline():
 
 
 if __name__ == "__main__":
-    asyncio.run(run_pipeline())
\ No newline at end of file
+    # libuv event loop: cheaper scheduling for the thousands of overlapping fetches and LLM calls
+    uvloop.run(run_pipeline())
\ No newline at end of file
@@ -18,7 +18,12 @@ pip install \
   google-auth \
   google-auth-oauthlib \
   google-api-python-client \
-  openai >/dev/null
+  httpx \
+  ijson \
+  openai \
+  orjson \
+  tiktoken \
+  uvloop >/dev/null
 
 echo "Base dependencies installed. If browsers are missing, run: python -m playwright install"
 echo "To use the venv in this shell, run: source $VENV_DIR/bin/activate"
@@ -0,0 +1,66 @@
+import os
+import tempfile
+import unittest
+
+from hob_junter.config.settings import RED_TEAM_REUSE_MIN_SIMILARITY
+from hob_junter.core import llm_cache, near_dup
+
+STACK = "Python Django PostgreSQL Docker"
+
+# Two unrelated Bulgarian postings that only share the tech stack
+BACKEND_POSTING = (
+    "Търсим опитен бекенд разработчик, който да се присъедини към екипа ни в София. "
+    "Ще отговаряш за проектирането и поддръжката на платежната ни платформа, ще пишеш "
+    "чист и добре тестван код и ще участваш в архитектурни решения заедно с продуктовия екип. "
+    f"Изисквания: {STACK}. Предлагаме гъвкаво работно време, допълнително здравно осигуряване, "
+    "карта за спорт и бюджет за обучения и конференции всяка година."
+)
+DATA_POSTING = (
+    "Растяща компания за логистика в Пловдив набира инженер по данни за нов проект. "
+    "Основната задача е изграждането на потоци от данни между складовете и системата за "
+    "планиране на маршрути, както и подготовката на отчети за ръководството всеки месец. "
+    f"Технологии: {STACK}. Осигуряваме обучение на място, служебен автомобил, ваучери за храна "
+    "и възможност за работа от вкъщи два дни в седмицата."
+)
+
+
+class SignatureTest(unittest.TestCase):
+    def test_different_cyrillic_postings_are_not_near_duplicates(self):
+        a, b = near_dup.signature(BACKEND_POSTING), near_dup.signature(DATA_POSTING)
+        self.assertIsNotNone(a)
+        self.assertIsNotNone(b)
+        self.assertLess(near_dup.similarity(a, b), 0.5)
+        self.assertEqual(near_dup.group_near_duplicates({0: a, 1: b}, 0.9), {})
+
+    def test_cyrillic_repost_is_a_near_duplicate(self):
+        a = near_dup.signature(BACKEND_POSTING)
+        b = near_dup.signature(BACKEND_POSTING + " Кандидатствай сега!")
+        self.assertEqual(near_dup.group_near_duplicates({0: a, 1: b}, 0.9), {1: 0})
+
+    def test_short_text_has_no_signature(self):
+        self.assertIsNone(near_dup.signature(f"Бекенд разработчик. {STACK}. София."))
+
+
+class CacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        near_dup.configure(path=os.path.join(self.tmp.name, near_dup.DEFAULT_CACHE_PATH))
+
+    def tearDown(self):
+        near_dup.configure(enabled=False)
+        self.tmp.cleanup()
+
+    def test_lookup_returns_cached_answer_for_repost(self):
+        near_dup.put("ctx", near_dup.signature(BACKEND_POSTING), 80, "fits")
+        hit = near_dup.lookup("ctx", near_dup.signature(BACKEND_POSTING + " Кандидатствай сега!"), 0.9)
+        self.assertEqual(hit[:2], (80, "fits"))
+
+    def test_red_team_analysis_is_not_reused_for_a_different_posting(self):
+        # Same context as main.red_team_cached: one company, one CV
+        context = llm_cache.make_key(kind="red_team", cv="cv", mode="openai", company="acme")
+        near_dup.put(context, near_dup.signature(BACKEND_POSTING), 0, '{"verdict": "apply"}')
+        self.assertIsNone(near_dup.lookup(context, near_dup.signature(DATA_POSTING), RED_TEAM_REUSE_MIN_SIMILARITY))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,16 +3,25 @@ import os
 import sys
 import time
 
+# Each banner/section goes out as one print() (one terminal write) rather than one per line
+
 def print_header(text):
-    print(f"\n\033[1;36m{'='*60}")
-    print(f" {text}")
-    print(f"{'='*60}\033[0m")
+    print(f"\n\033[1;36m{'='*60}\n {text}\n{'='*60}\033[0m")
+
+def info_line(text):
+    return f"  \033[37m{text}\033[0m"
 
 def print_info(text):
-    print(f"  \033[37m{text}\033[0m")
+    print(info_line(text))
+
+def print_block(*lines):
+    print("\n".join(lines))
+
+def warn_line(text):
+    return f"   \033[33m{text}\033[0m"
 
 def print_warn(text):
-    print(f"   \033[33m{text}\033[0m")
+    print(warn_line(text))
 
 def prompt_user(question, default=None):
     if default:
@@ -27,13 +36,17 @@ def prompt_user(question, default=None):
 
 def run_wizard():
     print_header("HOB-JUNTER: INITIALIZATION WIZARD")
-    print("Welcome, operator *salutes*. Let's configure your autonomous job hunter.")
-    print("We will set up your target, your weapons (AI), and your reporting.")
+    print_block(
+        "Welcome, operator *salutes*. Let's configure your autonomous job hunter.",
+        "We will set up your target, your weapons (AI), and your reporting.",
+    )
 
     # --- 1. TARGET CV ---
     print_header("STEP 1: THE ASSET (Your CV)")
-    print_info("I need the path to your CV (PDF format - aim for cleaner text, although we do heavy OCR and should be able to read it regardless; with that in mind, not all automated systems where your CV might lend are doing the same ;) ).")
-    print_info("Tip: You can drag and drop the file into this terminal window and absolute path should be captured automatically. No promises, this behaviour differs across systems.")
+    print_block(
+        info_line("I need the path to your CV (PDF format - aim for cleaner text, although we do heavy OCR and should be able to read it regardless; with that in mind, not all automated systems where your CV might lend are doing the same ;) )."),
+        info_line("Tip: You can drag and drop the file into this terminal window and absolute path should be captured automatically. No promises, this behaviour differs across systems."),
+    )
     
     while True:
         cv_path = prompt_user("Path to CV PDF", default="CV.pdf")
@@ -49,8 +62,10 @@ def run_wizard():
 
     # --- 2. SEARCH INTELLIGENCE ---
     print_header("STEP 2: TARGETING STRATEGY")
-    print_info("You can provide a specific Hiring.Cafe search URL, OR leave it empty.")
-    print_info("If EMPTY, the AI will analyze your CV and build the best search query automatically. I would rather let it do its magic!")
+    print_block(
+        info_line("You can provide a specific Hiring.Cafe search URL, OR leave it empty."),
+        info_line("If EMPTY, the AI will analyze your CV and build the best search query automatically. I would rather let it do its magic!"),
+    )
     
     search_url = prompt_user("Search URL (Press Enter for AI Auto-Pilot)", default="")
     if not search_url:
@@ -60,33 +75,38 @@ def run_wizard():
 
     # --- 3. SCORING ENGINE ---
     print_header("STEP 3: THE BRAIN (Scoring Engine)")
-    print_info("Who judges the candidates? Your local machine or OpenAI?")
-    
-    print("\n[local]") 
-    print("  - Cost: FREE")
-    print("  - Privacy: High (CV stays on machine)")
-    print("  - Req: LMStudio/Ollama running a model on port 1234")
-    
-    print("\n[openai]")
-    print("  - Cost: $$$ (Uses tokens)")
-    print("  - Intel: Smarter, better reasoning")
-    print("  - Req: OPENAI_API_KEY in .env file or as an env variable - you know, the whole EXPORT thing.")
-
-    scoring_mode = prompt_user("Choose Engine (local/openai)", default="local").lower()
-    if scoring_mode not in ["local", "openai"]:
+    print_block(
+        info_line("Who judges the candidates? Your local machine or OpenAI?"),
+        "\n[local]",
+        "  - Cost: FREE",
+        "  - Privacy: High (CV stays on machine)",
+        "  - Req: LMStudio/Ollama running a model on port 1234",
+        "\n[openai]",
+        "  - Cost: $$$ (Uses tokens)",
+        "  - Intel: Smarter, better reasoning",
+        "  - Req: OPENAI_API_KEY in .env file or as an env variable - you know, the whole EXPORT thing.",
+        "\n[openai_batch]",
+        "  - Cost: $$ (OpenAI Batch API, half the token price)",
+        "  - Speed: Results can take minutes to hours. Run with --interactive to score realtime once.",
+    )
+
+    scoring_mode = prompt_user("Choose Engine (local/openai/openai_batch)", default="local").lower()
+    if scoring_mode not in ["local", "openai", "openai_batch"]:
         scoring_mode = "local"
     
-    if scoring_mode == "openai":
+    if scoring_mode in ("openai", "openai_batch"):
         print_warn("Ensure you have set OPENAI_API_KEY in your environment variables!")
 
     # --- 3.5 RED TEAM CONFIG ---
-    print_info("Scoring is for volume. Red Team is for precision.")
-    print_info("You can use a cheaper local model for scoring, but GPT-4 for the critical critique.")
+    print_block(
+        info_line("Scoring is for volume. Red Team is for precision."),
+        info_line("You can use a cheaper local model for scoring, but GPT-4 for the critical critique."),
+    )
     
     red_team_mode = prompt_user("Red Team Engine (local/openai) [Press Enter to match Scoring]", default="")
     
     if not red_team_mode:
-        red_team_mode = scoring_mode
+        red_team_mode = "openai" if scoring_mode == "openai_batch" else scoring_mode
         print(f"    Red Team will use: {red_team_mode} (same as scoring)")
     else:
         print(f"    Red Team set to: {red_team_mode}")
@@ -94,11 +114,13 @@ def run_wizard():
 
     # --- 4. SIGNAL FILTER (THRESHOLD) ---
     print_header("STEP 4: SIGNAL-TO-NOISE RATIO")
-    print_info("The Threshold determines how picky the bot is (0-100).")
-    print("   < 60: Desperation Mode. Lots of garbage.")
-    print("   65:   Wide Net. Expect false positives.")
-    print("   75:   The Sweet Spot. Good balance.")
-    print("   85+:  Unicorn Hunting. You might miss hidden gems.")
+    print_block(
+        info_line("The Threshold determines how picky the bot is (0-100)."),
+        "   < 60: Desperation Mode. Lots of garbage.",
+        "   65:   Wide Net. Expect false positives.",
+        "   75:   The Sweet Spot. Good balance.",
+        "   85+:  Unicorn Hunting. You might miss hidden gems.",
+    )
     
     while True:
         try:
@@ -118,19 +140,21 @@ def run_wizard():
     spreadsheet_id = ""
     
     if setup_sheets in ("y", "yes", "1"):
-        print("\n INSTRUCTIONS (Read carefully):")
-        print("1. Go to: https://console.cloud.google.com/")
-        print("2. Create a New Project (e.g., 'Job-Hunter').")
-        print("3. Search for & ENABLE these two APIs:")
-        print("   - Google Sheets API")
-        print("   - Google Drive API")
-        print("4. Go to Credentials -> Create Credentials -> **Service Account**.")
-        print("5. Name it 'bot-user', click Done.")
-        print("6. Click the new email (bot-user@...), go to **KEYS** tab.")
-        print("7. Add Key -> Create New Key -> **JSON**. It will download.")
-        print("8. Rename that file to 'service_account.json' and put it in this folder.")
-        print("9. Open the JSON file, copy the 'client_email'.")
-        print("10. Share your Google Sheet with that email (Give 'Editor' access).")
+        print_block(
+            "\n INSTRUCTIONS (Read carefully):",
+            "1. Go to: https://console.cloud.google.com/",
+            "2. Create a New Project (e.g., 'Job-Hunter').",
+            "3. Search for & ENABLE these two APIs:",
+            "   - Google Sheets API",
+            "   - Google Drive API",
+            "4. Go to Credentials -> Create Credentials -> **Service Account**.",
+            "5. Name it 'bot-user', click Done.",
+            "6. Click the new email (bot-user@...), go to **KEYS** tab.",
+            "7. Add Key -> Create New Key -> **JSON**. It will download.",
+            "8. Rename that file to 'service_account.json' and put it in this folder.",
+            "9. Open the JSON file, copy the 'client_email'.",
+            "10. Share your Google Sheet with that email (Give 'Editor' access).",
+        )
         
         input("\nPress Enter when you have done these steps...")
         
@@ -138,8 +162,10 @@ def run_wizard():
         
         # Check for the key file
         if not os.path.exists("service_account.json"):
-            print_warn("I don't see 'service_account.json' in this folder yet.")
-            print_warn("Please make sure to save it here before running the bot.")
+            print_block(
+                warn_line("I don't see 'service_account.json' in this folder yet."),
+                warn_line("Please make sure to save it here before running the bot."),
+            )
     else:
         print("   Skipping Sheets integration.")
 
@@ -171,13 +197,14 @@ def run_wizard():
             json.dump(config, f, indent=2)
         
         print_header("SETUP COMPLETE")
-        print(" Configuration saved to 'inputs.json'")
+        summary = [" Configuration saved to 'inputs.json'"]
         if scoring_mode == "local":
-             print("  REMINDER: Make sure LMStudio/Ollama is running on port 1234!")
+             summary.append("  REMINDER: Make sure LMStudio/Ollama is running on port 1234!")
         if spreadsheet_id:
-             print(" CRM: Active")
+             summary.append(" CRM: Active")
         
-        print("\n Ready to launch. Run: python main.py")
+        summary.append("\n Ready to launch. Run: python main.py")
+        print_block(*summary)
         
     except Exception as e:
         print_warn(f"Failed to save config: {e}")